@@ -0,0 +1,59 @@
+"""add_task_sort_indexes
+
+Revision ID: ada3e298a265
+Revises: b7a91a81d9c2
+Create Date: 2026-10-17 10:12:41.203518
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "ada3e298a265"
+down_revision: Union[str, None] = "b7a91a81d9c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # タスク一覧の並び替え（sort=created_at/updated_at/due_date/priority）用の複合インデックス
+    # 式は app/models/task.py の task_due_date_sort_key / task_priority_rank と一致させること
+    op.create_index(
+        "ix_tasks_family_id_created_at_id",
+        "tasks",
+        ["family_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_tasks_family_id_updated_at_id",
+        "tasks",
+        ["family_id", "updated_at", "id"],
+    )
+    op.create_index(
+        "ix_tasks_family_id_due_date_sort",
+        "tasks",
+        ["family_id", sa.text("coalesce(due_date, '9999-12-31')"), "id"],
+    )
+    op.create_index(
+        "ix_tasks_family_id_priority_rank",
+        "tasks",
+        [
+            "family_id",
+            sa.text(
+                "(CASE WHEN (priority = 'high') THEN 3"
+                " WHEN (priority = 'medium') THEN 2"
+                " WHEN (priority = 'low') THEN 1 ELSE 0 END)"
+            ),
+            "id",
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_family_id_priority_rank", table_name="tasks")
+    op.drop_index("ix_tasks_family_id_due_date_sort", table_name="tasks")
+    op.drop_index("ix_tasks_family_id_updated_at_id", table_name="tasks")
+    op.drop_index("ix_tasks_family_id_created_at_id", table_name="tasks")
@@ -0,0 +1,79 @@
+"""add_hot_query_indexes
+
+Revision ID: d9e2a7a5b926
+Revises: ada3e298a265
+Create Date: 2026-10-17 11:03:27.918244
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d9e2a7a5b926"
+down_revision: Union[str, None] = "ada3e298a265"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # === Tasks Table ===
+    # ルートタスク一覧（parent_id IS NULL）用の部分インデックス
+    op.create_index(
+        "ix_tasks_family_id_created_at_id_roots",
+        "tasks",
+        ["family_id", "created_at", "id"],
+        postgresql_where=sa.text("parent_id IS NULL"),
+    )
+    # サブタスクの読み込み（parent_id IN (...)）用
+    op.create_index(
+        "ix_tasks_parent_id",
+        "tasks",
+        ["parent_id"],
+        postgresql_where=sa.text("parent_id IS NOT NULL"),
+    )
+    # 担当者での絞り込みと、ユーザー削除時の SET NULL 用
+    op.create_index(
+        "ix_tasks_family_id_assignee_id", "tasks", ["family_id", "assignee_id"]
+    )
+    op.create_index(
+        "ix_tasks_assignee_id",
+        "tasks",
+        ["assignee_id"],
+        postgresql_where=sa.text("assignee_id IS NOT NULL"),
+    )
+    op.create_index("ix_tasks_created_by_id", "tasks", ["created_by_id"])
+    # ステータスでの絞り込み用
+    op.create_index("ix_tasks_family_id_status", "tasks", ["family_id", "status"])
+
+    # === FamilyMembers Table ===
+    # user_id 起点の検索は uq_family_members_user_id_family_id で賄える。
+    # 家族単位のメンバー一覧・権限確認はこのインデックスのみで完結させる
+    op.create_index(
+        "ix_family_members_family_id_user_id",
+        "family_members",
+        ["family_id", "user_id"],
+        postgresql_include=["is_admin", "role"],
+    )
+
+    # === Tags Table ===
+    op.create_index("ix_tags_family_id", "tags", ["family_id"])
+
+    # === task_tags Association Table ===
+    # 主キー (task_id, tag_id) ではタグ側からの逆引きができないため
+    op.create_index("ix_task_tags_tag_id_task_id", "task_tags", ["tag_id", "task_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_tags_tag_id_task_id", table_name="task_tags")
+    op.drop_index("ix_tags_family_id", table_name="tags")
+    op.drop_index("ix_family_members_family_id_user_id", table_name="family_members")
+    op.drop_index("ix_tasks_family_id_status", table_name="tasks")
+    op.drop_index("ix_tasks_created_by_id", table_name="tasks")
+    op.drop_index("ix_tasks_assignee_id", table_name="tasks")
+    op.drop_index("ix_tasks_family_id_assignee_id", table_name="tasks")
+    op.drop_index("ix_tasks_parent_id", table_name="tasks")
+    op.drop_index("ix_tasks_family_id_created_at_id_roots", table_name="tasks")
@@ -0,0 +1,59 @@
+"""add_task_closure
+
+Revision ID: 4f1c8e2b7d93
+Revises: d9e2a7a5b926
+Create Date: 2026-10-17 13:42:05.316027
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4f1c8e2b7d93"
+down_revision: Union[str, None] = "d9e2a7a5b926"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # === TaskClosure Table ===
+    # タスク階層のクロージャテーブル（祖先と子孫のすべての組と深さ）
+    op.create_table(
+        "task_closure",
+        sa.Column("ancestor_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("descendant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["ancestor_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["descendant_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+    )
+    op.create_index(
+        "ix_task_closure_descendant_id_depth",
+        "task_closure",
+        ["descendant_id", "depth"],
+    )
+
+    # 既存のタスクの階層情報を parent_id から作成
+    op.execute(
+        """
+        INSERT INTO task_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE closure (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM tasks
+            UNION ALL
+            SELECT closure.ancestor_id, tasks.id, closure.depth + 1
+            FROM closure
+            JOIN tasks ON tasks.parent_id = closure.descendant_id
+        )
+        SELECT ancestor_id, descendant_id, depth FROM closure
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_closure_descendant_id_depth", table_name="task_closure")
+    op.drop_table("task_closure")
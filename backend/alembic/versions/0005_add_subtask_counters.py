@@ -0,0 +1,57 @@
+"""add_subtask_counters
+
+Revision ID: 8b3d5f0a6c21
+Revises: 4f1c8e2b7d93
+Create Date: 2026-10-17 14:26:48.507113
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8b3d5f0a6c21"
+down_revision: Union[str, None] = "4f1c8e2b7d93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # === Tasks Table ===
+    # 直下のサブタスクの件数と完了件数
+    op.add_column(
+        "tasks",
+        sa.Column("subtask_total", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "subtask_completed", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+
+    # 既存のサブタスクから件数を集計
+    op.execute(
+        """
+        UPDATE tasks
+        SET subtask_total = counts.total,
+            subtask_completed = counts.completed
+        FROM (
+            SELECT parent_id,
+                   count(*) AS total,
+                   count(*) FILTER (WHERE status = 'completed') AS completed
+            FROM tasks
+            WHERE parent_id IS NOT NULL
+            GROUP BY parent_id
+        ) AS counts
+        WHERE tasks.id = counts.parent_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("tasks", "subtask_completed")
+    op.drop_column("tasks", "subtask_total")
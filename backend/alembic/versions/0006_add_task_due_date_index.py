@@ -0,0 +1,32 @@
+"""add_task_due_date_index
+
+Revision ID: c62e9a4d1f08
+Revises: 8b3d5f0a6c21
+Create Date: 2026-10-17 15:08:19.774520
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c62e9a4d1f08"
+down_revision: Union[str, None] = "8b3d5f0a6c21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # === Tasks Table ===
+    # カレンダー表示（期限日の範囲指定と期限日・ステータスごとの集計）用
+    # status まで含めて集計をインデックスのみで完結させる
+    op.create_index(
+        "ix_tasks_family_id_due_date",
+        "tasks",
+        ["family_id", "due_date", "status"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_family_id_due_date", table_name="tasks")
@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.session import OUTER_SESSION_KEY
+
+# コミット後に進めるバージョン（キャッシュ, 対象）を保持するSession.infoのキー
+_PENDING_BUMPS_KEY = "versioned_cache_pending_bumps"
+
+
+class VersionedCache:
+    """
+    バージョン番号で無効化するプロセス内キャッシュ
+
+    書き込み側は対象（家族IDなど）のバージョンを進めるだけでよく、
+    古いバージョンで保存された値は次の読み込み時に使われなくなる。
+    バージョンはプロセス内で管理するため、単一プロセスでの運用を前提とする
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._versions: Dict[Hashable, int] = {}
+        self._entries: "OrderedDict[Hashable, Tuple[int, Any]]" = OrderedDict()
+
+    def version(self, scope: Hashable) -> int:
+        """
+        対象の現在のバージョンを返す
+        """
+        return self._versions.get(scope, 0)
+
+    def bump(self, scope: Hashable) -> None:
+        """
+        対象のバージョンを進め、それまでに保存された値を無効にする
+        """
+        self._versions[scope] = self.version(scope) + 1
+
+    def bump_after_commit(self, db: AsyncSession, scope: Hashable) -> None:
+        """
+        セッションのトランザクションがコミットされた後に対象のバージョンを進める
+
+        コミット前に進めると、コミットまでの間に読み込まれた古い値が
+        新しいバージョンで保存されてしまうため、書き込み側はこちらを使う
+        """
+        db.sync_session.info.setdefault(_PENDING_BUMPS_KEY, set()).add((self, scope))
+
+    def get(self, key: Hashable, version: int) -> Optional[Any]:
+        """
+        指定したバージョンで保存された値を返す（ない場合はNone）
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, version: int, value: Any) -> None:
+        """
+        値を読み込み開始時のバージョンとともに保存する（古いものから破棄）
+        """
+        self._entries[key] = (version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        すべての値とバージョンを破棄する
+        """
+        self._versions.clear()
+        self._entries.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_pending_versions(session: Session) -> None:
+    """
+    コミット後に予約されたバージョンを進める
+
+    セーブポイントで参加しているセッションのコミットはセーブポイントの解放に
+    すぎないため、参加先のセッションに引き継いでそのコミットまで待つ
+    """
+    pending = session.info.pop(_PENDING_BUMPS_KEY, None)
+    if not pending:
+        return
+    outer = session.info.get(OUTER_SESSION_KEY)
+    if outer is not None:
+        outer.info.setdefault(_PENDING_BUMPS_KEY, set()).update(pending)
+        return
+    for cache, scope in pending:
+        cache.bump(scope)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_versions(session: Session, previous_transaction) -> None:
+    """
+    トランザクション全体がロールバックされた場合に予約を破棄する
+
+    セーブポイント（begin_nested）のロールバックでは、それ以前の書き込みが残るため破棄しない
+    """
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_BUMPS_KEY, None)
+
+
+# 家族ごとのタスク集計のキャッシュ（家族IDをスコープとし、タスクの書き込みでバージョンを進める）
+task_summary_cache = VersionedCache()
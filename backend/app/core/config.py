@@ -31,6 +31,15 @@ class Settings(BaseSettings):
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
     # デバッグモード（デフォルトはFalse）
     DEBUG: bool = os.getenv("DEBUG", "False").lower() in ("true", "1", "t")
+    # 最後のサブタスクが完了したときに親タスクも自動で完了にする（デフォルトはFalse）
+    AUTO_COMPLETE_PARENT_TASKS: bool = False
+    # Idempotency-Keyの保存期間（時間）。過ぎたキーは定期的にまとめて削除する
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    # 処理中のキーのリース期間（秒）。過ぎたキーは処理が中断されたものとして取り直せる
+    IDEMPOTENCY_KEY_LEASE_SECONDS: int = 60
+    # 期限切れのキーを削除する間隔（秒）と1回のDELETEで削除する最大件数
+    IDEMPOTENCY_KEY_CLEANUP_INTERVAL_SECONDS: int = 3600
+    IDEMPOTENCY_KEY_CLEANUP_BATCH_SIZE: int = 1000
 
     # デフォルトタグ設定
     DEFAULT_TAGS: list = [
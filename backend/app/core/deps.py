@@ -1,13 +1,18 @@
 import uuid
-from typing import Annotated, AsyncGenerator
+from typing import Annotated, AsyncGenerator, Optional
 
-from fastapi import Depends, HTTPException, status, Header
+from fastapi import Depends, HTTPException, status, Header, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.user import get_user_by_id
 from app.db.session import get_db
 from app.models.user import User
 from app.services.auth import validate_access_token
+from app.services.idempotency import (
+    IdempotentRequest,
+    begin_idempotent_request,
+    hash_request,
+)
 
 
 async def get_current_user(
@@ -59,3 +64,30 @@ async def get_current_active_user(
             status_code=status.HTTP_400_BAD_REQUEST, detail="ユーザーは無効です"
         )
     return current_user
+
+
+async def get_idempotent_request(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    idempotency_key: Annotated[Optional[str], Header(max_length=255)] = None,
+) -> AsyncGenerator[IdempotentRequest, None]:
+    """
+    Idempotency-Keyヘッダーを処理する依存性関数
+
+    同じユーザーが同じキーで再送したリクエストには、処理を実行せずに
+    保存済みのレスポンスを返せるようにする。処理はIdempotentRequest.dbのセッションで行い、
+    失敗した場合は処理の結果を取り消してキーを解放する
+    """
+    if idempotency_key is None:
+        yield IdempotentRequest(db, current_user.id)
+        return
+
+    request_hash = hash_request(request.method, request.url.path, await request.body())
+    idempotent = await begin_idempotent_request(
+        db, current_user.id, idempotency_key, request_hash
+    )
+    try:
+        yield idempotent
+    finally:
+        await idempotent.finish()
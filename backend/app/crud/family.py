@@ -1,8 +1,9 @@
 import uuid
-from typing import List, Optional, Tuple
+from typing import Any, Iterable, List, Optional, Set, Tuple
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
 from app.crud.base import CRUDBase
 from app.crud.user import get_user_by_email
@@ -135,6 +136,18 @@ class CRUDFamily(CRUDBase[Family, FamilyCreate, FamilyUpdate]):
 family = CRUDFamily(Family)
 
 
+def user_is_member(user_id: Any, family_id: Any) -> ColumnElement[bool]:
+    """
+    ユーザーが家族のメンバーであることを表すEXISTS条件を返す
+
+    user_id・family_idには値のほか、データ側のクエリの列（Task.family_idなど）も指定でき、
+    権限の確認を別のSELECTではなくデータを取得するクエリの中で行うために使う
+    """
+    return exists().where(
+        FamilyMember.family_id == family_id, FamilyMember.user_id == user_id
+    )
+
+
 # シンプルな関数インターフェースも提供
 
 
@@ -184,3 +197,42 @@ async def is_user_family_admin(
     ユーザーが特定の家族の管理者かどうかを確認
     """
     return await family.is_user_family_admin(db, user_id=user_id, family_id=family_id)
+
+
+async def get_family_access(
+    db: AsyncSession, user_id: uuid.UUID, family_id: uuid.UUID
+) -> Tuple[Optional[Family], Optional[FamilyMember]]:
+    """
+    家族と、その家族でのユーザーのメンバー情報を1回のクエリで取得する
+
+    家族が存在しない場合は (None, None)、メンバーでない場合は (家族, None) を返す
+    """
+    stmt = (
+        select(Family, FamilyMember)
+        .outerjoin(
+            FamilyMember,
+            and_(FamilyMember.family_id == Family.id, FamilyMember.user_id == user_id),
+        )
+        .where(Family.id == family_id)
+    )
+    row = (await db.execute(stmt)).first()
+    if row is None:
+        return None, None
+    return row[0], row[1]
+
+
+async def get_family_memberships(
+    db: AsyncSession, family_ids: Iterable[uuid.UUID], user_ids: Iterable[uuid.UUID]
+) -> Set[Tuple[uuid.UUID, uuid.UUID]]:
+    """
+    指定した家族とユーザーの組のうち、メンバーであるもの (family_id, user_id) を
+    1回のクエリで取得する
+    """
+    family_ids, user_ids = list(family_ids), list(user_ids)
+    if not family_ids or not user_ids:
+        return set()
+    stmt = select(FamilyMember.family_id, FamilyMember.user_id).where(
+        FamilyMember.family_id.in_(family_ids), FamilyMember.user_id.in_(user_ids)
+    )
+    result = await db.execute(stmt)
+    return set(result.all())
@@ -0,0 +1,174 @@
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import delete, insert, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.idempotency import IdempotencyKey
+
+
+async def claim_idempotency_key(
+    db: AsyncSession,
+    *,
+    user_id: uuid.UUID,
+    key: str,
+    request_hash: str,
+    claimed_at: datetime,
+) -> bool:
+    """
+    キーを処理中として登録する
+
+    同じキーがあった場合はセーブポイントまでを取り消す。セッション全体を
+    ロールバックすると、同じセッションで読み込んだユーザーなどが失効してしまうため
+    戻り値: 登録できた場合はTrue、同じキーがすでにある場合はFalse
+    """
+    stmt = insert(IdempotencyKey).values(
+        user_id=user_id,
+        key=key,
+        request_hash=request_hash,
+        created_at=claimed_at,
+    )
+    try:
+        async with db.begin_nested():
+            await db.execute(stmt)
+    except IntegrityError:
+        return False
+    await db.commit()
+    return True
+
+
+async def reclaim_idempotency_key(
+    db: AsyncSession,
+    *,
+    user_id: uuid.UUID,
+    key: str,
+    request_hash: str,
+    claimed_at: datetime,
+    expired_before: datetime,
+    lease_expired_before: datetime,
+) -> bool:
+    """
+    期限切れのキー、またはリースが切れた処理中のキーを処理中として取り直す
+
+    戻り値: 取り直せた場合はTrue
+    """
+    stmt = (
+        update(IdempotencyKey)
+        .where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            or_(
+                IdempotencyKey.created_at < expired_before,
+                (IdempotencyKey.status_code.is_(None))
+                & (IdempotencyKey.created_at < lease_expired_before),
+            ),
+        )
+        .values(
+            request_hash=request_hash,
+            status_code=None,
+            response_body=None,
+            created_at=claimed_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount > 0
+
+
+async def get_idempotency_key(
+    db: AsyncSession, *, user_id: uuid.UUID, key: str
+) -> Optional[IdempotencyKey]:
+    """
+    ユーザーとキーの組から保存済みの結果を取得する
+    """
+    # 他のリクエストが更新した最新の状態を読み込む
+    stmt = (
+        select(IdempotencyKey)
+        .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        .execution_options(populate_existing=True)
+    )
+    result = await db.execute(stmt)
+    return result.scalars().first()
+
+
+async def complete_idempotency_key(
+    db: AsyncSession,
+    *,
+    user_id: uuid.UUID,
+    key: str,
+    claimed_at: datetime,
+    status_code: int,
+    response_body: Any,
+) -> bool:
+    """
+    処理中のキーにレスポンスを保存してコミットする
+
+    同じトランザクションで行った処理はレスポンスと同時に確定する。
+    リースが切れて他のリクエストに取り直されていた場合は、処理ごと取り消す
+    戻り値: 保存できた場合はTrue
+    """
+    stmt = (
+        update(IdempotencyKey)
+        .where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.status_code.is_(None),
+            IdempotencyKey.created_at == claimed_at,
+        )
+        .values(status_code=status_code, response_body=response_body)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    if result.rowcount == 0:
+        await db.rollback()
+        return False
+    await db.commit()
+    return True
+
+
+async def delete_idempotency_key(
+    db: AsyncSession, *, user_id: uuid.UUID, key: str, claimed_at: datetime
+) -> None:
+    """
+    処理中のキーを削除する（他のリクエストに取り直されたキーは削除しない）
+    """
+    stmt = (
+        delete(IdempotencyKey)
+        .where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.status_code.is_(None),
+            IdempotencyKey.created_at == claimed_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(stmt)
+    await db.commit()
+
+
+async def delete_expired_idempotency_keys(
+    db: AsyncSession, *, created_before: datetime, limit: int
+) -> int:
+    """
+    指定日時より前に登録されたキーを最大limit件削除する
+
+    1回のDELETEで削除する行数を抑え、ロックを長時間保持しないようにする
+    戻り値: 削除したキーの数
+    """
+    expired = (
+        select(IdempotencyKey.user_id, IdempotencyKey.key)
+        .where(IdempotencyKey.created_at < created_before)
+        .order_by(IdempotencyKey.created_at)
+        .limit(limit)
+    )
+    stmt = (
+        delete(IdempotencyKey)
+        .where(tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(expired))
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
@@ -1,15 +1,588 @@
 import uuid
-from datetime import date
-from typing import List, Optional, Tuple
-
-from sqlalchemy import and_, select
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Delete,
+    Select,
+    and_,
+    case,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    true,
+    tuple_,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, load_only, selectinload, with_expression
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.cache import task_summary_cache
+from app.core.config import settings
 from app.crud.base import CRUDBase
-from app.crud.family import is_user_family_member
-from app.models.task import Tag, Task, task_tags
-from app.schemas.task import TagCreate, TagUpdate, TaskCreate, TaskUpdate
+from app.crud.family import user_is_member
+from app.models.family import FamilyMember
+from app.models.task import (
+    TASK_DUE_DATE_FALLBACK,
+    TASK_PRIORITY_RANKS,
+    Tag,
+    Task,
+    task_closure,
+    task_due_date_sort_key,
+    task_priority_rank,
+    task_tags,
+)
+from app.schemas.task import (
+    SubtaskCreate,
+    TagCreate,
+    TagUpdate,
+    TaskCreate,
+    TaskUpdate,
+)
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def _task_relation_loaders(path: Any = None) -> Tuple[Any, ...]:
+    """
+    タスク自身の一覧表示に必要なリレーション（タグ・担当者・作成者）の読み込み設定
+    """
+    if path is None:
+        return (
+            selectinload(Task.tags),
+            selectinload(Task.assignee),
+            selectinload(Task.created_by),
+        )
+    return (
+        path.selectinload(Task.tags),
+        path.selectinload(Task.assignee),
+        path.selectinload(Task.created_by),
+    )
+
+
+# リレーションごとの読み込み設定（サブタスクはその関連もまとめて読み込む）
+_TASK_RELATION_LOADERS = {
+    "tags": (selectinload(Task.tags),),
+    "assignee": (selectinload(Task.assignee),),
+    "created_by": (selectinload(Task.created_by),),
+    "subtasks": _task_relation_loaders(selectinload(Task.subtasks)),
+    "subtask_tags": (selectinload(Task.subtasks).selectinload(Task.tags),),
+}
+
+# サブタスクの要約（query_expression）と、維持しているサブタスク件数から求める式
+_TASK_EXPRESSION_LOADERS = {
+    "subtask_count": with_expression(Task.subtask_count, Task.subtask_total),
+    "has_subtasks": with_expression(Task.has_subtasks, Task.subtask_total > 0),
+}
+
+# 多対一のリレーションを読み込むために必要な外部キー列
+_TASK_RELATION_FOREIGN_KEYS = {
+    "assignee": "assignee_id",
+    "created_by": "created_by_id",
+}
+
+# 読み込みパスごとに読み込むリレーション（ローダープロファイル）
+# モデルのリレーションは既定で読み込まず、アクセスするとエラーになる（lazy="raise"）ため、
+# タスクを返す処理は必ずいずれかのプロファイルを明示して読み込む
+# - row:       更新・削除前の確認用。タスク自身の列のみ
+# - list_lean: 一覧表示用。タスク自身のタグ・担当者・作成者のみ
+# - detail:    単一タスクの詳細用。list_lean に加えて直下のサブタスクとその関連
+# - subtree:   ルートタスク一覧・サブタスク付き取得用。各タスクと直下のサブタスク
+# - *_normalized: format=normalized 用。ユーザーは別途まとめて取得するためタグのみ
+TASK_LOADER_PROFILES = {
+    "row": (),
+    "list_lean": ("tags", "assignee", "created_by"),
+    "list_normalized": ("tags",),
+    "detail": ("tags", "assignee", "created_by", "subtasks"),
+    "subtree": ("tags", "assignee", "created_by", "subtasks"),
+    "subtree_normalized": ("tags", "subtask_tags"),
+}
+
+
+def task_loader_options(
+    profile: str,
+    fields: Optional[Sequence[str]] = None,
+    required_columns: Sequence[str] = (),
+) -> Tuple[Any, ...]:
+    """
+    名前付きローダープロファイルのローダーオプションを返す
+
+    fieldsを指定した場合（スパースフィールドセット）は、指定された列と
+    required_columns（並び替えキーなど処理に必要な列）のみを読み込み、
+    プロファイルのリレーションのうち指定されたものだけを読み込む。
+    サブタスクの要約（subtask_count・has_subtasks）は指定された場合のみ同じクエリで設定する
+    """
+    relations = TASK_LOADER_PROFILES[profile]
+    if fields is not None:
+        # プロファイルで読み込まないリレーションは返せない（lazy="raise"）
+        unavailable = [
+            name
+            for name in fields
+            if name in _TASK_RELATION_LOADERS and name not in relations
+        ]
+        if unavailable:
+            raise ValueError(f"指定できない項目です: {', '.join(unavailable)}")
+    if fields is None:
+        return tuple(
+            option for name in relations for option in _TASK_RELATION_LOADERS[name]
+        )
+
+    selected = set(fields)
+    columns = {"id", *required_columns, *selected}
+    options = []
+    for name in relations:
+        if name in selected:
+            options.extend(_TASK_RELATION_LOADERS[name])
+            if name in _TASK_RELATION_FOREIGN_KEYS:
+                columns.add(_TASK_RELATION_FOREIGN_KEYS[name])
+    options.extend(
+        loader for name, loader in _TASK_EXPRESSION_LOADERS.items() if name in selected
+    )
+
+    table_columns = Task.__table__.c
+    load_columns = [
+        getattr(Task, name) for name in sorted(columns) if name in table_columns
+    ]
+    return (load_only(*load_columns), *options)
+
+
+# 並び替えキーごとの (ORDER BY に使う式, タスクから値を取り出す関数, カーソル値の復元関数)
+# いずれも家族IDを先頭にした複合インデックスと同じ式を使う
+_TASK_SORT_KEYS = {
+    "created_at": (Task.created_at, lambda t: t.created_at, datetime.fromisoformat),
+    "updated_at": (Task.updated_at, lambda t: t.updated_at, datetime.fromisoformat),
+    "due_date": (
+        task_due_date_sort_key,
+        lambda t: t.due_date or TASK_DUE_DATE_FALLBACK,
+        date.fromisoformat,
+    ),
+    "priority": (
+        task_priority_rank,
+        lambda t: TASK_PRIORITY_RANKS.get(t.priority, 0),
+        int,
+    ),
+}
+
+
+def _apply_task_pagination(
+    query: Select,
+    *,
+    sort: str,
+    order: str,
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+) -> Select:
+    """
+    タスク一覧クエリに安定した並び順（ソートキー + ID）とページネーションを適用する
+
+    cursorが指定された場合はOFFSETを使わないキーセット方式で続きを取得し、
+    指定がない場合は従来どおりskip/limitで取得する。
+    次ページの有無を判定するため、limitより1件多く取得する
+    """
+    if sort not in _TASK_SORT_KEYS:
+        raise ValueError(f"並び替えキーが不正です: {sort}")
+    sort_column, _, parse_value = _TASK_SORT_KEYS[sort]
+    descending = order == "desc"
+
+    if descending:
+        query = query.order_by(sort_column.desc(), Task.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Task.id.asc())
+
+    if cursor:
+        values = decode_cursor(cursor)
+        if values.get("sort") != sort or values.get("order") != order:
+            raise ValueError("カーソルと並び順の指定が一致しません")
+        try:
+            last_value = parse_value(values["value"])
+            last_id = uuid.UUID(values["id"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError("カーソルの形式が不正です") from e
+
+        position = tuple_(sort_column, Task.id)
+        last_position = tuple_(last_value, last_id)
+        query = query.where(
+            position < last_position if descending else position > last_position
+        )
+    else:
+        query = query.offset(skip)
+
+    return query.limit(max(limit, 0) + 1)
+
+
+def _split_task_page(
+    tasks: List[Task], *, sort: str, order: str, limit: int
+) -> Tuple[List[Task], Optional[str]]:
+    """
+    1件多く取得した結果をページ本体と次ページのカーソルに分割する
+    """
+    if limit <= 0 or len(tasks) <= limit:
+        return list(tasks[: max(limit, 0)]), None
+
+    page = list(tasks[:limit])
+    _, get_value, _ = _TASK_SORT_KEYS[sort]
+    last_value = get_value(page[-1])
+    next_cursor = encode_cursor(
+        {
+            "sort": sort,
+            "order": order,
+            "value": (
+                last_value.isoformat()
+                if isinstance(last_value, (date, datetime))
+                else last_value
+            ),
+            "id": str(page[-1].id),
+        }
+    )
+    return page, next_cursor
+
+
+def _task_column_filters(
+    *,
+    roots_only: bool = False,
+    assignee_id: Optional[uuid.UUID] = None,
+    status: Optional[str] = None,
+    is_routine: Optional[bool] = None,
+    due_before: Optional[date] = None,
+    due_after: Optional[date] = None,
+) -> List[Any]:
+    """
+    タスク自身の列に対するフィルタ条件を返す
+    """
+    conditions = []
+    if roots_only:
+        conditions.append(Task.parent_id.is_(None))  # 親タスクがないもののみ
+    if assignee_id:
+        conditions.append(Task.assignee_id == assignee_id)
+    if status:
+        conditions.append(Task.status == status)
+    if is_routine is not None:
+        conditions.append(Task.is_routine == is_routine)
+    if due_before:
+        conditions.append(Task.due_date <= due_before)
+    if due_after:
+        conditions.append(Task.due_date >= due_after)
+    return conditions
+
+
+def _task_tag_filters(
+    tag_ids: Optional[List[uuid.UUID]], tag_match: str = "any"
+) -> List[Any]:
+    """
+    タグのフィルタ条件をtask_tagsへのEXISTS（セミジョイン）として返す
+
+    複数のタグが一致しても行が重複しない。
+    tag_match="any"はいずれかのタグ、"all"はすべてのタグを持つタスクに絞り込む
+    """
+    if not tag_ids:
+        return []
+
+    unique_tag_ids = list(dict.fromkeys(tag_ids))
+    if tag_match == "all":
+        # タグごとにEXISTSを重ね、すべてのタグを持っているタスクのみ残す
+        return [
+            exists().where(task_tags.c.task_id == Task.id, task_tags.c.tag_id == tag_id)
+            for tag_id in unique_tag_ids
+        ]
+    # タスクがタグのいずれかを持っている
+    return [
+        exists().where(
+            task_tags.c.task_id == Task.id,
+            task_tags.c.tag_id.in_(unique_tag_ids),
+        )
+    ]
+
+
+def _apply_task_filters(
+    query: Select,
+    *,
+    family_id: uuid.UUID,
+    tag_ids: Optional[List[uuid.UUID]] = None,
+    tag_match: str = "any",
+    member_user_id: Optional[uuid.UUID] = None,
+    **column_filters,
+) -> Select:
+    """
+    タスクの一覧取得・件数取得で共通のフィルタ条件を適用する
+
+    列の条件は_task_column_filters、タグの条件は_task_tag_filtersで組み立てる。
+    member_user_idを指定すると、そのユーザーが家族のメンバーでない場合は何も返さない
+    """
+    query = query.where(Task.family_id == family_id)
+
+    if member_user_id:
+        # 権限の確認を別のSELECTにせず、同じクエリの条件として評価する
+        query = query.where(user_is_member(member_user_id, family_id))
+
+    conditions = [
+        *_task_column_filters(**column_filters),
+        *_task_tag_filters(tag_ids, tag_match),
+    ]
+    if conditions:
+        query = query.where(*conditions)
+    return query
+
+
+async def _fetch_task_page(
+    db: AsyncSession,
+    query: Select,
+    *,
+    options: Sequence[Any],
+    sort: str,
+    order: str,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    include_total: bool,
+) -> Tuple[List[Task], Optional[int], Optional[str]]:
+    """
+    フィルタ済みのクエリから1ページ分のタスクと合計件数を1回のSQLで取得する
+
+    合計件数は同じ条件の件数をスカラーサブクエリとして列に追加して求める。
+    count(*) OVER () ではキーセット条件を適用した後の件数になってしまうため、
+    ページ条件を含まない件数をサブクエリで計算している
+    """
+    count_query = query.with_only_columns(func.count(Task.id)).order_by(None)
+
+    page_query = query.options(*options)
+    if include_total:
+        page_query = page_query.add_columns(
+            count_query.correlate(None).scalar_subquery().label("total")
+        )
+    page_query = _apply_task_pagination(
+        page_query, sort=sort, order=order, cursor=cursor, skip=skip, limit=limit
+    )
+
+    result = await db.execute(page_query)
+    total = None
+    if include_total:
+        rows = result.all()
+        tasks = [row[0] for row in rows]
+        if rows:
+            total = rows[0][1]
+    else:
+        tasks = result.scalars().all()
+
+    page, next_cursor = _split_task_page(tasks, sort=sort, order=order, limit=limit)
+
+    if include_total and total is None:
+        # 行が返らない場合は件数列も得られないため、先頭ページ以外のみ別途数える
+        if cursor or skip > 0:
+            total = (await db.execute(count_query)).scalar() or 0
+        else:
+            total = 0
+
+    return page, total, next_cursor
+
+
+async def _insert_task_closure(
+    db: AsyncSession, task_id: uuid.UUID, parent_id: Optional[uuid.UUID]
+) -> None:
+    """
+    新しいタスクの階層情報（自分自身と、親の祖先すべてとの組）をクロージャテーブルに追加
+    """
+    new_id = literal(task_id, Task.id.type)
+    rows = select(new_id, new_id, literal(0))
+    if parent_id is not None:
+        rows = union_all(
+            rows,
+            select(
+                task_closure.c.ancestor_id, new_id, task_closure.c.depth + 1
+            ).where(task_closure.c.descendant_id == parent_id),
+        )
+    await db.execute(
+        insert(task_closure).from_select(
+            ["ancestor_id", "descendant_id", "depth"], rows
+        )
+    )
+
+
+async def _move_task_closure(
+    db: AsyncSession, task_id: uuid.UUID, new_parent_id: Optional[uuid.UUID]
+) -> None:
+    """
+    タスクの付け替えに合わせて、部分木と旧祖先の組を削除し新しい祖先との組を追加する
+    """
+    subtree = select(task_closure.c.descendant_id).where(
+        task_closure.c.ancestor_id == task_id
+    )
+
+    # 部分木の内部の組は残し、部分木の外（旧祖先）との組のみ削除
+    await db.execute(
+        delete(task_closure).where(
+            task_closure.c.descendant_id.in_(subtree),
+            task_closure.c.ancestor_id.not_in(subtree),
+        )
+    )
+
+    if new_parent_id is None:
+        return
+
+    # 新しい親の祖先（親自身を含む）× 部分木のすべての組を追加
+    ancestors = task_closure.alias("ancestors")
+    descendants = task_closure.alias("descendants")
+    await db.execute(
+        insert(task_closure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(
+                ancestors.c.ancestor_id,
+                descendants.c.descendant_id,
+                ancestors.c.depth + descendants.c.depth + 1,
+            )
+            .select_from(ancestors)
+            .join(descendants, true())  # 祖先と部分木の直積
+            .where(
+                ancestors.c.descendant_id == new_parent_id,
+                descendants.c.ancestor_id == task_id,
+            ),
+        )
+    )
+
+
+async def _adjust_subtask_counters(
+    db: AsyncSession,
+    parent_id: Optional[uuid.UUID],
+    total_delta: int,
+    completed_delta: int,
+) -> None:
+    """
+    親タスクのサブタスク件数・完了件数を差分で更新する
+
+    完了件数が増えた場合、設定で有効なら親タスクの自動完了も行う
+    """
+    if parent_id is None or (total_delta == 0 and completed_delta == 0):
+        return
+
+    await db.execute(
+        update(Task)
+        .where(Task.id == parent_id)
+        .values(
+            subtask_total=Task.subtask_total + total_delta,
+            subtask_completed=Task.subtask_completed + completed_delta,
+            # 件数の更新はタスク自体の更新として扱わない
+            updated_at=Task.updated_at,
+        )
+    )
+
+    if completed_delta > 0 and settings.AUTO_COMPLETE_PARENT_TASKS:
+        await _auto_complete_parents(db, [parent_id])
+
+
+async def _recount_subtask_counters(
+    db: AsyncSession, parent_ids: Sequence[uuid.UUID]
+) -> None:
+    """
+    親タスクのサブタスク件数と完了件数を子タスクから数え直す（1回のUPDATE）
+
+    一括更新・一括削除では変更前の子タスクの状態が分からないため、差分ではなく再集計する
+    """
+    if not parent_ids:
+        return
+
+    child = aliased(Task)
+    children = select(func.count()).where(child.parent_id == Task.id)
+    await db.execute(
+        update(Task)
+        .where(Task.id.in_(parent_ids))
+        .values(
+            subtask_total=children.scalar_subquery(),
+            subtask_completed=children.where(
+                child.status == "completed"
+            ).scalar_subquery(),
+            updated_at=Task.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    if settings.AUTO_COMPLETE_PARENT_TASKS:
+        await _auto_complete_parents(db, parent_ids)
+
+
+async def _auto_complete_parents(
+    db: AsyncSession, task_ids: Sequence[uuid.UUID]
+) -> None:
+    """
+    すべてのサブタスクが完了したタスクを完了にし、その親の完了件数にも反映する
+
+    親が完了したことで祖父母のサブタスクもすべて完了する場合があるため、
+    完了にならなくなるまで木の1階層ごとに集合単位のUPDATEで祖先へ適用する
+    """
+    child = aliased(Task)
+    completed_children = select(func.count()).where(
+        child.parent_id == Task.id, child.status == "completed"
+    )
+    while task_ids:
+        result = await db.execute(
+            update(Task)
+            .where(
+                Task.id.in_(task_ids),
+                Task.status != "completed",
+                Task.subtask_total > 0,
+                Task.subtask_completed >= Task.subtask_total,
+            )
+            .values(status="completed")
+            .returning(Task.parent_id)
+            .execution_options(synchronize_session=False)
+        )
+        task_ids = list({parent_id for parent_id in result.scalars() if parent_id})
+        if not task_ids:
+            return
+
+        # 同じ親の子が同時に完了する場合があるため、差分ではなく数え直す
+        await db.execute(
+            update(Task)
+            .where(Task.id.in_(task_ids))
+            .values(
+                subtask_completed=completed_children.scalar_subquery(),
+                updated_at=Task.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def _validate_new_parent(
+    db: AsyncSession, db_obj: Task, new_parent_id: uuid.UUID
+) -> None:
+    """
+    付け替え先の親タスクが同じ家族に存在し、自身の配下でないことを確認
+    """
+    parent_family_id = (
+        await db.execute(select(Task.family_id).where(Task.id == new_parent_id))
+    ).scalar_one_or_none()
+    if parent_family_id is None or parent_family_id != db_obj.family_id:
+        raise ValueError("親タスクが見つかりません")
+
+    if await is_task_ancestor(db, ancestor_id=db_obj.id, descendant_id=new_parent_id):
+        raise ValueError("タスクを自身またはそのサブタスクの下に移動することはできません")
+
+
+async def _replace_task_tags(
+    db: AsyncSession,
+    task_id: uuid.UUID,
+    family_id: uuid.UUID,
+    tag_ids: Sequence[uuid.UUID],
+) -> None:
+    """
+    タスクのタグを置き換える（同じ家族に存在するタグのみを関連付ける）
+
+    タグの存在確認はINSERT … SELECTの条件で行うため、タグを読み込まない
+    """
+    await db.execute(delete(task_tags).where(task_tags.c.task_id == task_id))
+    if tag_ids:
+        await db.execute(
+            insert(task_tags).from_select(
+                ["task_id", "tag_id"],
+                select(literal(task_id, Task.id.type), Tag.id).where(
+                    Tag.id.in_(tag_ids), Tag.family_id == family_id
+                ),
+            )
+        )
 
 
 class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
@@ -46,6 +619,15 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
             db_obj.tags = tags
 
         db.add(db_obj)
+        await db.flush()
+
+        # 階層情報と親タスクのサブタスク件数を同じトランザクションで更新
+        await _insert_task_closure(db, db_obj.id, db_obj.parent_id)
+        await _adjust_subtask_counters(
+            db, db_obj.parent_id, 1, int(db_obj.status == "completed")
+        )
+
+        task_summary_cache.bump_after_commit(db, db_obj.family_id)
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
@@ -55,76 +637,69 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
     ) -> Task:
         """
         タスクを更新し、タグも更新する
+
+        db_objは更新前の family_id / parent_id / status が読み込まれていればよい。
+        列の更新は1回の UPDATE … RETURNING、タグの置き換えはSELECTを挟まない
+        DELETE と INSERT … SELECT で行い、コミット後に詳細表示用の関連データを
+        1回だけ読み込んで返す
         """
         try:
-            # 基本情報の更新
             update_data = obj_in.model_dump(exclude_unset=True, exclude={"tag_ids"})
-            
-            # 日付データのログ出力とチェック
-            if "due_date" in update_data:
-                print(f"Due date before processing: {update_data.get('due_date')}, type: {type(update_data.get('due_date'))}")
-                
-                # 日付が文字列としてきた場合は変換
-                if isinstance(update_data["due_date"], str):
-                    try:
-                        from datetime import datetime, date
-                        # ISO形式の日付文字列をdate型に変換
-                        dt = datetime.fromisoformat(update_data["due_date"].replace('Z', '+00:00'))
-                        update_data["due_date"] = dt.date()
-                        print(f"Converted date: {update_data['due_date']}")
-                    except Exception as e:
-                        print(f"Error converting date: {e}")
-                        # 変換に失敗した場合はNoneを設定
-                        update_data["due_date"] = None
-            
-            for field in update_data:
-                setattr(db_obj, field, update_data[field])
-
-            # タグが指定されている場合は更新
-            if obj_in.tag_ids is not None:
-                # タグが存在するか確認し、同じ家族のタグのみを関連付ける
-                tag_stmt = select(Tag).where(
-                    and_(Tag.id.in_(obj_in.tag_ids), Tag.family_id == db_obj.family_id)
+
+            # 親タスクの付け替えがある場合は、付け替え先を検証しておく
+            reparent = (
+                "parent_id" in update_data
+                and update_data["parent_id"] != db_obj.parent_id
+            )
+            if reparent and update_data["parent_id"] is not None:
+                await _validate_new_parent(db, db_obj, update_data["parent_id"])
+
+            old_parent_id = db_obj.parent_id
+            was_completed = db_obj.status == "completed"
+            is_completed = was_completed
+
+            if update_data:
+                result = await db.execute(
+                    update(Task)
+                    .where(Task.id == db_obj.id)
+                    .values(**update_data)
+                    .returning(Task.status)
                 )
-                tag_result = await db.execute(tag_stmt)
-                tags = tag_result.scalars().all()
+                is_completed = result.scalar_one() == "completed"
 
-                # タグを更新
-                db_obj.tags = tags
+            if reparent:
+                await _move_task_closure(db, db_obj.id, update_data["parent_id"])
 
-            # データベースに変更を保存
-            db.add(db_obj)
-            await db.commit()
+            # 親タスクのサブタスク件数を更新（付け替え時は旧親から新親へ移す）
+            if reparent:
+                await _adjust_subtask_counters(
+                    db, old_parent_id, -1, -int(was_completed)
+                )
+                await _adjust_subtask_counters(
+                    db, update_data["parent_id"], 1, int(is_completed)
+                )
+            elif was_completed != is_completed:
+                await _adjust_subtask_counters(
+                    db, old_parent_id, 0, 1 if is_completed else -1
+                )
 
-            # selectinloadで関連データを含め再取得
-            stmt = (
-                select(Task)
-                .options(
-                    selectinload(Task.tags),
-                    selectinload(Task.assignee),
-                    selectinload(Task.created_by),
-                    selectinload(Task.subtasks).selectinload(Task.tags),
-                    selectinload(Task.subtasks).selectinload(Task.assignee),
-                    selectinload(Task.subtasks).selectinload(Task.created_by),
+            # タグが指定されている場合は置き換える
+            if obj_in.tag_ids is not None:
+                await _replace_task_tags(
+                    db, db_obj.id, db_obj.family_id, obj_in.tag_ids
                 )
-                .where(Task.id == db_obj.id)
-            )
-            result = await db.execute(stmt)
-            updated_task = result.unique().scalar_one_or_none()
-            
-            # サブタスク属性がない場合は空リストを設定
-            if updated_task and not hasattr(updated_task, 'subtasks'):
-                updated_task.subtasks = []
-                
-            return updated_task
-        except Exception as e:
+
+            # データベースに変更を保存
+            task_summary_cache.bump_after_commit(db, db_obj.family_id)
+            await db.commit()
+        except Exception:
             # エラー発生時はロールバック
             await db.rollback()
-            print(f"Error in update_with_tags: {str(e)}")
-            import traceback
-            traceback.print_exc()
             raise
 
+        # 詳細表示用のローダープロファイルで関連データを含め1回だけ読み込む
+        return await self.get_task_with_relations(db, task_id=db_obj.id)
+
     async def get_multi_by_family(
         self,
         db: AsyncSession,
@@ -136,118 +711,104 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         due_before: Optional[date] = None,
         due_after: Optional[date] = None,
         tag_ids: Optional[List[uuid.UUID]] = None,
+        tag_match: str = "any",
+        sort: str = "created_at",
+        order: str = "asc",
         skip: int = 0,
         limit: int = 100,
-    ) -> List[Task]:
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        fields: Optional[Sequence[str]] = None,
+        normalized: bool = False,
+        member_user_id: Optional[uuid.UUID] = None,
+    ) -> Tuple[List[Task], Optional[int], Optional[str]]:
         """
         特定の家族のタスクを検索（フィルタオプション付き）
-        """
-        # 基本クエリの構築
-        query = (
-            select(Task)
-            .options(
-                selectinload(Task.tags),
-                selectinload(Task.assignee),
-                selectinload(Task.created_by),
-                selectinload(Task.subtasks).selectinload(Task.tags),
-                selectinload(Task.subtasks).selectinload(Task.assignee),
-                selectinload(Task.subtasks).selectinload(Task.created_by),
-            )
-            .where(Task.family_id == family_id)
-        )
 
-        # 各フィルタ条件を適用
-        if assignee_id:
-            query = query.where(Task.assignee_id == assignee_id)
+        sortはcreated_at/updated_at/due_date/priority、orderはasc/descを指定する。
+        fieldsを指定すると、その列とリレーションのみを読み込む。
+        normalized=Trueの場合は担当者・作成者を読み込まない（呼び出し側でまとめて取得する）。
+        member_user_idを指定すると、そのユーザーがメンバーの場合のみタスクを返す
 
-        if status:
-            query = query.where(Task.status == status)
-
-        if is_routine is not None:
-            query = query.where(Task.is_routine == is_routine)
-
-        if due_before:
-            query = query.where(Task.due_date <= due_before)
-
-        if due_after:
-            query = query.where(Task.due_date >= due_after)
-
-        if tag_ids and len(tag_ids) > 0:
-            # タグでフィルタ (タスクがタグのいずれかを持っている)
-            query = query.join(task_tags).join(Tag).where(Tag.id.in_(tag_ids))
-
-        # ページネーション
-        query = query.offset(skip).limit(limit)
+        取得したタスク、合計件数（include_total=Falseの場合はNone）、
+        続きがある場合は次ページのカーソルを返す
+        """
+        # 基本クエリの構築と各フィルタ条件の適用
+        query = _apply_task_filters(
+            select(Task),
+            family_id=family_id,
+            assignee_id=assignee_id,
+            status=status,
+            is_routine=is_routine,
+            due_before=due_before,
+            due_after=due_after,
+            tag_ids=tag_ids,
+            tag_match=tag_match,
+            member_user_id=member_user_id,
+        )
 
-        # タスクを取得
-        result = await db.execute(query)
-        tasks = result.unique().scalars().all()
-        return tasks
+        return await _fetch_task_page(
+            db,
+            query,
+            options=task_loader_options(
+                "list_normalized" if normalized else "list_lean", fields, (sort,)
+            ),
+            sort=sort,
+            order=order,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+        )
 
-    async def count_by_family(
+    async def get_task_with_relations(
         self,
         db: AsyncSession,
         *,
-        family_id: uuid.UUID,
-        assignee_id: Optional[uuid.UUID] = None,
-        status: Optional[str] = None,
-        is_routine: Optional[bool] = None,
-        due_before: Optional[date] = None,
-        due_after: Optional[date] = None,
-        tag_ids: Optional[List[uuid.UUID]] = None,
-    ) -> int:
-        """
-        特定の家族のタスク数をカウント（フィルタオプション付き）
-        """
-        from sqlalchemy import func
-
-        query = select(func.count(Task.id)).where(Task.family_id == family_id)
-
-        # 各フィルタ条件を適用
-        if assignee_id:
-            query = query.where(Task.assignee_id == assignee_id)
-
-        if status:
-            query = query.where(Task.status == status)
-
-        if is_routine is not None:
-            query = query.where(Task.is_routine == is_routine)
-
-        if due_before:
-            query = query.where(Task.due_date <= due_before)
-
-        if due_after:
-            query = query.where(Task.due_date >= due_after)
-
-        if tag_ids and len(tag_ids) > 0:
-            # タグでフィルタ
-            query = query.join(task_tags).join(Tag).where(Tag.id.in_(tag_ids))
-
-        # カウント実行
-        result = await db.execute(query)
-        return result.scalar() or 0  # None の場合は0を返す
-
-    async def get_task_with_relations(
-        self, db: AsyncSession, *, task_id: uuid.UUID
+        task_id: uuid.UUID,
+        fields: Optional[Sequence[str]] = None,
     ) -> Optional[Task]:
         """
         タスクと関連情報（作成者、担当者、タグなど）を取得
+
+        fieldsを指定すると、その列とリレーションのみを読み込む
+        （アクセス権の確認に使う家族IDは常に読み込む）
         """
         stmt = (
             select(Task)
-            .options(
-                selectinload(Task.created_by),
-                selectinload(Task.assignee),
-                selectinload(Task.tags),
-                selectinload(Task.subtasks).selectinload(Task.tags),
-                selectinload(Task.subtasks).selectinload(Task.assignee),
-                selectinload(Task.subtasks).selectinload(Task.created_by),
-            )
+            .options(*task_loader_options("detail", fields, ("family_id",)))
             .where(Task.id == task_id)
+            # 同一セッションで作成・更新した直後でも関連を読み直す
+            .execution_options(populate_existing=True)
         )
         result = await db.execute(stmt)
         return result.unique().scalar_one_or_none()
 
+    async def get_with_access(
+        self,
+        db: AsyncSession,
+        *,
+        task_id: uuid.UUID,
+        user_id: uuid.UUID,
+        profile: str = "detail",
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[Optional[Task], bool]:
+        """
+        タスクと、ユーザーがその家族のメンバーかどうかを1回のクエリで取得する
+
+        タスクが存在しない場合は (None, False) を返す
+        """
+        stmt = (
+            select(Task, user_is_member(user_id, Task.family_id).label("is_member"))
+            .options(*task_loader_options(profile, fields, ("family_id",)))
+            .where(Task.id == task_id)
+            .execution_options(populate_existing=True)
+        )
+        row = (await db.execute(stmt)).unique().first()
+        if row is None:
+            return None, False
+        return row[0], bool(row[1])
+
 
 class CRUDTag(CRUDBase[Tag, TagCreate, TagUpdate]):
     async def get_by_name_and_family(
@@ -261,15 +822,39 @@ class CRUDTag(CRUDBase[Tag, TagCreate, TagUpdate]):
         return result.scalars().first()
 
     async def get_by_family(
-        self, db: AsyncSession, *, family_id: uuid.UUID
+        self,
+        db: AsyncSession,
+        *,
+        family_id: uuid.UUID,
+        member_user_id: Optional[uuid.UUID] = None,
     ) -> List[Tag]:
         """
         特定の家族のすべてのタグを取得
+
+        member_user_idを指定すると、そのユーザーがメンバーの場合のみタグを返す
         """
         stmt = select(Tag).where(Tag.family_id == family_id)
+        if member_user_id:
+            stmt = stmt.where(user_is_member(member_user_id, family_id))
         result = await db.execute(stmt)
         return result.scalars().all()
 
+    async def get_with_access(
+        self, db: AsyncSession, *, tag_id: uuid.UUID, user_id: uuid.UUID
+    ) -> Tuple[Optional[Tag], bool]:
+        """
+        タグと、ユーザーがその家族のメンバーかどうかを1回のクエリで取得する
+
+        タグが存在しない場合は (None, False) を返す
+        """
+        stmt = select(
+            Tag, user_is_member(user_id, Tag.family_id).label("is_member")
+        ).where(Tag.id == tag_id)
+        row = (await db.execute(stmt)).first()
+        if row is None:
+            return None, False
+        return row[0], bool(row[1])
+
 
 task = CRUDTask(Task)
 tag = CRUDTag(Tag)
@@ -286,178 +871,669 @@ async def get_task_by_id(db: AsyncSession, task_id: uuid.UUID) -> Optional[Task]
 
 
 async def get_task_with_relations(
-    db: AsyncSession, task_id: uuid.UUID
+    db: AsyncSession, task_id: uuid.UUID, fields: Optional[Sequence[str]] = None
 ) -> Optional[Task]:
     """
     タスクと関連情報を取得
     """
-    return await task.get_task_with_relations(db, task_id=task_id)
+    return await task.get_task_with_relations(db, task_id=task_id, fields=fields)
 
 
-async def get_task_with_subtasks(
-    db: AsyncSession, *, task_id: uuid.UUID
+async def get_task_subtree(
+    db: AsyncSession,
+    *,
+    task_id: uuid.UUID,
+    max_depth: Optional[int] = None,
+    member_user_id: Optional[uuid.UUID] = None,
 ) -> Optional[Task]:
     """
-    タスクとそのサブタスクを取得
+    タスクとその配下のすべてのサブタスクを、階層情報（task_closure）の1回の索引検索で取得する
+
+    max_depthを指定すると、その深さ（直下のサブタスクが1）までに限定する。
+    member_user_idを指定すると、そのユーザーがメンバーでない場合はNoneを返す。
+    取得した行を深さ順に1回走査して各タスクのsubtasksに子を組み立てる
     """
-    # タスクとサブタスクを含む関連情報を一度に取得
     stmt = (
         select(Task)
-        .options(
-            selectinload(Task.created_by),
-            selectinload(Task.assignee),
-            selectinload(Task.tags),
-            selectinload(Task.subtasks).selectinload(Task.tags),
-            selectinload(Task.subtasks).selectinload(Task.assignee),
-            selectinload(Task.subtasks).selectinload(Task.created_by),
+        .join(task_closure, task_closure.c.descendant_id == Task.id)
+        .where(task_closure.c.ancestor_id == task_id)
+        .options(*task_loader_options("list_lean"))
+        .order_by(task_closure.c.depth, Task.created_at, Task.id)
+        .execution_options(populate_existing=True)
+    )
+    if max_depth is not None:
+        stmt = stmt.where(task_closure.c.depth <= max_depth)
+    if member_user_id:
+        stmt = stmt.where(user_is_member(member_user_id, Task.family_id))
+    result = await db.execute(stmt)
+    tasks = result.scalars().all()
+    if not tasks:
+        return None
+
+    # 深さ順に並んでいるため、親は必ず子より先に現れる
+    children = {db_task.id: [] for db_task in tasks}
+    for db_task in tasks[1:]:
+        children[db_task.parent_id].append(db_task)
+
+    # 変更として扱われないよう、読み込み済みの値としてサブタスクを設定する
+    for db_task in tasks:
+        set_committed_value(db_task, "subtasks", children[db_task.id])
+
+    return tasks[0]
+
+
+async def is_task_ancestor(
+    db: AsyncSession, *, ancestor_id: uuid.UUID, descendant_id: uuid.UUID
+) -> bool:
+    """
+    ancestor_idのタスクがdescendant_idのタスクの祖先（または同一）かどうかを確認
+    """
+    stmt = select(
+        exists().where(
+            task_closure.c.ancestor_id == ancestor_id,
+            task_closure.c.descendant_id == descendant_id,
+        )
+    )
+    return bool((await db.execute(stmt)).scalar())
+
+
+async def get_task_summary_rows(
+    db: AsyncSession, *, family_id: uuid.UUID, today: date
+) -> List[Any]:
+    """
+    家族のタスクをステータス・優先度・担当者の組ごとに集計する（1回のGROUP BY）
+
+    各行は件数と、未完了のうち期限切れ・今日が期限のものの件数を持つ
+    """
+    open_task = Task.status != "completed"
+    overdue = case((and_(open_task, Task.due_date < today), 1), else_=0)
+    due_today = case((and_(open_task, Task.due_date == today), 1), else_=0)
+    stmt = (
+        select(
+            Task.status,
+            Task.priority,
+            Task.assignee_id,
+            func.count().label("count"),
+            func.sum(overdue).label("overdue"),
+            func.sum(due_today).label("due_today"),
         )
-        .where(Task.id == task_id)
+        .where(Task.family_id == family_id)
+        .group_by(Task.status, Task.priority, Task.assignee_id)
+    )
+    result = await db.execute(stmt)
+    return result.all()
+
+
+async def get_task_calendar_rows(
+    db: AsyncSession,
+    *,
+    family_id: uuid.UUID,
+    start: date,
+    end: date,
+    member_user_id: Optional[uuid.UUID] = None,
+) -> List[Any]:
+    """
+    期限日がstart以上end未満のタスクを期限日とステータスの組ごとに数える（1回のGROUP BY）
+
+    member_user_idを指定すると、そのユーザーがメンバーでない場合は何も返さない
+    """
+    stmt = select(Task.due_date, Task.status, func.count().label("count")).where(
+        Task.family_id == family_id,
+        Task.due_date >= start,
+        Task.due_date < end,
+    )
+    if member_user_id:
+        stmt = stmt.where(user_is_member(member_user_id, family_id))
+    stmt = stmt.group_by(Task.due_date, Task.status).order_by(Task.due_date)
+    result = await db.execute(stmt)
+    return result.all()
+
+
+async def get_task_board_rows(
+    db: AsyncSession,
+    *,
+    family_id: uuid.UUID,
+    per_column: int,
+    sort: str = "created_at",
+    order: str = "asc",
+    member_user_id: Optional[uuid.UUID] = None,
+) -> List[Tuple[Task, int]]:
+    """
+    ステータスごとに先頭per_column件のタスクと、そのステータスの合計件数を1回のSQLで取得する
+
+    ROW_NUMBER() と count(*) をステータスで区切ったウィンドウ関数で計算し、
+    順位がper_column以下の行のみを返す。各行は (タスク, 列の合計件数) で、
+    ステータス・列内の順位の順に並ぶ。
+    member_user_idを指定すると、そのユーザーがメンバーでない場合は何も返さない
+    """
+    if sort not in _TASK_SORT_KEYS:
+        raise ValueError(f"並び替えキーが不正です: {sort}")
+    sort_column = _TASK_SORT_KEYS[sort][0]
+    if order == "desc":
+        column_order = (sort_column.desc(), Task.id.desc())
+    else:
+        column_order = (sort_column.asc(), Task.id.asc())
+
+    ranked = select(
+        Task.id,
+        func.row_number()
+        .over(partition_by=Task.status, order_by=column_order)
+        .label("position"),
+        func.count().over(partition_by=Task.status).label("column_total"),
+    ).where(Task.family_id == family_id)
+    if member_user_id:
+        ranked = ranked.where(user_is_member(member_user_id, family_id))
+    ranked = ranked.subquery()
+    stmt = (
+        select(Task, ranked.c.column_total)
+        .join(ranked, ranked.c.id == Task.id)
+        .where(ranked.c.position <= per_column)
+        .order_by(Task.status, ranked.c.position)
+        .options(*task_loader_options("list_lean", required_columns=(sort,)))
     )
     result = await db.execute(stmt)
-    return result.unique().scalar_one_or_none()
+    return list(result.tuples())
 
 
 async def get_root_tasks_by_family(
     db: AsyncSession, *, family_id: uuid.UUID, **filter_params
-) -> List[Task]:
+) -> Tuple[List[Task], Optional[int], Optional[str]]:
     """
     特定の家族のルートタスク（親タスクがないタスク）のみを取得
+
+    subtasksはfull（直下のサブタスクを読み込む）、count（件数の要約のみ）、
+    none（サブタスクの情報なし）のいずれかを指定する。
+    取得したタスク、合計件数（include_total=Falseの場合はNone）、
+    続きがある場合は次ページのカーソルを返す
+    """
+    # ページネーション関連のパラメータを分離
+    skip = filter_params.pop("skip", 0)
+    limit = filter_params.pop("limit", 100)
+    cursor = filter_params.pop("cursor", None)
+    include_total = filter_params.pop("include_total", True)
+    sort = filter_params.pop("sort", "created_at")
+    order = filter_params.pop("order", "asc")
+    fields = filter_params.pop("fields", None)
+    normalized = filter_params.pop("normalized", False)
+    subtasks = filter_params.pop("subtasks", "full")
+
+    # 基本クエリの構築と各フィルタ条件の適用
+    query = _apply_task_filters(
+        select(Task), family_id=family_id, roots_only=True, **filter_params
+    )
+
+    # subtasks=full のみサブタスクを読み込む
+    if subtasks == "full":
+        profile = "subtree_normalized" if normalized else "subtree"
+    elif subtasks in ("none", "count"):
+        profile = "list_normalized" if normalized else "list_lean"
+    else:
+        raise ValueError(f"サブタスクの取得方法が不正です: {subtasks}")
+    options = task_loader_options(profile, fields, (sort,))
+
+    if subtasks == "count":
+        # 維持しているサブタスク件数から同じクエリで要約を設定する
+        options = (*options, *_TASK_EXPRESSION_LOADERS.values())
+        # 読み込み済みのタスクにも要約を設定するため
+        query = query.execution_options(populate_existing=True)
+
+    return await _fetch_task_page(
+        db,
+        query,
+        options=options,
+        sort=sort,
+        order=order,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+    )
+
+
+async def get_user_tasks(
+    db: AsyncSession,
+    *,
+    user_id: uuid.UUID,
+    status: Optional[str] = None,
+    order: str = "asc",
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+) -> Tuple[List[Task], Optional[int], Optional[str]]:
+    """
+    ユーザーが担当または作成したタスクを、所属するすべての家族から期限日順に取得する
+
+    所属の確認はfamily_membersとの結合で行うため、家族ごとの権限確認は不要で、
+    脱退した家族のタスクは含まれない。ページングは期限日のキーセット方式のみ。
+    取得したタスク、合計件数（include_total=Falseの場合はNone）、
+    続きがある場合は次ページのカーソルを返す
     """
-    # 基本クエリの構築
     query = (
         select(Task)
-        .where(
+        .join(
+            FamilyMember,
             and_(
-                Task.family_id == family_id,
-                Task.parent_id.is_(None),  # 親タスクがないもののみ
-            )
-        )
-        .options(
-            selectinload(Task.tags),
-            selectinload(Task.assignee),
-            selectinload(Task.created_by),
-            selectinload(Task.subtasks).selectinload(Task.tags),
-            selectinload(Task.subtasks).selectinload(Task.assignee),
-            selectinload(Task.subtasks).selectinload(Task.created_by),
+                FamilyMember.family_id == Task.family_id,
+                FamilyMember.user_id == user_id,
+            ),
         )
+        .where(or_(Task.assignee_id == user_id, Task.created_by_id == user_id))
+    )
+    if status:
+        query = query.where(Task.status == status)
+
+    return await _fetch_task_page(
+        db,
+        query,
+        options=task_loader_options("list_lean", required_columns=("due_date",)),
+        sort="due_date",
+        order=order,
+        skip=0,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
     )
 
-    # 各フィルタ条件を適用
-    if filter_params.get("assignee_id"):
-        query = query.where(Task.assignee_id == filter_params["assignee_id"])
 
-    if filter_params.get("status"):
-        query = query.where(Task.status == filter_params["status"])
+async def create_task(
+    db: AsyncSession, task_create: TaskCreate, created_by_id: uuid.UUID
+) -> Task:
+    """
+    新しいタスクを作成
+    """
+    return await task.create_with_tags(
+        db, obj_in=task_create, created_by_id=created_by_id
+    )
 
-    if filter_params.get("is_routine") is not None:
-        query = query.where(Task.is_routine == filter_params["is_routine"])
 
-    if filter_params.get("due_before"):
-        query = query.where(Task.due_date <= filter_params["due_before"])
+def _new_task_row(
+    task_in: Any, *, task_id: uuid.UUID, created_by_id: uuid.UUID, created_at: datetime
+) -> Dict[str, Any]:
+    """
+    複数行INSERT用のタスクの行を作成する（tag_ids以外の入力項目をそのまま使う）
+    """
+    return {
+        **task_in.model_dump(exclude={"tag_ids"}),
+        "id": task_id,
+        "created_by_id": created_by_id,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+async def _insert_task_rows(
+    db: AsyncSession, rows: List[Dict[str, Any]], links: List[Dict[str, Any]]
+) -> None:
+    """
+    検証済みのタスクの行とタグの関連付けを複数行INSERTで追加する（コミットはしない）
 
-    if filter_params.get("due_after"):
-        query = query.where(Task.due_date >= filter_params["due_after"])
+    階層情報（自分自身と、親の祖先すべてとの組）も1回のINSERT … SELECTで追加し、
+    親タスクのサブタスク件数は親ごとにまとめて更新する
+    """
+    task_ids = [row["id"] for row in rows]
+    await db.execute(insert(Task).values(rows))
+    if links:
+        await db.execute(insert(task_tags).values(links))
 
-    if filter_params.get("tag_ids") and len(filter_params["tag_ids"]) > 0:
-        # タグでフィルタリング
-        query = (
-            query.join(task_tags).join(Tag).where(Tag.id.in_(filter_params["tag_ids"]))
+    new_tasks = (
+        select(Task.id, Task.parent_id).where(Task.id.in_(task_ids)).subquery()
+    )
+    closure_rows = union_all(
+        select(new_tasks.c.id, new_tasks.c.id, literal(0)),
+        select(
+            task_closure.c.ancestor_id, new_tasks.c.id, task_closure.c.depth + 1
+        ).join(new_tasks, task_closure.c.descendant_id == new_tasks.c.parent_id),
+    )
+    await db.execute(
+        insert(task_closure).from_select(
+            ["ancestor_id", "descendant_id", "depth"], closure_rows
         )
+    )
 
-    # ページネーション
-    skip = filter_params.get("skip", 0)
-    limit = filter_params.get("limit", 100)
-    query = query.offset(skip).limit(limit)
+    counters: Dict[uuid.UUID, Tuple[int, int]] = {}
+    for row in rows:
+        parent_id = row.get("parent_id")
+        if parent_id is not None:
+            total, completed = counters.get(parent_id, (0, 0))
+            counters[parent_id] = (
+                total + 1,
+                completed + int(row["status"] == "completed"),
+            )
+    for parent_id, (total, completed) in counters.items():
+        await _adjust_subtask_counters(db, parent_id, total, completed)
 
-    # クエリの実行
-    result = await db.execute(query)
-    tasks = result.unique().scalars().all()
-    return tasks
 
+async def _load_created_tasks(
+    db: AsyncSession, task_ids: List[uuid.UUID]
+) -> List[Task]:
+    """
+    作成したタスクを一覧表示用の関連データとともに1回のクエリで読み込み、指定順に返す
+    """
+    result = await db.execute(
+        select(Task)
+        .options(*task_loader_options("list_lean"))
+        .where(Task.id.in_(task_ids))
+    )
+    created = {db_task.id: db_task for db_task in result.scalars().all()}
+    for db_task in created.values():
+        # 作成したばかりのタスクにサブタスクはないため、読み込まずに空として設定する
+        set_committed_value(db_task, "subtasks", [])
+    return [created[task_id] for task_id in task_ids]
+
+
+async def create_subtasks(
+    db: AsyncSession,
+    *,
+    parent_id: uuid.UUID,
+    family_id: uuid.UUID,
+    subtasks_in: Sequence[SubtaskCreate],
+    created_by_id: uuid.UUID,
+) -> List[Task]:
+    """
+    親タスクの下に複数のサブタスクを1つのトランザクションで一括作成する
 
-async def count_root_tasks_by_family(
-    db: AsyncSession, *, family_id: uuid.UUID, **filter_params
-) -> int:
+    タグの確認は1回のSELECTで行い、タスク・タグの関連付け・階層情報はそれぞれ
+    1回の複数行INSERTで追加する。途中で失敗した場合は何も作成しない。
+    作成したサブタスクは1回のクエリで読み直し、入力と同じ順に返す
     """
-    特定の家族のルートタスク（親タスクがないタスク）の数をカウント
+    if not subtasks_in:
+        return []
+
+    # 指定されたタグのうち、同じ家族に存在するものをまとめて確認する
+    requested_tag_ids = {
+        tag_id for subtask_in in subtasks_in for tag_id in subtask_in.tag_ids or ()
+    }
+    tag_families = await get_tag_family_ids(db, requested_tag_ids)
+
+    now = datetime.utcnow()
+    rows, links = [], []
+    for position, subtask_in in enumerate(subtasks_in):
+        task_id = uuid.uuid4()
+        # 作成日時順で入力と同じ順に並ぶよう、1マイクロ秒ずつずらす
+        row = _new_task_row(
+            subtask_in,
+            task_id=task_id,
+            created_by_id=created_by_id,
+            created_at=now + timedelta(microseconds=position),
+        )
+        rows.append({**row, "family_id": family_id, "parent_id": parent_id})
+        links.extend(
+            {"task_id": task_id, "tag_id": tag_id}
+            for tag_id in dict.fromkeys(subtask_in.tag_ids or ())
+            if tag_families.get(tag_id) == family_id
+        )
+
+    try:
+        await _insert_task_rows(db, rows, links)
+        task_summary_cache.bump_after_commit(db, family_id)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    return await _load_created_tasks(db, [row["id"] for row in rows])
+
+
+async def create_tasks(
+    db: AsyncSession, *, tasks_in: Sequence[TaskCreate], created_by_id: uuid.UUID
+) -> List[Task]:
     """
-    from sqlalchemy import func
+    検証済みの複数のタスクを1つのトランザクションで一括作成する
 
-    query = select(func.count(Task.id)).where(
-        and_(
-            Task.family_id == family_id,
-            Task.parent_id.is_(None),  # 親タスクがないもののみ
+    家族・担当者・タグ・親タスクの確認は呼び出し側で済ませておくこと。
+    タスク・タグの関連付け・階層情報はそれぞれ1回の複数行INSERTで追加し、
+    途中で失敗した場合は何も作成しない。作成したタスクは入力と同じ順に返す
+    """
+    if not tasks_in:
+        return []
+
+    now = datetime.utcnow()
+    rows, links = [], []
+    for position, task_in in enumerate(tasks_in):
+        task_id = uuid.uuid4()
+        rows.append(
+            _new_task_row(
+                task_in,
+                task_id=task_id,
+                created_by_id=created_by_id,
+                created_at=now + timedelta(microseconds=position),
+            )
         )
+        links.extend(
+            {"task_id": task_id, "tag_id": tag_id}
+            for tag_id in dict.fromkeys(task_in.tag_ids or ())
+        )
+
+    try:
+        await _insert_task_rows(db, rows, links)
+        for family_id in {row["family_id"] for row in rows}:
+            task_summary_cache.bump_after_commit(db, family_id)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    return await _load_created_tasks(db, [row["id"] for row in rows])
+
+
+async def update_tasks(
+    db: AsyncSession,
+    *,
+    family_id: uuid.UUID,
+    values: Dict[str, Any],
+    task_ids: Optional[Sequence[uuid.UUID]] = None,
+    **filter_params,
+) -> List[uuid.UUID]:
+    """
+    家族のタスクのうち、IDまたはフィルタ条件に合うものを1回の UPDATE … WHERE で更新し、
+    更新したタスクのIDを返す
+
+    フィルタ条件（member_user_idによる権限の確認を含む）は一覧取得と同じものを使う。
+    ステータスを変更した場合は、影響を受けた親タスクのサブタスク完了件数を数え直す
+    """
+    stmt = _apply_task_filters(update(Task), family_id=family_id, **filter_params)
+    if task_ids is not None:
+        stmt = stmt.where(Task.id.in_(task_ids))
+    stmt = (
+        stmt.values(**values)
+        .returning(Task.id, Task.parent_id)
+        # 条件をPythonで評価できない場合の追加のSELECTを避ける（呼び出し側で読み直す）
+        .execution_options(synchronize_session=False)
     )
 
-    # 各フィルタ条件を適用
-    if filter_params.get("assignee_id"):
-        query = query.where(Task.assignee_id == filter_params["assignee_id"])
+    try:
+        rows = (await db.execute(stmt)).all()
+        if "status" in values:
+            parent_ids = {row.parent_id for row in rows if row.parent_id is not None}
+            await _recount_subtask_counters(db, list(parent_ids))
+        if rows:
+            task_summary_cache.bump_after_commit(db, family_id)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    return [row.id for row in rows]
+
+
+async def reset_completed_routine_tasks(db: AsyncSession) -> int:
+    """
+    完了状態のルーティンタスクを未完了（pending）に戻し、戻した件数を返す
+
+    一括更新と同様に、親タスクのサブタスク完了件数を数え直し、
+    変更のあった家族のタスク集計キャッシュを無効化する
+    """
+    stmt = (
+        update(Task)
+        .where(Task.is_routine.is_(True), Task.status == "completed")
+        .values(status="pending")
+        .returning(Task.id, Task.parent_id, Task.family_id)
+        .execution_options(synchronize_session=False)
+    )
 
-    if filter_params.get("status"):
-        query = query.where(Task.status == filter_params["status"])
+    try:
+        rows = (await db.execute(stmt)).all()
+        parent_ids = {row.parent_id for row in rows if row.parent_id is not None}
+        await _recount_subtask_counters(db, list(parent_ids))
+        for family_id in {row.family_id for row in rows}:
+            task_summary_cache.bump_after_commit(db, family_id)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
 
-    if filter_params.get("is_routine") is not None:
-        query = query.where(Task.is_routine == filter_params["is_routine"])
+    return len(rows)
 
-    if filter_params.get("due_before"):
-        query = query.where(Task.due_date <= filter_params["due_before"])
 
-    if filter_params.get("due_after"):
-        query = query.where(Task.due_date >= filter_params["due_after"])
+async def patch_task(
+    db: AsyncSession,
+    *,
+    task_id: uuid.UUID,
+    member_user_id: uuid.UUID,
+    values: Dict[str, Any],
+    fields: Sequence[str],
+) -> Optional[Task]:
+    """
+    タスクの指定された列のみを1回の UPDATE … RETURNING で更新し、更新後のタスクを返す
 
-    if filter_params.get("tag_ids") and len(filter_params["tag_ids"]) > 0:
-        # タグでフィルタ
-        query = (
-            query.join(task_tags).join(Tag).where(Tag.id.in_(filter_params["tag_ids"]))
+    権限の確認（member_user_idが家族のメンバーか）と、担当者を変更する場合は
+    担当者が家族のメンバーかの確認も同じUPDATEの条件として評価し、
+    条件に合わない場合は何も更新せずNoneを返す。
+    RETURNINGではfieldsに指定された列のみを返し、関連もfieldsに含まれるものだけ読み込む
+    """
+    stmt = update(Task).where(
+        Task.id == task_id, user_is_member(member_user_id, Task.family_id)
+    )
+    if values.get("assignee_id") is not None:
+        stmt = stmt.where(user_is_member(values["assignee_id"], Task.family_id))
+    stmt = (
+        stmt.values(**values)
+        .returning(Task)
+        .options(
+            *task_loader_options(
+                "detail", fields, required_columns=("family_id", "parent_id")
+            )
         )
+        .execution_options(populate_existing=True)
+    )
 
-    result = await db.execute(query)
-    return result.scalar() or 0  # None の場合は0を返す
+    try:
+        db_task = (await db.execute(stmt)).scalars().first()
+        if db_task is not None and "status" in values and db_task.parent_id:
+            # 変更前のステータスはRETURNINGで得られないため、親の件数は数え直す
+            await _recount_subtask_counters(db, [db_task.parent_id])
+        if db_task is not None:
+            task_summary_cache.bump_after_commit(db, db_task.family_id)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
 
+    return db_task
 
-async def create_task(
-    db: AsyncSession, task_create: TaskCreate, created_by_id: uuid.UUID
-) -> Task:
+
+async def get_tag_family_ids(
+    db: AsyncSession, tag_ids: Sequence[uuid.UUID]
+) -> Dict[uuid.UUID, uuid.UUID]:
     """
-    新しいタスクを作成
+    タグIDごとの家族IDを1回のクエリで取得する（存在しないタグは含まれない）
     """
-    return await task.create_with_tags(
-        db, obj_in=task_create, created_by_id=created_by_id
+    if not tag_ids:
+        return {}
+    result = await db.execute(
+        select(Tag.id, Tag.family_id).where(Tag.id.in_(list(tag_ids)))
+    )
+    return dict(result.all())
+
+
+async def get_task_family_ids(
+    db: AsyncSession, task_ids: Sequence[uuid.UUID]
+) -> Dict[uuid.UUID, uuid.UUID]:
+    """
+    タスクIDごとの家族IDを1回のクエリで取得する（存在しないタスクは含まれない）
+    """
+    if not task_ids:
+        return {}
+    result = await db.execute(
+        select(Task.id, Task.family_id).where(Task.id.in_(list(task_ids)))
     )
+    return dict(result.all())
 
 
 async def update_task(db: AsyncSession, db_task: Task, task_update: TaskUpdate) -> Task:
     """
     タスクを更新
     """
-    # レスポンス出力前にモデルの必要な属性を適切に設定
-    # サブタスクは空リストとして初期化
-    if not hasattr(db_task, "subtasks"):
-        db_task.subtasks = []
-
     return await task.update_with_tags(db, db_obj=db_task, obj_in=task_update)
 
 
-async def delete_task(db: AsyncSession, task_id: uuid.UUID) -> Optional[Task]:
+async def _delete_task_rows(db: AsyncSession, stmt: Delete) -> List[uuid.UUID]:
+    """
+    タスクの DELETE を RETURNING 付きで1回実行し、削除したタスクのIDを返す
+
+    配下のサブタスク・タグの紐付け・クロージャテーブルの行は外部キーの
+    ON DELETE CASCADE でデータベースが削除するため、部分木の大きさによらず
+    読み込みも1行ずつの削除も行わない。削除されずに残った親タスクのサブタスク件数は数え直す
+    """
+    stmt = stmt.returning(Task.id, Task.parent_id, Task.family_id).execution_options(
+        synchronize_session=False
+    )
+
+    try:
+        rows = (await db.execute(stmt)).all()
+        deleted_ids = {row.id for row in rows}
+        parent_ids = {
+            row.parent_id
+            for row in rows
+            if row.parent_id is not None and row.parent_id not in deleted_ids
+        }
+        await _recount_subtask_counters(db, list(parent_ids))
+        for family_id in {row.family_id for row in rows}:
+            task_summary_cache.bump_after_commit(db, family_id)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    return [row.id for row in rows]
+
+
+async def delete_task(db: AsyncSession, task_id: uuid.UUID) -> List[uuid.UUID]:
+    """
+    タスクを配下のサブタスクごと削除し、削除したタスクのIDを返す
+
+    存在しないタスクの場合は何も削除せず、空のリストを返す
     """
-    タスクを削除
+    return await _delete_task_rows(db, delete(Task).where(Task.id == task_id))
+
+
+async def delete_tasks(
+    db: AsyncSession,
+    *,
+    family_id: uuid.UUID,
+    task_ids: Optional[Sequence[uuid.UUID]] = None,
+    **filter_params,
+) -> List[uuid.UUID]:
+    """
+    家族のタスクのうち、IDまたはフィルタ条件に合うものを配下のサブタスクごと削除し、
+    削除した対象のIDを返す（CASCADEで削除された配下のサブタスクは含まない）
+
+    フィルタ条件（member_user_idによる権限の確認を含む）は一覧取得と同じものを使う
     """
-    return await task.remove(db, id=task_id)
+    stmt = _apply_task_filters(delete(Task), family_id=family_id, **filter_params)
+    if task_ids is not None:
+        stmt = stmt.where(Task.id.in_(task_ids))
+
+    return await _delete_task_rows(db, stmt)
 
 
 async def get_family_tasks(
     db: AsyncSession, family_id: uuid.UUID, **kwargs
-) -> Tuple[List[Task], int]:
+) -> Tuple[List[Task], Optional[int], Optional[str]]:
     """
-    特定の家族のタスク一覧を取得し、合計数も返す
+    特定の家族のタスク一覧を取得し、合計数と次ページのカーソルも返す
     """
-    # 検索とカウントのパラメータを分離する
-    count_params = {k: v for k, v in kwargs.items() if k not in ["skip", "limit"]}
-
-    tasks = await task.get_multi_by_family(db, family_id=family_id, **kwargs)
-    count = await task.count_by_family(db, family_id=family_id, **count_params)
-    return tasks, count
+    return await task.get_multi_by_family(db, family_id=family_id, **kwargs)
 
 
 async def create_tag(db: AsyncSession, tag_create: TagCreate) -> Tag:
@@ -467,25 +1543,44 @@ async def create_tag(db: AsyncSession, tag_create: TagCreate) -> Tag:
     return await tag.create(db, obj_in=tag_create)
 
 
-async def get_family_tags(db: AsyncSession, family_id: uuid.UUID) -> List[Tag]:
+async def get_family_tags(
+    db: AsyncSession,
+    family_id: uuid.UUID,
+    member_user_id: Optional[uuid.UUID] = None,
+) -> List[Tag]:
     """
     特定の家族のすべてのタグを取得
     """
-    return await tag.get_by_family(db, family_id=family_id)
+    return await tag.get_by_family(
+        db, family_id=family_id, member_user_id=member_user_id
+    )
 
 
 async def check_user_task_access(
-    db: AsyncSession, user_id: uuid.UUID, task_id: uuid.UUID
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    task_id: uuid.UUID,
+    fields: Optional[Sequence[str]] = None,
+    profile: str = "detail",
 ) -> Tuple[Optional[Task], bool]:
     """
     ユーザーがタスクにアクセス可能かどうかを確認し、タスクを返す
+
+    タスクの取得とメンバーかどうかの確認は1回のクエリで行う
     """
-    # タスクを取得
-    db_task = await get_task_with_relations(db, task_id)
-    if not db_task:
-        return None, False
+    return await task.get_with_access(
+        db, task_id=task_id, user_id=user_id, profile=profile, fields=fields
+    )
 
-    # ユーザーが家族のメンバーかどうかを確認
-    has_access = await is_user_family_member(db, user_id, db_task.family_id)
 
-    return db_task, has_access
+async def get_task_access(
+    db: AsyncSession, user_id: uuid.UUID, task_id: uuid.UUID
+) -> Optional[bool]:
+    """
+    ユーザーがタスクの家族のメンバーかどうかを返す（タスクが存在しない場合はNone）
+
+    権限で絞り込んだクエリが何も返さなかった場合に、404と403を区別するために使う
+    """
+    stmt = select(user_is_member(user_id, Task.family_id)).where(Task.id == task_id)
+    result = (await db.execute(stmt)).first()
+    return None if result is None else bool(result[0])
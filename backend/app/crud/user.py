@@ -1,5 +1,5 @@
 import uuid
-from typing import Optional
+from typing import Iterable, List, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -19,6 +19,19 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         result = await db.execute(stmt)
         return result.scalars().first()
 
+    async def get_by_ids(
+        self, db: AsyncSession, *, user_ids: Iterable[uuid.UUID]
+    ) -> List[User]:
+        """
+        複数のIDのユーザーを1回のクエリでまとめて取得
+        """
+        ids = list(dict.fromkeys(user_ids))
+        if not ids:
+            return []
+        stmt = select(User).where(User.id.in_(ids))
+        result = await db.execute(stmt)
+        return result.scalars().all()
+
     async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
         """
         新規ユーザーを作成（パスワードはハッシュ化）
@@ -61,6 +74,15 @@ async def get_user_by_id(db: AsyncSession, user_id: uuid.UUID) -> Optional[User]
     return await user.get(db, id=user_id)
 
 
+async def get_users_by_ids(
+    db: AsyncSession, user_ids: Iterable[uuid.UUID]
+) -> List[User]:
+    """
+    複数のIDのユーザーをまとめて取得
+    """
+    return await user.get_by_ids(db, user_ids=user_ids)
+
+
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """
     メールアドレスでユーザーを検索
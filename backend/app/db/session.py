@@ -58,6 +58,24 @@ SessionLocal = async_sessionmaker(
     class_=AsyncSession,
 )
 
+# セーブポイントで参加しているセッションのinfoに、参加先のセッションを保持するキー
+OUTER_SESSION_KEY = "outer_session"
+
+
+async def create_savepoint_session(db: AsyncSession) -> AsyncSession:
+    """
+    dbのトランザクションにセーブポイントで参加するセッションを作成する
+
+    作成したセッションのコミットはセーブポイントの解放になり、dbのコミットで確定する
+    """
+    return AsyncSession(
+        bind=await db.connection(),
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
+        info={OUTER_SESSION_KEY: db.sync_session},
+    )
+
+
 # DB接続用の依存性関数
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
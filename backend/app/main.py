@@ -10,6 +10,7 @@ import asyncio
 from app.core.config import settings
 from app.routers.api import api_router
 from app.db.session import init_db
+from app.services.idempotency import run_idempotency_key_cleanup
 
 # ログ設定
 logging.basicConfig(
@@ -79,6 +80,22 @@ async def startup_event():
 
     await init_db()
 
+    # 期限切れのIdempotency-Keyの定期削除をバックグラウンドで開始
+    app.state.idempotency_key_cleanup = asyncio.create_task(
+        run_idempotency_key_cleanup()
+    )
+
+
+# アプリケーション終了時に実行する処理
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    アプリケーション終了時の処理
+    """
+    cleanup = getattr(app.state, "idempotency_key_cleanup", None)
+    if cleanup is not None:
+        cleanup.cancel()
+
 
 @app.get("/")
 async def root():
@@ -3,3 +3,4 @@ from app.models.user import User
 from app.models.family import Family, FamilyMember
 from app.models.task import Task, Tag
 from app.models.token import RefreshToken
+from app.models.idempotency import IdempotencyKey
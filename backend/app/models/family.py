@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import ForeignKey, String, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
@@ -27,11 +27,18 @@ class Family(Base):
     members: Mapped[List["FamilyMember"]] = relationship(
         back_populates="family", cascade="all, delete-orphan"
     )
+    # タスクとタグは家族の削除時に読み込まず、外部キーの ON DELETE CASCADE に任せる
     tasks: Mapped[List["Task"]] = relationship(
-        "Task", back_populates="family", cascade="all, delete-orphan"
+        "Task",
+        back_populates="family",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     tags: Mapped[List["Tag"]] = relationship(
-        "Tag", back_populates="family", cascade="all, delete-orphan"
+        "Tag",
+        back_populates="family",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
 
@@ -53,4 +60,13 @@ class FamilyMember(Base):
     user: Mapped["User"] = relationship("User", back_populates="family_memberships")
     family: Mapped[Family] = relationship(Family, back_populates="members")
 
-    __table_args__ = (UniqueConstraint("user_id", "family_id", name="uq_user_family"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "family_id", name="uq_user_family"),
+        # 家族単位のメンバー一覧・権限確認をインデックスのみで済ませるためのカバリングインデックス
+        Index(
+            "ix_family_members_family_id_user_id",
+            "family_id",
+            "user_id",
+            postgresql_include=["is_admin", "role"],
+        ),
+    )
@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import JSON, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Idempotency-Keyヘッダー付きで実行したリクエストの結果
+
+    (ユーザー, キー) ごとに1行で、同じキーで再送されたリクエストには
+    保存したレスポンスを返す。status_code がNULLの行は処理中を表し、
+    created_at（登録・取り直しの日時）からリース期間が過ぎると取り直せる
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # メソッド・パス・ボディのSHA-256（同じキーで別のリクエストが送られたことの検出用）
+    request_hash: Mapped[str] = mapped_column(String(64))
+    status_code: Mapped[Optional[int]] = mapped_column(nullable=True)
+    response_body: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+    # 期限切れのキーをまとめて削除するためのインデックス
+    __table_args__ = (Index("ix_idempotency_keys_created_at", "created_at"),)
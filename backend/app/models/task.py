@@ -2,8 +2,21 @@ import uuid
 from datetime import date, datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import Column, ForeignKey, String, Table, Text, UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+    case,
+    func,
+    literal_column,
+)
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
+from sqlalchemy.sql.expression import Grouping
 
 from app.db.session import Base
 
@@ -18,6 +31,24 @@ task_tags = Table(
     Base.metadata,
     Column("task_id", ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
     Column("tag_id", ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    # タグ側からの逆引き（タグ削除時のカスケードなど）用
+    Index("ix_task_tags_tag_id_task_id", "tag_id", "task_id"),
+)
+
+# タスク階層のクロージャテーブル（祖先と子孫のすべての組と、その間の深さ）
+# 自分自身との組（depth=0）も含む。app/crud/task.py の作成・付け替え・削除で維持する
+task_closure = Table(
+    "task_closure",
+    Base.metadata,
+    Column(
+        "ancestor_id", ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    ),
+    Column(
+        "descendant_id", ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    ),
+    Column("depth", Integer, nullable=False),
+    # 祖先の列挙（descendant_id 起点）用
+    Index("ix_task_closure_descendant_id_depth", "descendant_id", "depth"),
 )
 
 
@@ -51,34 +82,110 @@ class Task(Base):
     parent_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True
     )
+    # 直下のサブタスクの件数と完了件数（app/crud/task.py でサブタスクの書き込み時に更新）
+    subtask_total: Mapped[int] = mapped_column(default=0, server_default="0")
+    subtask_completed: Mapped[int] = mapped_column(default=0, server_default="0")
+    # サブタスクの要約（ルートタスク一覧で subtasks=count 指定時のみ同じクエリで設定）
+    subtask_count: Mapped[Optional[int]] = query_expression()
+    has_subtasks: Mapped[Optional[bool]] = query_expression()
 
     # リレーションシップ
-    family: Mapped["Family"] = relationship("Family", back_populates="tasks", lazy="selectin")
+    # いずれも既定では読み込まず、読み込んでいないままアクセスするとエラーにする
+    # （lazy="raise"）。読み込みが必要な処理は app/crud/task.py の
+    # ローダープロファイルで明示的に指定する
+    family: Mapped["Family"] = relationship(
+        "Family", back_populates="tasks", lazy="raise"
+    )
     assignee: Mapped[Optional["User"]] = relationship(
-        "User", foreign_keys=[assignee_id], back_populates="assigned_tasks", lazy="selectin"
+        "User", foreign_keys=[assignee_id], back_populates="assigned_tasks", lazy="raise"
     )
     created_by: Mapped["User"] = relationship(
-        "User", foreign_keys=[created_by_id], back_populates="created_tasks", lazy="selectin"
+        "User", foreign_keys=[created_by_id], back_populates="created_tasks", lazy="raise"
     )
     tags: Mapped[List["Tag"]] = relationship(
         secondary=task_tags,
         back_populates="tasks",
-        lazy="selectin",
+        lazy="raise",
+        passive_deletes=True,
     )
 
     # サブタスク関連のリレーションシップ
     parent: Mapped[Optional["Task"]] = relationship(
-        "Task", remote_side=[id], back_populates="subtasks", foreign_keys=[parent_id]
+        "Task",
+        remote_side=[id],
+        back_populates="subtasks",
+        foreign_keys=[parent_id],
+        lazy="raise",
     )
+    # 削除時に配下のサブタスクを読み込まず、外部キーの ON DELETE CASCADE に任せる
     subtasks: Mapped[List["Task"]] = relationship(
         "Task",
         back_populates="parent",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         foreign_keys=[parent_id],
-        lazy="selectin",  # eagerローディングに変更してパフォーマンスを改善
+        lazy="raise",
     )
 
 
+# 一覧の並び替えに使う式
+# インデックスの式とクエリのORDER BYを一致させる必要があるため、定数はリテラルで埋め込む
+TASK_DUE_DATE_FALLBACK = date(9999, 12, 31)  # 期限なしのタスクは昇順で最後尾
+TASK_PRIORITY_RANKS = {"high": 3, "medium": 2, "low": 1}
+
+task_due_date_sort_key = func.coalesce(
+    Task.due_date, literal_column(f"'{TASK_DUE_DATE_FALLBACK.isoformat()}'")
+)
+task_priority_rank = case(
+    *[
+        (Task.priority == literal_column(f"'{name}'"), literal_column(str(rank), Integer))
+        for name, rank in TASK_PRIORITY_RANKS.items()
+    ],
+    else_=literal_column("0", Integer),
+)
+
+# 家族ごとのタスク一覧をソートキー + IDの順に読むための複合インデックス
+Index("ix_tasks_family_id_created_at_id", Task.family_id, Task.created_at, Task.id)
+Index("ix_tasks_family_id_updated_at_id", Task.family_id, Task.updated_at, Task.id)
+Index("ix_tasks_family_id_due_date_sort", Task.family_id, task_due_date_sort_key, Task.id)
+Index(
+    "ix_tasks_family_id_priority_rank",
+    Task.family_id,
+    Grouping(task_priority_rank),  # PostgreSQLでは式インデックスに括弧が必要
+    Task.id,
+)
+
+# ルートタスク一覧（parent_id IS NULL）用の部分インデックス
+Index(
+    "ix_tasks_family_id_created_at_id_roots",
+    Task.family_id,
+    Task.created_at,
+    Task.id,
+    postgresql_where=Task.parent_id.is_(None),
+    sqlite_where=Task.parent_id.is_(None),
+)
+# サブタスクの読み込み（parent_id IN (...)）用
+Index(
+    "ix_tasks_parent_id",
+    Task.parent_id,
+    postgresql_where=Task.parent_id.isnot(None),
+    sqlite_where=Task.parent_id.isnot(None),
+)
+# 担当者・作成者での絞り込みと、ユーザー削除時の SET NULL 用
+Index("ix_tasks_family_id_assignee_id", Task.family_id, Task.assignee_id)
+Index(
+    "ix_tasks_assignee_id",
+    Task.assignee_id,
+    postgresql_where=Task.assignee_id.isnot(None),
+    sqlite_where=Task.assignee_id.isnot(None),
+)
+Index("ix_tasks_created_by_id", Task.created_by_id)
+# ステータスでの絞り込み用
+Index("ix_tasks_family_id_status", Task.family_id, Task.status)
+# カレンダー表示（期限日の範囲指定と期限日ごとの集計）用
+Index("ix_tasks_family_id_due_date", Task.family_id, Task.due_date, Task.status)
+
+
 class Tag(Base):
     __tablename__ = "tags"
 
@@ -89,12 +196,18 @@ class Tag(Base):
         ForeignKey("families.id", ondelete="CASCADE")
     )
 
-    # リレーションシップ
-    family: Mapped["Family"] = relationship("Family", back_populates="tags", lazy="selectin")
+    # リレーションシップ（既定では読み込まず、アクセスするとエラーにする）
+    family: Mapped["Family"] = relationship(
+        "Family", back_populates="tags", lazy="raise"
+    )
     tasks: Mapped[List[Task]] = relationship(
         secondary=task_tags,
         back_populates="tags",
-        lazy="selectin",
+        lazy="raise",
+        passive_deletes=True,
     )
 
-    __table_args__ = (UniqueConstraint("name", "family_id", name="uq_tag_name_family"),)
+    __table_args__ = (
+        UniqueConstraint("name", "family_id", name="uq_tag_name_family"),
+        Index("ix_tags_family_id", "family_id"),
+    )
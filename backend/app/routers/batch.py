@@ -0,0 +1,39 @@
+from typing import Annotated, List
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import get_current_user, get_db
+from app.models.user import User
+from app.schemas.batch import BatchOperationResult, BatchRequest
+from app.schemas.common import Response
+from app.services.batch import run_batch_for_user
+
+router = APIRouter()
+
+
+@router.post("", response_model=Response[List[BatchOperationResult]])
+async def run_batch(
+    batch_in: BatchRequest,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    タスク・タグの複数の操作を1回のリクエストでまとめて実行（最大50件）
+
+    操作は指定した順に1つのトランザクションで実行し、認証も1回だけ行う。
+    操作ごとのステータスコードと結果をdataで返す。失敗した操作があれば
+    そこで中断してすべて取り消し、失敗した操作の位置（index）と理由をerrorsで返す
+    """
+    results = await run_batch_for_user(db, batch_in.operations, current_user.id)
+    errors = [
+        {"index": result.index, "detail": result.detail}
+        for result in results
+        if result.detail is not None
+    ]
+    return Response(
+        data=results,
+        message=("バッチを取り消しました" if errors else f"{len(results)}件の操作を実行しました"),
+        errors=errors or None,
+        success=not errors,
+    )
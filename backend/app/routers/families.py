@@ -1,12 +1,12 @@
 import uuid
-from typing import Annotated, List
+from typing import Annotated, List, Literal
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.deps import get_current_user, get_db
+from app.core.deps import get_current_user, get_db, get_idempotent_request
 from app.crud.family import get_families_by_user, update_family
 from app.models.family import FamilyMember
 from app.models.user import User
@@ -18,12 +18,23 @@ from app.schemas.family import (
     FamilyResponse,
     FamilyUpdate,
 )
+from app.schemas.task import (
+    TaskBoardResponse,
+    TaskCalendarResponse,
+    TaskSummaryResponse,
+)
 from app.services.family import (
     add_family_member_by_email,
     check_family_access,
     create_family_with_admin,
     remove_family_member,
 )
+from app.services.idempotency import IdempotentRequest
+from app.services.task import (
+    get_task_board_for_family,
+    get_task_calendar_for_family,
+    get_task_summary_for_family,
+)
 
 router = APIRouter()
 
@@ -98,22 +109,26 @@ async def add_family_member(
     family_id: uuid.UUID,
     member_in: FamilyMemberCreate,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    idempotency: Annotated[IdempotentRequest, Depends(get_idempotent_request)],
 ):
     """
     家族にメンバーを追加（管理者のみ可能）
+
+    Idempotency-Keyヘッダーを付けた場合、同じキーでの再送には追加済みの結果を返す
     """
+    if idempotency.replay is not None:
+        return idempotency.replay
     # メンバーを追加（サービスレイヤーで管理者権限チェックを実施）
     try:
-        member = await add_family_member_by_email(db, family_id, current_user.id, member_in)
+        member = await add_family_member_by_email(
+            idempotency.db, family_id, current_user.id, member_in
+        )
         
-        # 返却値の型に応じて処理
-        if isinstance(member, dict):
-            # 辞書型の場合はそのまま使用
-            return Response(data=member, message="メンバーを追加しました")
-        else:
-            # FamilyMemberオブジェクトの場合は通常処理
-            return Response(data=member, message="メンバーを追加しました")
+        # 返却値は辞書型・FamilyMemberオブジェクトのどちらでもレスポンスモデルで変換できる
+        return await idempotency.respond(
+            Response[FamilyMemberResponse](data=member, message="メンバーを追加しました"),
+            status.HTTP_201_CREATED,
+        )
     except Exception as e:
         print(f"家族メンバー追加中にエラー発生: {str(e)}")
         raise
@@ -155,3 +170,50 @@ async def remove_family_member_endpoint(
     # メンバーを削除（サービスレイヤーで管理者権限チェックを実施）
     await remove_family_member(db, family_id, current_user.id, user_id)
     return Response(message="メンバーを削除しました", success=True)
+
+
+@router.get("/{family_id}/tasks/summary", response_model=Response[TaskSummaryResponse])
+async def read_family_task_summary(
+    family_id: uuid.UUID,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    家族のタスク集計（ステータス・優先度・担当者別の件数、期限切れ・今日が期限の件数）を取得
+    """
+    summary = await get_task_summary_for_family(db, current_user.id, family_id)
+    return Response(data=summary, message="タスクの集計を取得しました")
+
+
+@router.get(
+    "/{family_id}/tasks/calendar", response_model=Response[TaskCalendarResponse]
+)
+async def read_family_task_calendar(
+    family_id: uuid.UUID,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    month: str = Query(..., pattern=r"^\d{4}-\d{2}$"),
+):
+    """
+    指定月（YYYY-MM）の期限日ごとのタスク件数をステータス別に取得（タスクのある日のみ）
+    """
+    calendar = await get_task_calendar_for_family(db, current_user.id, family_id, month)
+    return Response(data=calendar, message="カレンダーのタスク件数を取得しました")
+
+
+@router.get("/{family_id}/tasks/board", response_model=Response[TaskBoardResponse])
+async def read_family_task_board(
+    family_id: uuid.UUID,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    per_column: int = Query(20, ge=1, le=100),
+    sort: Literal["created_at", "updated_at", "due_date", "priority"] = "created_at",
+    order: Literal["asc", "desc"] = "asc",
+):
+    """
+    かんばんボード用に、ステータスごとの先頭per_column件のタスクと各ステータスの合計件数を取得
+    """
+    board = await get_task_board_for_family(
+        db, current_user.id, family_id, per_column, sort=sort, order=order
+    )
+    return Response(data=board, message="ボードを取得しました")
@@ -1,15 +1,19 @@
 import uuid
 from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_user, get_db
-from app.crud.task import tag
 from app.models.user import User
 from app.schemas.common import Response
 from app.schemas.task import TagCreate, TagResponse, TagUpdate
-from app.services.task import create_tag_for_family, get_tags_for_family
+from app.services.task import (
+    create_tag_for_family,
+    delete_tag_for_user,
+    get_tags_for_family,
+    update_tag_for_user,
+)
 
 router = APIRouter()
 
@@ -52,18 +56,7 @@ async def update_tag(
     """
     タグを更新
     """
-    # タグを取得
-    db_tag = await tag.get(db, id=tag_id)
-    if not db_tag:
-        raise HTTPException(status_code=404, detail="タグが見つかりません")
-
-    # ユーザーがこの家族のメンバーであることを確認
-    from app.services.task import check_family_membership
-
-    await check_family_membership(db, current_user.id, db_tag.family_id)
-
-    # タグを更新
-    updated_tag = await tag.update(db, db_obj=db_tag, obj_in=tag_in)
+    updated_tag = await update_tag_for_user(db, tag_id, tag_in, current_user.id)
     return Response(data=updated_tag, message="タグを更新しました")
 
 
@@ -76,16 +69,5 @@ async def delete_tag(
     """
     タグを削除
     """
-    # タグを取得
-    db_tag = await tag.get(db, id=tag_id)
-    if not db_tag:
-        raise HTTPException(status_code=404, detail="タグが見つかりません")
-
-    # ユーザーがこの家族のメンバーであることを確認
-    from app.services.task import check_family_membership
-
-    await check_family_membership(db, current_user.id, db_tag.family_id)
-
-    # タグを削除
-    deleted_tag = await tag.remove(db, id=tag_id)
+    deleted_tag = await delete_tag_for_user(db, tag_id, current_user.id)
     return Response(data=deleted_tag, message="タグを削除しました")
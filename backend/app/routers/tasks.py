@@ -1,28 +1,101 @@
 import uuid
 from datetime import date
-from typing import Annotated, List, Optional
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, get_db
+from app.core.deps import get_current_user, get_db, get_idempotent_request
 from app.models.user import User
 from app.schemas.common import PaginatedResponse, Response
-from app.schemas.task import BulkSubtaskCreate, SubtaskCreate, TaskCreate, TaskResponse, TaskUpdate
+from app.schemas.task import (
+    BulkSubtaskCreate,
+    NormalizedTaskListResponse,
+    SubtaskCreate,
+    TaskBulkCreate,
+    TaskBulkDelete,
+    TaskBulkResult,
+    TaskBulkUpdate,
+    TaskCreate,
+    TaskListItemResponse,
+    TaskPatch,
+    TaskResponse,
+    TaskTreeResponse,
+    TaskUpdate,
+)
+from app.services.idempotency import IdempotentRequest
 from app.services.task import (
     create_task_for_family,
+    create_tasks_for_user,
     delete_task_for_user,
+    delete_tasks_for_user,
     get_task_for_user,
     get_tasks_for_family,
     get_root_tasks_for_family,
     get_task_with_subtasks_for_user,
+    get_task_tree_for_user,
     create_subtask_for_user,
     create_bulk_subtasks_for_user,
     update_task_for_user,
+    update_tasks_for_user,
+    normalize_task_list,
+    parse_task_fields,
+    patch_task_for_user,
+    serialize_task_fields,
 )
+from app.utils.pagination import count_pages
 
 router = APIRouter()
 
+# fields= 指定時は指定項目のみの辞書を返すため、部分的なタスクも許容する
+TaskOrFields = Union[TaskResponse, Dict[str, Any]]
+# 一覧（GET /tasks）はサブタスクを含まない。ルートタスク一覧はsubtasks=fullの場合のみ含む
+TaskListItemOrFields = Union[TaskListItemResponse, Dict[str, Any]]
+RootTaskOrFields = Union[TaskResponse, TaskListItemResponse, Dict[str, Any]]
+# format=normalized 指定時は正規化形式の一覧を返す
+TaskListResponse = Union[
+    NormalizedTaskListResponse, PaginatedResponse[List[TaskListItemOrFields]]
+]
+RootTaskListResponse = Union[
+    NormalizedTaskListResponse, PaginatedResponse[List[RootTaskOrFields]]
+]
+
+
+async def _build_task_list_response(
+    db: AsyncSession,
+    tasks: List[Any],
+    *,
+    message: str,
+    total: Optional[int],
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    next_cursor: Optional[str],
+    task_fields: Optional[List[str]],
+    normalized: bool,
+) -> PaginatedResponse:
+    """
+    タスク一覧のレスポンスを指定された形式（通常・fields指定・正規化）で組み立てる
+    """
+    page_info = {
+        "message": message,
+        "total": total,
+        "page": (skip // limit) + 1 if limit > 0 and not cursor else 1,
+        "size": len(tasks),
+        "pages": count_pages(total, limit),
+        "next_cursor": next_cursor,
+    }
+
+    if normalized:
+        data, users, tags = await normalize_task_list(db, tasks)
+        return NormalizedTaskListResponse(
+            data=data, users=users, tags=tags, **page_info
+        )
+
+    if task_fields is not None:
+        tasks = [serialize_task_fields(task, task_fields) for task in tasks]
+    return PaginatedResponse(data=tasks, **page_info)
+
 
 @router.post(
     "", response_model=Response[TaskResponse], status_code=status.HTTP_201_CREATED
@@ -30,16 +103,76 @@ router = APIRouter()
 async def create_task(
     task_in: TaskCreate,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    idempotency: Annotated[IdempotentRequest, Depends(get_idempotent_request)],
 ):
     """
     新しいタスクを作成
+
+    Idempotency-Keyヘッダーを付けた場合、同じキーでの再送には作成済みの結果を返す
+    """
+    if idempotency.replay is not None:
+        return idempotency.replay
+    task = await create_task_for_family(idempotency.db, task_in, current_user.id)
+    return await idempotency.respond(
+        Response[TaskResponse](data=task, message="タスクを作成しました"),
+        status.HTTP_201_CREATED,
+    )
+
+
+@router.post("/bulk", response_model=Response[List[TaskResponse]])
+async def create_tasks_bulk(
+    bulk_in: TaskBulkCreate,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    複数のタスクを一括作成（最大500件）
+
+    問題のない項目のみを作成し、作成したタスクを入力順にdataで返す。
+    作成できなかった項目は入力の位置（index）と理由をerrorsで返す
+    """
+    created, errors = await create_tasks_for_user(db, bulk_in.tasks, current_user.id)
+    return Response(
+        data=created,
+        message=f"{len(created)}件のタスクを作成しました",
+        errors=[error.model_dump() for error in errors] or None,
+        success=not errors,
+    )
+
+
+@router.patch("/bulk", response_model=Response[TaskBulkResult])
+async def update_tasks_bulk(
+    bulk_in: TaskBulkUpdate,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    家族のタスクを一括更新（例：今日のタスクをすべて完了にする）
+
+    idsまたはfilters（GET /tasks と同じ条件）で対象を指定し、patchの項目を更新する。
+    更新したタスクのIDと件数を返す
+    """
+    result = await update_tasks_for_user(db, bulk_in, current_user.id)
+    return Response(data=result, message=f"{result.count}件のタスクを更新しました")
+
+
+@router.delete("/bulk", response_model=Response[TaskBulkResult])
+async def delete_tasks_bulk(
+    bulk_in: TaskBulkDelete,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    家族のタスクを配下のサブタスクごと一括削除
+
+    idsまたはfilters（GET /tasks と同じ条件）で対象を指定する。
+    削除した対象のタスクのIDと件数を返す（配下のサブタスクは件数に含まない）
     """
-    task = await create_task_for_family(db, task_in, current_user.id)
-    return Response(data=task, message="タスクを作成しました")
+    result = await delete_tasks_for_user(db, bulk_in, current_user.id)
+    return Response(data=result, message=f"{result.count}件のタスクを削除しました")
 
 
-@router.get("", response_model=PaginatedResponse[List[TaskResponse]])
+@router.get("", response_model=TaskListResponse)
 async def read_tasks(
     family_id: uuid.UUID,
     current_user: Annotated[User, Depends(get_current_user)],
@@ -50,12 +183,31 @@ async def read_tasks(
     due_before: Optional[date] = None,
     due_after: Optional[date] = None,
     tag_ids: Optional[List[uuid.UUID]] = Query(None),
-    skip: int = 0,
-    limit: int = 100,
+    tag_match: Literal["any", "all"] = "any",
+    sort: Literal["created_at", "updated_at", "due_date", "priority"] = "created_at",
+    order: Literal["asc", "desc"] = "asc",
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[str] = None,
+    response_format: Literal["full", "normalized"] = Query("full", alias="format"),
 ):
     """
     条件に合うタスクの一覧を取得
+
+    cursorを指定するとskipの代わりにキーセット方式で続きのページを取得する。
+    次ページのカーソルはレスポンスのnext_cursorで返される。
+    include_total=falseを指定すると合計件数の計算を省略する（total/pagesはnull）。
+    tag_match=allを指定するとtag_idsのすべてを持つタスクのみに絞り込む。
+    sort/orderで並び順を指定できる（同じ値の場合はIDで順序を確定させる）
+    fields=id,title,statusのようにカンマ区切りで指定すると、その項目のみを返す。
+    format=normalizedを指定すると、担当者・作成者・タグをIDでのみ参照し、
+    実体をusers/tagsにまとめて返す
     """
+    task_fields = parse_task_fields(fields)
+    normalized = response_format == "normalized"
+
     # フィルタ条件を組み立て
     filters = {
         "assignee_id": assignee_id,
@@ -64,24 +216,37 @@ async def read_tasks(
         "due_before": due_before,
         "due_after": due_after,
         "tag_ids": tag_ids,
+        "tag_match": tag_match,
+        "sort": sort,
+        "order": order,
         "skip": skip,
         "limit": limit,
+        "cursor": cursor,
+        "include_total": include_total,
+        "fields": task_fields,
+        "normalized": normalized,
     }
 
     # タスク一覧を取得
-    tasks, total = await get_tasks_for_family(db, current_user.id, family_id, filters)
+    tasks, total, next_cursor = await get_tasks_for_family(
+        db, current_user.id, family_id, filters
+    )
 
-    return PaginatedResponse(
-        data=tasks,
+    return await _build_task_list_response(
+        db,
+        tasks,
         message="タスク一覧を取得しました",
         total=total,
-        page=(skip // limit) + 1 if limit > 0 else 1,
-        size=len(tasks),
-        pages=(total + limit - 1) // limit if limit > 0 else 1,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        next_cursor=next_cursor,
+        task_fields=task_fields,
+        normalized=normalized,
     )
 
 
-@router.get("/roots", response_model=PaginatedResponse[List[TaskResponse]])
+@router.get("/roots", response_model=RootTaskListResponse)
 async def read_root_tasks(
     family_id: uuid.UUID,
     current_user: Annotated[User, Depends(get_current_user)],
@@ -92,12 +257,34 @@ async def read_root_tasks(
     due_before: Optional[date] = None,
     due_after: Optional[date] = None,
     tag_ids: Optional[List[uuid.UUID]] = Query(None),
-    skip: int = 0,
-    limit: int = 100,
+    tag_match: Literal["any", "all"] = "any",
+    sort: Literal["created_at", "updated_at", "due_date", "priority"] = "created_at",
+    order: Literal["asc", "desc"] = "asc",
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[str] = None,
+    response_format: Literal["full", "normalized"] = Query("full", alias="format"),
+    subtasks: Literal["none", "count", "full"] = "full",
 ):
     """
     ルートタスク（親タスクがないタスク）のみを取得し、それらのサブタスクも含める
+
+    subtasks=countを指定するとサブタスクを読み込まずsubtask_count/has_subtasksのみを、
+    subtasks=noneを指定するとサブタスクの情報なしで返す（既定はfull）
+
+    cursorを指定するとskipの代わりにキーセット方式で続きのページを取得する。
+    include_total=falseを指定すると合計件数の計算を省略する（total/pagesはnull）。
+    tag_match=allを指定するとtag_idsのすべてを持つタスクのみに絞り込む。
+    sort/orderで並び順を指定できる（同じ値の場合はIDで順序を確定させる）
+    fields=id,title,statusのようにカンマ区切りで指定すると、その項目のみを返す。
+    format=normalizedを指定すると、担当者・作成者・タグをIDでのみ参照し、
+    実体をusers/tagsにまとめて返す
     """
+    task_fields = parse_task_fields(fields)
+    normalized = response_format == "normalized"
+
     # フィルタ条件を組み立て
     filters = {
         "assignee_id": assignee_id,
@@ -106,20 +293,34 @@ async def read_root_tasks(
         "due_before": due_before,
         "due_after": due_after,
         "tag_ids": tag_ids,
+        "tag_match": tag_match,
+        "sort": sort,
+        "order": order,
         "skip": skip,
         "limit": limit,
+        "cursor": cursor,
+        "include_total": include_total,
+        "fields": task_fields,
+        "normalized": normalized,
+        "subtasks": subtasks,
     }
 
     # ルートタスク一覧を取得（サブタスクも含む）
-    tasks, total = await get_root_tasks_for_family(db, current_user.id, family_id, filters)
+    tasks, total, next_cursor = await get_root_tasks_for_family(
+        db, current_user.id, family_id, filters
+    )
 
-    return PaginatedResponse(
-        data=tasks,
+    return await _build_task_list_response(
+        db,
+        tasks,
         message="ルートタスク一覧を取得しました",
         total=total,
-        page=(skip // limit) + 1 if limit > 0 else 1,
-        size=len(tasks),
-        pages=(total + limit - 1) // limit if limit > 0 else 1,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        next_cursor=next_cursor,
+        task_fields=task_fields,
+        normalized=normalized,
     )
 
 
@@ -136,6 +337,22 @@ async def read_task_with_subtasks(
     return Response(data=task, message="タスクとサブタスクを取得しました")
 
 
+@router.get("/{task_id}/tree", response_model=Response[TaskTreeResponse])
+async def read_task_tree(
+    task_id: uuid.UUID,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    max_depth: Optional[int] = Query(None, ge=0),
+):
+    """
+    配下のすべてのサブタスクを階層構造で含むタスクを取得
+
+    max_depthを指定すると、その深さ（直下のサブタスクが1）までのサブタスクに限定する
+    """
+    task = await get_task_tree_for_user(db, task_id, current_user.id, max_depth)
+    return Response(data=task, message="タスクツリーを取得しました")
+
+
 @router.post(
     "/{task_id}/subtasks", 
     response_model=Response[TaskResponse], 
@@ -145,12 +362,18 @@ async def create_subtask(
     task_id: uuid.UUID,
     subtask_in: SubtaskCreate,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    idempotency: Annotated[IdempotentRequest, Depends(get_idempotent_request)],
 ):
     """
     タスクのサブタスクを作成
+
+    Idempotency-Keyヘッダーを付けた場合、同じキーでの再送には作成済みの結果を返す
     """
-    subtask = await create_subtask_for_user(db, task_id, subtask_in, current_user.id)
+    if idempotency.replay is not None:
+        return idempotency.replay
+    subtask = await create_subtask_for_user(
+        idempotency.db, task_id, subtask_in, current_user.id
+    )
     
     # SQLAlchemyモデルを載せずに明示的にディクショナリに変換
     # サブタスクも載せ
@@ -208,7 +431,10 @@ async def create_subtask(
         for tag in subtask.tags
     ]
     
-    return Response(data=subtask_dict, message="サブタスクを作成しました")
+    return await idempotency.respond(
+        Response[TaskResponse](data=subtask_dict, message="サブタスクを作成しました"),
+        status.HTTP_201_CREATED,
+    )
 
 
 @router.post(
@@ -288,16 +514,22 @@ async def create_bulk_subtasks(
     return Response(data=subtasks_dict, message="複数のサブタスクを作成しました")
 
 
-@router.get("/{task_id}", response_model=Response[TaskResponse])
+@router.get("/{task_id}", response_model=Response[TaskOrFields])
 async def read_task(
     task_id: uuid.UUID,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
+    fields: Optional[str] = None,
 ):
     """
     特定のタスクを取得
+
+    fields=id,title,statusのようにカンマ区切りで指定すると、その項目のみを返す
     """
-    task = await get_task_for_user(db, task_id, current_user.id)
+    task_fields = parse_task_fields(fields)
+    task = await get_task_for_user(db, task_id, current_user.id, task_fields)
+    if task_fields is not None:
+        task = serialize_task_fields(task, task_fields)
     return Response(data=task, message="タスクを取得しました")
 
 
@@ -311,30 +543,33 @@ async def update_task(
     """
     タスクを更新
     """
-    try:
-        # リクエストデータのログ出力
-        print(f"Updating task {task_id}: {task_in.model_dump()}")
-        
-        # due_dateの型チェック
-        due_date = task_in.due_date
-        print(f"due_date value: {due_date}, type: {type(due_date)}")
-        
-        # タスクを更新
-        updated_task = await update_task_for_user(db, task_id, task_in, current_user.id)
-        
-        # レスポンスを返す (モデルを直接使用)
-        # SQLAlchemyモデルをシリアライズ可能な状態にしているので、直接使用
-        return Response(data=updated_task, message="タスクを更新しました")
-    except Exception as e:
-        print(f"Error updating task: {str(e)}")
-        # エラースタックトレースの出力
-        import traceback
-        traceback.print_exc()
-        # エラーを再発生させる
-        raise
-
-
-@router.delete("/{task_id}", response_model=Response[TaskResponse])
+    updated_task = await update_task_for_user(db, task_id, task_in, current_user.id)
+    return Response(data=updated_task, message="タスクを更新しました")
+
+
+@router.patch("/{task_id}", response_model=Response[Dict[str, Any]])
+async def patch_task(
+    task_id: uuid.UUID,
+    task_patch: TaskPatch,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    fields: Optional[str] = None,
+):
+    """
+    タスクの指定した項目のみを更新（例：ステータスの切り替え）
+
+    更新は1回の UPDATE で行い、既定ではタスク自身の項目のみを返す。
+    fields=id,status,tagsのように指定すると、その項目（関連を含む）のみを返す。
+    タグと親タスクの変更は PUT /tasks/{task_id} を使う
+    """
+    task_fields = parse_task_fields(fields)
+    task = await patch_task_for_user(
+        db, task_id, task_patch, current_user.id, task_fields
+    )
+    return Response(data=task, message="タスクを更新しました")
+
+
+@router.delete("/{task_id}", response_model=Response[TaskListItemResponse])
 async def delete_task(
     task_id: uuid.UUID,
     current_user: Annotated[User, Depends(get_current_user)],
@@ -342,6 +577,8 @@ async def delete_task(
 ):
     """
     タスクを削除
+
+    削除したタスク自身を返す（一緒に削除された配下のサブタスクは含まない）
     """
     task = await delete_task_for_user(db, task_id, current_user.id)
     return Response(data=task, message="タスクを削除しました")
@@ -1,13 +1,16 @@
-from typing import Annotated
+from typing import Annotated, List, Literal, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_user, get_db
 from app.crud.user import update_user
 from app.models.user import User
-from app.schemas.common import Response
+from app.schemas.common import PaginatedResponse, Response
+from app.schemas.task import TaskListItemResponse
 from app.schemas.user import UserResponse, UserUpdate
+from app.services.task import get_tasks_for_user
+from app.utils.pagination import count_pages
 
 router = APIRouter()
 
@@ -31,3 +34,38 @@ async def update_user_me(
     """
     updated_user = await update_user(db, current_user, user_in)
     return Response(data=updated_user, message="ユーザー情報を更新しました")
+
+
+@router.get("/me/tasks", response_model=PaginatedResponse[List[TaskListItemResponse]])
+async def read_my_tasks(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    status: Optional[str] = None,
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+):
+    """
+    所属するすべての家族から、自分が担当または作成したタスクを期限日順に取得
+
+    続きのページはレスポンスのnext_cursorをcursorに指定して取得する。
+    include_total=falseを指定すると合計件数の計算を省略する（total/pagesはnull）
+    """
+    filters = {
+        "status": status,
+        "order": order,
+        "limit": limit,
+        "cursor": cursor,
+        "include_total": include_total,
+    }
+    tasks, total, next_cursor = await get_tasks_for_user(db, current_user.id, filters)
+
+    return PaginatedResponse(
+        data=tasks,
+        message="自分のタスク一覧を取得しました",
+        total=total,
+        size=len(tasks),
+        pages=count_pages(total, limit),
+        next_cursor=next_cursor,
+    )
@@ -0,0 +1,23 @@
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+# バッチで実行する1件の操作（既存のタスク・タグのAPIと同じメソッド・パス・ボディ）
+class BatchOperation(BaseModel):
+    method: Literal["POST", "PUT", "PATCH", "DELETE"]
+    path: str
+    body: Optional[Dict[str, Any]] = None
+
+
+# バッチリクエスト（操作は指定した順に1つのトランザクションで実行する）
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=50)
+
+
+# 操作ごとの結果（statusは個別に呼び出した場合のHTTPステータスコード）
+class BatchOperationResult(BaseModel):
+    index: int
+    status: int
+    data: Optional[Any] = None
+    detail: Optional[Any] = None
@@ -25,7 +25,10 @@ class PaginatedResponse(Response[DataT]):
     ページネーション情報を含むAPIレスポンスの共通フォーマット
     """
 
-    total: int = 0
+    # 合計件数を数えなかった場合（include_total=false）はtotal/pagesがNone
+    total: Optional[int] = 0
     page: int = 1
     size: int = 0
-    pages: int = 1
+    pages: Optional[int] = 1
+    # キーセットページネーション用の次ページカーソル（続きがない場合はNone）
+    next_cursor: Optional[str] = None
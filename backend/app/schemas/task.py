@@ -1,9 +1,10 @@
 import uuid
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
+from app.schemas.common import PaginatedResponse
 from app.schemas.user import UserResponse
 
 
@@ -134,6 +135,9 @@ class SubTaskResponse(BaseModel):
     parent_id: Optional[uuid.UUID] = None
     created_at: datetime
     updated_at: datetime
+    # 直下のサブタスクの件数と完了件数
+    subtask_total: int = 0
+    subtask_completed: int = 0
 
     # リレーションシップ
     assignee: Optional[UserResponse] = None
@@ -150,8 +154,37 @@ class SubTaskResponse(BaseModel):
     )
 
 
-# レスポンス時に使用するタスクモデル
-class TaskResponse(BaseModel):
+# 一覧で使用するタスクモデル（サブタスクは含まず、進捗は subtask_total /
+# subtask_completed で返す。GET /tasks・かんばんボード・自分のタスク一覧など）
+class TaskListItemResponse(SubTaskResponse):
+    # ルートタスク一覧で subtasks=count を指定した場合のみ設定される
+    subtask_count: Optional[int] = None
+    has_subtasks: Optional[bool] = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_encoders={
+            datetime: lambda dt: dt.isoformat(),
+            uuid.UUID: lambda u: str(u),
+            date: lambda d: d.isoformat() if d else None,
+        },
+        validate_assignment=True,
+    )
+
+
+# レスポンス時に使用するタスクモデル（直下のサブタスクを含む）
+class TaskResponse(TaskListItemResponse):
+    subtasks: List[SubTaskResponse] = Field(default=[])
+
+
+# 任意の深さのサブタスクを含むタスクツリー
+class TaskTreeResponse(SubTaskResponse):
+    subtasks: List["TaskTreeResponse"] = Field(default=[])
+
+
+# 正規化形式（format=normalized）のサブタスク
+# 担当者・作成者・タグはIDのみを持ち、実体はレスポンスのusers/tagsにまとめて含める
+class NormalizedSubTaskResponse(BaseModel):
     id: uuid.UUID
     title: str
     description: Optional[str] = None
@@ -165,29 +198,173 @@ class TaskResponse(BaseModel):
     parent_id: Optional[uuid.UUID] = None
     created_at: datetime
     updated_at: datetime
+    # 直下のサブタスクの件数と完了件数
+    subtask_total: int = 0
+    subtask_completed: int = 0
+    tag_ids: List[uuid.UUID]
 
-    # リレーションシップ
-    assignee: Optional[UserResponse] = None
-    created_by: UserResponse
-    tags: List[TagResponse] = []
-    # サブタスクは必要な場合にのみロードするように変更
-    subtasks: List[SubTaskResponse] = Field(default=[])
 
-    model_config = ConfigDict(
-        from_attributes=True,
-        json_encoders={
-            datetime: lambda dt: dt.isoformat(),
-            uuid.UUID: lambda u: str(u),
-            date: lambda d: d.isoformat() if d else None,
-        },
-        validate_assignment=True,
-    )
+# 正規化形式（format=normalized）のタスク
+class NormalizedTaskResponse(NormalizedSubTaskResponse):
+    # ルートタスク一覧で subtasks=count を指定した場合のみ設定される
+    subtask_count: Optional[int] = None
+    has_subtasks: Optional[bool] = None
+    # サブタスクを読み込まない一覧（GET /tasks）ではnull
+    subtasks: Optional[List[NormalizedSubTaskResponse]] = None
+
+
+# 正規化形式（format=normalized）のタスク一覧レスポンス
+# タスクから参照されるユーザーとタグをIDをキーにした辞書で1回ずつ返す
+# 通常形式との Union をレスポンスモデルにするため、users/tagsは必須とし、
+# 空のページでも通常形式のレスポンスが正規化形式として検証されないようにする
+class NormalizedTaskListResponse(PaginatedResponse[List[NormalizedTaskResponse]]):
+    users: Dict[uuid.UUID, UserResponse]
+    tags: Dict[uuid.UUID, TagResponse]
+
+
+# 家族のタスク集計（ダッシュボード用）
+class TaskSummaryResponse(BaseModel):
+    total: int = 0
+    by_status: Dict[str, int] = {}
+    by_priority: Dict[str, int] = {}
+    by_assignee: Dict[uuid.UUID, int] = {}
+    unassigned: int = 0
+    # 未完了のタスクのうち、期限切れのものと今日が期限のもの
+    overdue: int = 0
+    due_today: int = 0
+
+
+# カレンダー表示用の1日分のタスク件数
+class TaskCalendarDay(BaseModel):
+    date: date
+    total: int = 0
+    by_status: Dict[str, int] = {}
+
+
+# カレンダー表示用の1か月分のタスク件数（タスクのある日のみ）
+class TaskCalendarResponse(BaseModel):
+    month: str
+    days: List[TaskCalendarDay] = []
+
+
+# かんばんボードの1列分（同じステータスの先頭のタスクと、そのステータスの合計件数）
+class TaskBoardColumn(BaseModel):
+    status: str
+    total: int = 0
+    tasks: List[TaskListItemResponse] = []
+
+
+# かんばんボード（pending / in_progress / completed の順、その他のステータスは後ろ）
+class TaskBoardResponse(BaseModel):
+    columns: List[TaskBoardColumn] = []
 
 
 # サブタスクの一括作成用のモデル
 class BulkSubtaskCreate(BaseModel):
     subtasks: List[SubtaskCreate]
 
+
+# タスクの一括作成用のモデル（他のアプリからの取り込みなど）
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=500)
+
+
+# 一括処理で失敗した項目（indexは入力の位置）
+class TaskBulkError(BaseModel):
+    index: int
+    detail: str
+
+
+# タスクの一括更新・一括削除の対象を絞り込む条件（GET /tasks と同じフィルタ）
+class TaskBulkFilter(BaseModel):
+    assignee_id: Optional[uuid.UUID] = None
+    status: Optional[str] = None
+    is_routine: Optional[bool] = None
+    due_before: Optional[date] = None
+    due_after: Optional[date] = None
+    tag_ids: Optional[List[uuid.UUID]] = None
+    tag_match: Literal["any", "all"] = "any"
+
+    @model_validator(mode="after")
+    def check_conditions(self) -> "TaskBulkFilter":
+        # 条件のないfiltersは家族のすべてのタスクに一致するため受け付けない
+        conditions = self.model_dump(exclude={"tag_match"})
+        if not any(value not in (None, []) for value in conditions.values()):
+            raise ValueError("filtersに絞り込み条件を1つ以上指定してください")
+        return self
+
+
+# 部分更新でnullを指定できない（NOT NULLの列の）項目
+_TASK_NOT_NULL_FIELDS = ("title", "status", "priority", "is_routine")
+
+
+# タスクの一括更新で変更できる項目（指定した項目のみ更新し、nullも指定できる）
+class TaskBulkPatch(BaseModel):
+    status: Optional[str] = None
+    priority: Optional[str] = None
+    assignee_id: Optional[uuid.UUID] = None
+    due_date: Optional[date] = None
+    is_routine: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def check_not_null(self) -> "TaskBulkPatch":
+        nulls = [
+            name
+            for name in _TASK_NOT_NULL_FIELDS
+            if name in self.model_fields_set and getattr(self, name) is None
+        ]
+        if nulls:
+            raise ValueError(f"nullを指定できない項目です: {', '.join(nulls)}")
+        return self
+
+
+# タスクの部分更新（PATCH /tasks/{id}）で変更できる項目
+# タグと親タスクは関連テーブルの更新が必要なため PUT で変更する
+class TaskPatch(TaskBulkPatch):
+    title: Optional[str] = None
+    description: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_fields(self) -> "TaskPatch":
+        if not self.model_fields_set:
+            raise ValueError("更新する項目を指定してください")
+        return self
+
+
+# タスクの一括更新・一括削除の対象（idsまたはfiltersのどちらか一方で指定する）
+class TaskBulkTarget(BaseModel):
+    family_id: uuid.UUID
+    ids: Optional[List[uuid.UUID]] = Field(None, min_length=1, max_length=1000)
+    filters: Optional[TaskBulkFilter] = None
+
+    @model_validator(mode="after")
+    def check_target(self) -> "TaskBulkTarget":
+        if (self.ids is None) == (self.filters is None):
+            raise ValueError("idsまたはfiltersのどちらか一方を指定してください")
+        return self
+
+
+# タスクの一括削除
+class TaskBulkDelete(TaskBulkTarget):
+    pass
+
+
+# タスクの一括更新
+class TaskBulkUpdate(TaskBulkTarget):
+    patch: TaskBulkPatch
+
+    @model_validator(mode="after")
+    def check_patch(self) -> "TaskBulkUpdate":
+        if not self.patch.model_fields_set:
+            raise ValueError("patchに更新する項目を指定してください")
+        return self
+
+
+# 一括更新・一括削除の結果（対象となったタスクのIDと件数）
+class TaskBulkResult(BaseModel):
+    ids: List[uuid.UUID] = []
+    count: int = 0
+
 # タスク一覧レスポンスモデル
 class TaskListResponse(BaseModel):
     tasks: List[TaskResponse]
@@ -0,0 +1,242 @@
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.routing import compile_path
+
+from app.core.config import settings
+from app.db.session import create_savepoint_session
+from app.schemas.batch import BatchOperation, BatchOperationResult
+from app.schemas.task import (
+    SubtaskCreate,
+    TagCreate,
+    TagResponse,
+    TagUpdate,
+    TaskBulkUpdate,
+    TaskCreate,
+    TaskListItemResponse,
+    TaskPatch,
+    TaskResponse,
+    TaskUpdate,
+)
+from app.services.task import (
+    create_subtask_for_user,
+    create_tag_for_family,
+    create_task_for_family,
+    delete_tag_for_user,
+    delete_task_for_user,
+    patch_task_for_user,
+    update_tag_for_user,
+    update_task_for_user,
+    update_tasks_for_user,
+)
+
+# 操作を実行し、(HTTPステータスコード, レスポンスのdata) を返す関数
+BatchHandler = Callable[
+    [AsyncSession, uuid.UUID, Dict[str, Any], Dict[str, Any]],
+    Awaitable[Tuple[int, Any]],
+]
+
+
+async def _create_task(
+    db: AsyncSession, user_id: uuid.UUID, params: Dict[str, Any], body: Dict[str, Any]
+) -> Tuple[int, Any]:
+    """
+    POST /tasks
+    """
+    task = await create_task_for_family(db, TaskCreate.model_validate(body), user_id)
+    return status.HTTP_201_CREATED, TaskResponse.model_validate(task)
+
+
+async def _update_tasks(
+    db: AsyncSession, user_id: uuid.UUID, params: Dict[str, Any], body: Dict[str, Any]
+) -> Tuple[int, Any]:
+    """
+    PATCH /tasks/bulk
+    """
+    bulk_in = TaskBulkUpdate.model_validate(body)
+    return status.HTTP_200_OK, await update_tasks_for_user(db, bulk_in, user_id)
+
+
+async def _update_task(
+    db: AsyncSession, user_id: uuid.UUID, params: Dict[str, Any], body: Dict[str, Any]
+) -> Tuple[int, Any]:
+    """
+    PUT /tasks/{task_id}
+    """
+    task_in = TaskUpdate.model_validate(body)
+    task = await update_task_for_user(db, params["task_id"], task_in, user_id)
+    return status.HTTP_200_OK, TaskResponse.model_validate(task)
+
+
+async def _patch_task(
+    db: AsyncSession, user_id: uuid.UUID, params: Dict[str, Any], body: Dict[str, Any]
+) -> Tuple[int, Any]:
+    """
+    PATCH /tasks/{task_id}
+    """
+    task_patch = TaskPatch.model_validate(body)
+    data = await patch_task_for_user(db, params["task_id"], task_patch, user_id)
+    return status.HTTP_200_OK, data
+
+
+async def _delete_task(
+    db: AsyncSession, user_id: uuid.UUID, params: Dict[str, Any], body: Dict[str, Any]
+) -> Tuple[int, Any]:
+    """
+    DELETE /tasks/{task_id}
+    """
+    task = await delete_task_for_user(db, params["task_id"], user_id)
+    return status.HTTP_200_OK, TaskListItemResponse.model_validate(task)
+
+
+async def _create_subtask(
+    db: AsyncSession, user_id: uuid.UUID, params: Dict[str, Any], body: Dict[str, Any]
+) -> Tuple[int, Any]:
+    """
+    POST /tasks/{task_id}/subtasks
+    """
+    subtask_in = SubtaskCreate.model_validate(body)
+    task = await create_subtask_for_user(db, params["task_id"], subtask_in, user_id)
+    return status.HTTP_201_CREATED, TaskResponse.model_validate(task)
+
+
+async def _create_tag(
+    db: AsyncSession, user_id: uuid.UUID, params: Dict[str, Any], body: Dict[str, Any]
+) -> Tuple[int, Any]:
+    """
+    POST /tags
+    """
+    tag = await create_tag_for_family(db, TagCreate.model_validate(body), user_id)
+    return status.HTTP_201_CREATED, TagResponse.model_validate(tag)
+
+
+async def _update_tag(
+    db: AsyncSession, user_id: uuid.UUID, params: Dict[str, Any], body: Dict[str, Any]
+) -> Tuple[int, Any]:
+    """
+    PUT /tags/{tag_id}
+    """
+    tag_in = TagUpdate.model_validate(body)
+    tag = await update_tag_for_user(db, params["tag_id"], tag_in, user_id)
+    return status.HTTP_200_OK, TagResponse.model_validate(tag)
+
+
+async def _delete_tag(
+    db: AsyncSession, user_id: uuid.UUID, params: Dict[str, Any], body: Dict[str, Any]
+) -> Tuple[int, Any]:
+    """
+    DELETE /tags/{tag_id}
+    """
+    tag = await delete_tag_for_user(db, params["tag_id"], user_id)
+    return status.HTTP_200_OK, TagResponse.model_validate(tag)
+
+
+# バッチで実行できる操作（API_V1_STRを除いたパス）
+# パスの書式はルーターと同じで、パスパラメータは型を変換して渡す
+BATCH_OPERATIONS: List[Tuple[str, str, BatchHandler]] = [
+    ("POST", "/tasks", _create_task),
+    ("PATCH", "/tasks/bulk", _update_tasks),
+    ("PUT", "/tasks/{task_id:uuid}", _update_task),
+    ("PATCH", "/tasks/{task_id:uuid}", _patch_task),
+    ("DELETE", "/tasks/{task_id:uuid}", _delete_task),
+    ("POST", "/tasks/{task_id:uuid}/subtasks", _create_subtask),
+    ("POST", "/tags", _create_tag),
+    ("PUT", "/tags/{tag_id:uuid}", _update_tag),
+    ("DELETE", "/tags/{tag_id:uuid}", _delete_tag),
+]
+_COMPILED_OPERATIONS = []
+for _method, _path, _handler in BATCH_OPERATIONS:
+    _path_regex, _, _convertors = compile_path(_path)
+    _COMPILED_OPERATIONS.append((_method, _path_regex, _convertors, _handler))
+
+
+def _resolve_operation(
+    operation: BatchOperation,
+) -> Optional[Tuple[BatchHandler, Dict[str, Any]]]:
+    """
+    操作のメソッドとパスから実行する関数とパスパラメータを求める（未対応の場合はNone）
+    """
+    path = operation.path.split("?", 1)[0]
+    if path.startswith(settings.API_V1_STR + "/"):
+        path = path[len(settings.API_V1_STR) :]
+
+    for method, path_regex, convertors, handler in _COMPILED_OPERATIONS:
+        if method != operation.method:
+            continue
+        match = path_regex.match(path)
+        if match:
+            params = {
+                name: convertors[name].convert(value)
+                for name, value in match.groupdict().items()
+            }
+            return handler, params
+    return None
+
+
+async def run_batch_for_user(
+    db: AsyncSession, operations: List[BatchOperation], user_id: uuid.UUID
+) -> List[BatchOperationResult]:
+    """
+    複数の操作を指定された順に1つのトランザクションで実行し、操作ごとの結果を返す
+
+    すべての操作が成功した場合のみコミットする。失敗した操作があればそこで中断して
+    すべてを取り消し、それまでの操作と失敗した操作の結果を返す。
+    各操作の処理（CRUD）は途中でコミットするため、同じ接続上の別のセッションを
+    セーブポイントで参加させ、そのコミットをセーブポイントの解放に置き換える
+    """
+    # 未対応の操作が含まれる場合は何も実行しない
+    resolved = []
+    for index, operation in enumerate(operations):
+        target = _resolve_operation(operation)
+        if target is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"operations[{index}]: 未対応の操作です"
+                    f"（{operation.method} {operation.path}）"
+                ),
+            )
+        resolved.append(target)
+
+    results: List[BatchOperationResult] = []
+    failed = False
+    batch_db = await create_savepoint_session(db)
+    try:
+        for index, (operation, (handler, params)) in enumerate(
+            zip(operations, resolved, strict=True)
+        ):
+            try:
+                status_code, data = await handler(
+                    batch_db, user_id, params, operation.body or {}
+                )
+            except HTTPException as e:
+                result = BatchOperationResult(
+                    index=index, status=e.status_code, detail=e.detail
+                )
+            except ValidationError as e:
+                result = BatchOperationResult(
+                    index=index,
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=jsonable_encoder(e.errors(include_url=False)),
+                )
+            else:
+                result = BatchOperationResult(
+                    index=index, status=status_code, data=data
+                )
+            results.append(result)
+            if result.detail is not None:
+                failed = True
+                break
+    finally:
+        await batch_db.close()
+
+    # 想定外の例外の場合は、リクエストのセッションを閉じる際にすべて取り消される
+    if failed:
+        await db.rollback()
+    else:
+        await db.commit()
+    return results
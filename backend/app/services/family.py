@@ -8,13 +8,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.crud.family import (
     create_family,
-    get_family_by_id,
+    get_family_access,
     is_user_family_admin,
-    is_user_family_member,
+    user_is_member,
 )
 from app.crud.task import tag as tag_crud  # TagのCRUD
-from app.crud.user import get_user_by_email
 from app.models.family import Family, FamilyMember
+from app.models.user import User
 from app.schemas.family import FamilyCreate, FamilyMemberCreate
 from app.schemas.task import TagCreate  # TagCreateスキーマを追加
 
@@ -73,8 +73,8 @@ async def check_family_access(
     """
     家族へのアクセス権を確認し、家族オブジェクトを返す
     """
-    # 家族を取得
-    family = await get_family_by_id(db, family_id)
+    # 家族とユーザーのメンバー情報を1回のクエリで取得
+    family, member = await get_family_access(db, user_id, family_id)
     if not family:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -82,7 +82,7 @@ async def check_family_access(
         )
 
     # ユーザーが家族のメンバーかどうかを確認
-    is_member = await is_user_family_member(db, user_id, family_id)
+    is_member = member is not None
     if not is_member:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -90,13 +90,11 @@ async def check_family_access(
         )
 
     # 管理者権限が必要な場合はそれも確認
-    if require_admin:
-        is_admin = await is_user_family_admin(db, user_id, family_id)
-        if not is_admin:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="この操作には管理者権限が必要です",
-            )
+    if require_admin and not member.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="この操作には管理者権限が必要です",
+        )
 
     return family, is_member
 
@@ -125,17 +123,20 @@ async def add_family_member_by_email(
                 detail="\u3053の操作には管理者権限が必要です",
             )
             
-        # 追加するユーザーを検索
-        target_user = await get_user_by_email(db, email=member_data.user_email)
-        if not target_user:
+        # 追加するユーザーと、既に家族のメンバーかどうかを1回のクエリで取得
+        stmt = select(
+            User, user_is_member(User.id, family_id).label("is_member")
+        ).where(User.email == member_data.user_email)
+        row = (await db.execute(stmt)).first()
+        if row is None:
             print(f"\u30e6ーザーが見つかりません: {member_data.user_email}")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="\u6307定されたメールアドレスのユーザーが見つかりません",
             )
+        target_user, is_already_member = row
 
         # 既に家族のメンバーでないか確認
-        is_already_member = await is_user_family_member(db, target_user.id, family_id)
         if is_already_member:
             print(f"\u65e2にメンバーです: user_id={target_user.id}, family_id={family_id}")
             raise HTTPException(
@@ -159,9 +160,6 @@ async def add_family_member_by_email(
         # SQLAlchemy 2.0 では非同期アトリビュートアクセスに関する制限が厳しくなっている
         
         # ユーザー情報を取得して明示的に追加
-        from sqlalchemy import select
-        from app.models.user import User
-        
         stmt = select(User).where(User.id == target_user.id)
         result = await db.execute(stmt)
         user_obj = result.scalars().first()
@@ -0,0 +1,204 @@
+import asyncio
+import hashlib
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.idempotency import (
+    claim_idempotency_key,
+    complete_idempotency_key,
+    delete_expired_idempotency_keys,
+    delete_idempotency_key,
+    get_idempotency_key,
+    reclaim_idempotency_key,
+)
+from app.db.session import SessionLocal, create_savepoint_session
+
+logger = logging.getLogger(__name__)
+
+# 保存したレスポンスを返したことを示すレスポンスヘッダー
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def hash_request(method: str, path: str, body: bytes) -> str:
+    """
+    同じキーで別のリクエストが送られたことを検出するためのハッシュを求める
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{method} {path}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def _expires_before() -> datetime:
+    """
+    これより前に登録されたキーは期限切れとみなす
+    """
+    return datetime.utcnow() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+
+class IdempotentRequest:
+    """
+    Idempotency-Keyヘッダー付きリクエストの状態
+
+    ルーターは replay があればそれを返し、なければ db のセッションで処理を実行して
+    respond() の戻り値を返す。キーがない場合、db はリクエストのセッションそのもので、
+    respond() は何もしない。
+    キーがある場合、db はリクエストのセッションと同じ接続にセーブポイントで参加する
+    セッションで、処理中のコミットはセーブポイントの解放になる。処理の結果は
+    respond() でレスポンスを保存するときに同じトランザクションで確定する
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        key: Optional[str] = None,
+        *,
+        session: Optional[AsyncSession] = None,
+        claimed_at: Optional[datetime] = None,
+        replay: Optional[JSONResponse] = None,
+    ):
+        # 処理に使うセッション
+        self.db = db
+        self.user_id = user_id
+        self.key = key
+        # リクエストのセッション（キーの登録とレスポンスの保存に使う）
+        self.session = session or db
+        self.claimed_at = claimed_at
+        # 同じキーで完了済みの場合に返す、保存済みのレスポンス
+        self.replay = replay
+        self.completed = replay is not None
+
+    async def respond(self, content: Any, status_code: int) -> Any:
+        """
+        レスポンスを保存し、処理の結果と同時にコミットして返す（キーがない場合はそのまま返す）
+
+        contentはレスポンスモデルの形にしたもの（再送時はこれをそのまま返す）
+        """
+        if self.key is None:
+            return content
+        body = jsonable_encoder(content)
+        # 処理用のセッションに残ったセーブポイントを閉じてから確定する
+        await self.db.close()
+        stored = await complete_idempotency_key(
+            self.session,
+            user_id=self.user_id,
+            key=self.key,
+            claimed_at=self.claimed_at,
+            status_code=status_code,
+            response_body=body,
+        )
+        if not stored:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="同じIdempotency-Keyのリクエストが別に処理されました",
+            )
+        self.completed = True
+        return JSONResponse(body, status_code=status_code)
+
+    async def finish(self) -> None:
+        """
+        リクエストの終了時の処理
+
+        レスポンスを保存せずに終わった場合は、処理の結果を取り消してキーを解放し、
+        再送時に処理をやり直せるようにする
+        """
+        if self.key is None or self.replay is not None:
+            return
+        await self.db.close()
+        if self.completed:
+            return
+        await self.session.rollback()
+        await delete_idempotency_key(
+            self.session, user_id=self.user_id, key=self.key, claimed_at=self.claimed_at
+        )
+
+
+async def begin_idempotent_request(
+    db: AsyncSession, user_id: uuid.UUID, key: str, request_hash: str
+) -> IdempotentRequest:
+    """
+    キーを処理中として登録する。登録済みのキーの場合は保存済みのレスポンスを返す
+
+    期限切れのキーと、リースが切れた処理中のキー（処理が中断されて結果が
+    確定していないもの）は取り直す。
+    処理中のキーには409、別のリクエストに使われたキーには422を返す
+    """
+    claimed_at = datetime.utcnow()
+    claimed = await claim_idempotency_key(
+        db, user_id=user_id, key=key, request_hash=request_hash, claimed_at=claimed_at
+    ) or await reclaim_idempotency_key(
+        db,
+        user_id=user_id,
+        key=key,
+        request_hash=request_hash,
+        claimed_at=claimed_at,
+        expired_before=_expires_before(),
+        lease_expired_before=claimed_at
+        - timedelta(seconds=settings.IDEMPOTENCY_KEY_LEASE_SECONDS),
+    )
+    if claimed:
+        handler_db = await create_savepoint_session(db)
+        return IdempotentRequest(
+            handler_db, user_id, key, session=db, claimed_at=claimed_at
+        )
+
+    stored = await get_idempotency_key(db, user_id=user_id, key=key)
+    if stored is not None and stored.request_hash != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Keyが別のリクエストに使用されています",
+        )
+    if stored is None or stored.status_code is None:
+        # 処理中（登録に失敗した直後に解放された場合を含む）
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="同じIdempotency-Keyのリクエストを処理中です",
+        )
+    replay = JSONResponse(
+        stored.response_body,
+        status_code=stored.status_code,
+        headers={IDEMPOTENT_REPLAYED_HEADER: "true"},
+    )
+    return IdempotentRequest(db, user_id, key, replay=replay)
+
+
+async def purge_expired_idempotency_keys(db: AsyncSession) -> int:
+    """
+    期限切れのキーを一定件数ずつ削除する
+
+    戻り値: 削除したキーの数
+    """
+    created_before = _expires_before()
+    batch_size = settings.IDEMPOTENCY_KEY_CLEANUP_BATCH_SIZE
+    purged = 0
+    while True:
+        deleted = await delete_expired_idempotency_keys(
+            db, created_before=created_before, limit=batch_size
+        )
+        purged += deleted
+        if deleted < batch_size:
+            return purged
+
+
+async def run_idempotency_key_cleanup() -> None:
+    """
+    期限切れのキーを定期的に削除し続ける（アプリケーション起動時にバックグラウンドで開始）
+    """
+    while True:
+        await asyncio.sleep(settings.IDEMPOTENCY_KEY_CLEANUP_INTERVAL_SECONDS)
+        try:
+            async with SessionLocal() as db:
+                purged = await purge_expired_idempotency_keys(db)
+            if purged:
+                logger.info(f"期限切れのIdempotency-Keyを {purged} 件削除しました")
+        except Exception as e:
+            logger.error(f"Idempotency-Keyの削除中にエラーが発生しました: {e}")
@@ -1,37 +1,182 @@
 import uuid
-from typing import Any, Dict, List, Tuple
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.crud.family import is_user_family_member
+from app.core.cache import task_summary_cache
+from app.crud.family import get_family_access, get_family_memberships
+from app.crud.user import get_users_by_ids
 from app.crud.task import (
     check_user_task_access,
     create_tag,
+    create_subtasks,
     create_task,
+    create_tasks,
     delete_task,
+    delete_tasks,
     get_family_tags,
     get_family_tasks,
     get_task_with_relations,
-    get_task_with_subtasks,
+    get_task_board_rows,
+    get_task_calendar_rows,
+    get_task_subtree,
+    get_task_summary_rows,
     get_root_tasks_by_family,
-    count_root_tasks_by_family,
+    get_tag_family_ids,
+    get_task_access,
+    get_task_family_ids,
+    get_user_tasks,
+    patch_task,
+    update_tasks,
+    tag as tag_crud,
     update_task,
 )
 from app.models.task import Tag, Task
-from app.schemas.task import TagCreate, TaskCreate, TaskUpdate, SubtaskCreate
+from app.schemas.task import (
+    NormalizedSubTaskResponse,
+    SubtaskCreate,
+    TagCreate,
+    TagResponse,
+    TagUpdate,
+    TaskBoardColumn,
+    TaskBoardResponse,
+    TaskCalendarDay,
+    TaskCalendarResponse,
+    TaskBulkDelete,
+    TaskBulkError,
+    TaskBulkResult,
+    TaskBulkUpdate,
+    TaskCreate,
+    TaskListItemResponse,
+    TaskPatch,
+    TaskResponse,
+    TaskSummaryResponse,
+    TaskUpdate,
+)
+from app.schemas.user import UserResponse
+
+# fields= で選択できる項目と、その値をレスポンス用に変換するアダプター
+_TASK_FIELD_ADAPTERS = {
+    name: TypeAdapter(field.annotation)
+    for name, field in TaskResponse.model_fields.items()
+}
+# タスク自身の列の項目（関連を読み込まずに返せる項目）
+_TASK_COLUMN_FIELDS = [
+    name for name in TaskResponse.model_fields if name in Task.__table__.c
+]
+
+# かんばんボードに常に表示する列（タスクがなくても空の列を返す）
+TASK_BOARD_STATUSES = ("pending", "in_progress", "completed")
+
+
+def parse_task_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    カンマ区切りのfields=パラメータを検証し、項目名のリストに変換する
+
+    idは常に含める。指定がない場合はNone（すべての項目）を返す
+    """
+    if fields is None:
+        return None
+
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in _TASK_FIELD_ADAPTERS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"指定できない項目です: {', '.join(unknown)}",
+        )
+    return list(dict.fromkeys(["id", *names]))
+
+
+# 正規化形式でタスクから直接取り出す列（tag_ids以外）
+_NORMALIZED_TASK_COLUMNS = tuple(
+    name for name in NormalizedSubTaskResponse.model_fields if name != "tag_ids"
+)
+
+
+async def normalize_task_list(
+    db: AsyncSession, tasks: List[Task]
+) -> Tuple[
+    List[Dict[str, Any]], Dict[uuid.UUID, UserResponse], Dict[uuid.UUID, TagResponse]
+]:
+    """
+    タスク一覧を正規化形式に変換する
+
+    各タスク（とサブタスク）は担当者・作成者・タグをIDでのみ参照し、
+    参照されるユーザーは1回のクエリでまとめて取得して辞書で返す
+    """
+    user_ids = set()
+    tags: Dict[uuid.UUID, TagResponse] = {}
+
+    def to_item(task: Task) -> Dict[str, Any]:
+        user_ids.add(task.created_by_id)
+        if task.assignee_id:
+            user_ids.add(task.assignee_id)
+        for tag in task.tags:
+            if tag.id not in tags:
+                tags[tag.id] = TagResponse.model_validate(tag)
+
+        item = {name: getattr(task, name) for name in _NORMALIZED_TASK_COLUMNS}
+        item["tag_ids"] = [tag.id for tag in task.tags]
+        return item
+
+    data = []
+    for task in tasks:
+        item = to_item(task)
+        item["subtask_count"] = task.subtask_count
+        item["has_subtasks"] = task.has_subtasks
+        # サブタスクを読み込まない一覧（GET /tasks など）ではnullのまま返す
+        if "subtasks" not in inspect(task).unloaded:
+            item["subtasks"] = [to_item(subtask) for subtask in task.subtasks]
+        data.append(item)
+
+    users = {
+        user.id: UserResponse.model_validate(user)
+        for user in await get_users_by_ids(db, user_ids)
+    }
+    return data, users, tags
+
+
+def _check_list_format(filters: Dict[str, Any]) -> None:
+    """
+    一覧取得でfieldsとformat=normalizedが同時に指定されていないか確認
+    """
+    if filters.get("normalized") and filters.get("fields") is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="fieldsとformat=normalizedは同時に指定できません",
+        )
+
+
+def serialize_task_fields(task: Task, fields: List[str]) -> Dict[str, Any]:
+    """
+    タスクから指定された項目のみを取り出したレスポンス用の辞書を作成
+    """
+    return {
+        name: _TASK_FIELD_ADAPTERS[name].validate_python(
+            getattr(task, name), from_attributes=True
+        )
+        for name in fields
+    }
 
 
 async def check_family_membership(
     db: AsyncSession, user_id: uuid.UUID, family_id: uuid.UUID
 ) -> bool:
     """
-    ユーザーが家族のメンバーかどうかを確認
+    ユーザーが家族のメンバーかどうかを確認（家族が存在しない場合は404）
     """
-    is_member = await is_user_family_member(db, user_id, family_id)
-    if not is_member:
+    family, member = await get_family_access(db, user_id, family_id)
+    if family is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="指定された家族が見つかりません",
+        )
+    if member is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="この家族のタスクにアクセスする権限がありません",
@@ -48,17 +193,79 @@ async def create_task_for_family(
     # ユーザーが家族のメンバーであることを確認
     await check_family_membership(db, user_id, task_in.family_id)
 
-    # タスクを作成
-    return await create_task(db, task_in, user_id)
+    # タスクを作成し、レスポンスに必要な関連情報を含めて取得する
+    created_task = await create_task(db, task_in, user_id)
+    return await get_task_with_relations(db, task_id=created_task.id)
+
+
+async def create_tasks_for_user(
+    db: AsyncSession, tasks_in: List[TaskCreate], user_id: uuid.UUID
+) -> Tuple[List[Task], List[TaskBulkError]]:
+    """
+    複数のタスクを一括作成し、作成したタスクと作成できなかった項目のエラーを返す
+
+    家族の権限・担当者・タグ・親タスクはすべての項目分をまとめて確認し、
+    問題のない項目のみを1つのトランザクションで作成する
+    """
+    family_ids = {task_in.family_id for task_in in tasks_in}
+    assignee_ids = {t.assignee_id for t in tasks_in if t.assignee_id is not None}
+    memberships = await get_family_memberships(
+        db, family_ids, assignee_ids | {user_id}
+    )
+    tag_families = await get_tag_family_ids(
+        db, {tag_id for t in tasks_in for tag_id in t.tag_ids or ()}
+    )
+    parent_families = await get_task_family_ids(
+        db, {t.parent_id for t in tasks_in if t.parent_id is not None}
+    )
+
+    valid: List[TaskCreate] = []
+    errors: List[TaskBulkError] = []
+    for index, task_in in enumerate(tasks_in):
+        family_id = task_in.family_id
+        missing_tags = [
+            str(tag_id)
+            for tag_id in task_in.tag_ids or ()
+            if tag_families.get(tag_id) != family_id
+        ]
+        if (family_id, user_id) not in memberships:
+            detail = "この家族のタスクにアクセスする権限がありません"
+        elif (
+            task_in.assignee_id is not None
+            and (family_id, task_in.assignee_id) not in memberships
+        ):
+            detail = "担当者が家族のメンバーではありません"
+        elif missing_tags:
+            detail = f"タグが見つかりません: {', '.join(missing_tags)}"
+        elif (
+            task_in.parent_id is not None
+            and parent_families.get(task_in.parent_id) != family_id
+        ):
+            detail = "親タスクが見つかりません"
+        else:
+            valid.append(task_in)
+            continue
+        errors.append(TaskBulkError(index=index, detail=detail))
+
+    created = await create_tasks(db, tasks_in=valid, created_by_id=user_id)
+    return created, errors
 
 
 async def get_task_for_user(
-    db: AsyncSession, task_id: uuid.UUID, user_id: uuid.UUID
+    db: AsyncSession,
+    task_id: uuid.UUID,
+    user_id: uuid.UUID,
+    fields: Optional[List[str]] = None,
+    profile: str = "detail",
 ) -> Task:
     """
-    ユーザーがアクセス可能なタスクを取得
+    ユーザーがアクセス可能なタスクを取得（fieldsを指定すると指定項目のみ読み込む）
+
+    タスクの取得と権限の確認は1回のクエリで行い、その結果から404と403を区別する
     """
-    task, has_access = await check_user_task_access(db, user_id, task_id)
+    task, has_access = await check_user_task_access(
+        db, user_id, task_id, fields, profile
+    )
 
     if not task:
         raise HTTPException(
@@ -80,17 +287,35 @@ async def get_task_with_subtasks_for_user(
     """
     サブタスクを含むタスクをユーザーが取得
     """
-    # タスクへのアクセス権を確認
-    task = await get_task_for_user(db, task_id, user_id)
-    
-    # サブタスクを含めて取得
-    task_with_subtasks = await get_task_with_subtasks(db, task_id=task_id)
-    if not task_with_subtasks:
+    # サブタスクを含めた取得とアクセス権の確認を1回のクエリで行う
+    return await get_task_for_user(db, task_id, user_id, profile="subtree")
+
+
+async def get_task_tree_for_user(
+    db: AsyncSession,
+    task_id: uuid.UUID,
+    user_id: uuid.UUID,
+    max_depth: Optional[int] = None,
+) -> Task:
+    """
+    配下のすべてのサブタスクを含むタスクツリーをユーザーが取得
+    """
+    # アクセスできるタスクのみを対象にツリーを取得する
+    task = await get_task_subtree(
+        db, task_id=task_id, max_depth=max_depth, member_user_id=user_id
+    )
+    if task:
+        return task
+
+    # 何も返らなかった場合のみ、タスクが存在しないのか権限がないのかを確認する
+    if await get_task_access(db, user_id, task_id) is False:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="タスクが見つかりません"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="このタスクにアクセスする権限がありません",
         )
-    
-    return task_with_subtasks
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND, detail="タスクが見つかりません"
+    )
 
 
 async def create_subtask_for_user(
@@ -100,7 +325,7 @@ async def create_subtask_for_user(
     ユーザーがサブタスクを作成
     """
     # 親タスクへのアクセス権を確認
-    parent_task = await get_task_for_user(db, parent_id, user_id)
+    parent_task = await get_task_for_user(db, parent_id, user_id, profile="row")
     
     # サブタスク用に親タスクの家族IDを設定してTaskCreateを作成
     task_in_data = task_in.model_dump()
@@ -123,31 +348,18 @@ async def create_bulk_subtasks_for_user(
     db: AsyncSession, parent_id: uuid.UUID, subtasks_in: List[SubtaskCreate], user_id: uuid.UUID
 ) -> List[Task]:
     """
-    ユーザーが複数のサブタスクを一括作成
+    ユーザーが複数のサブタスクを一括作成（すべて作成するか、何も作成しない）
     """
-    # 親タスクへのアクセス権を確認
-    parent_task = await get_task_for_user(db, parent_id, user_id)
-    
-    created_subtasks = []
-    # 各サブタスクを作成
-    for task_in in subtasks_in:
-        # 親タスクの家族IDをサブタスクにも設定
-        task_in_data = task_in.model_dump()
-        task_data = TaskCreate(
-            **task_in_data,
-            parent_id=parent_id,
-            family_id=parent_task.family_id
-        )
-        
-        # サブタスクを作成
-        created_task = await create_task(db, task_data, user_id)
-        
-        # 作成したタスクの関連情報を取得する
-        # サブタスクは必要ない
-        complete_task = await get_task_with_relations(db, task_id=created_task.id)
-        created_subtasks.append(complete_task)
-    
-    return created_subtasks
+    # 親タスクへのアクセス権を確認（家族IDのみ必要なため関連は読み込まない）
+    parent_task = await get_task_for_user(db, parent_id, user_id, profile="row")
+
+    return await create_subtasks(
+        db,
+        parent_id=parent_id,
+        family_id=parent_task.family_id,
+        subtasks_in=subtasks_in,
+        created_by_id=user_id,
+    )
 
 
 async def update_task_for_user(
@@ -155,66 +367,131 @@ async def update_task_for_user(
 ) -> Task:
     """
     ユーザーがアクセス可能なタスクを更新
+
+    アクセス権の確認ではタスク自身の列のみを読み込み、
+    関連データは更新後に1回だけ読み込む
     """
+    task = await get_task_for_user(db, task_id, user_id, profile="row")
     try:
-        # タスクへのアクセス権を確認
-        task = await get_task_for_user(db, task_id, user_id)
-        
-        # due_dateの処理
-        # タスク更新スキーマ自身でも日付のバリデーションと変換が行われるが
-        # ログ出力のためここでも実行
-        try:
-            data = task_update.model_dump(exclude_unset=True)
-            if "due_date" in data and data["due_date"] is not None:
-                print(f"Service layer due_date: {data['due_date']}, type: {type(data['due_date'])}")
-        except Exception as e:
-            print(f"Error processing due_date: {str(e)}")
-
-        # タスクを更新
-        updated_task = await update_task(db, task, task_update)
-        print(f"Updated task: {updated_task.id}, has subtasks: {hasattr(updated_task, 'subtasks')}")
-        
-        # タスクの関連情報を明示的に選択的に読み込む
-        # これにより、非同期コンテキスト外でのアクセスを防止
-        # リレーションも含めて再取得
-        stmt = (
-            select(Task)
-            .options(
-                selectinload(Task.created_by),
-                selectinload(Task.assignee),
-                selectinload(Task.tags),
-                selectinload(Task.subtasks).selectinload(Task.tags),
-                selectinload(Task.subtasks).selectinload(Task.assignee),
-                selectinload(Task.subtasks).selectinload(Task.created_by),
-            )
-            .where(Task.id == updated_task.id)
+        return await update_task(db, task, task_update)
+    except ValueError as e:
+        # 親タスクの付け替え先が不正な場合など
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+
+
+async def patch_task_for_user(
+    db: AsyncSession,
+    task_id: uuid.UUID,
+    task_patch: TaskPatch,
+    user_id: uuid.UUID,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    ユーザーがアクセス可能なタスクの指定された項目のみを更新し、更新後の項目を返す
+
+    更新と権限の確認は1回の UPDATE … RETURNING で行う。fieldsを指定しない場合は
+    タスク自身の列のみを返し、関連（タグ・担当者など）はfieldsで指定された場合のみ読み込む
+    """
+    if fields is None:
+        fields = _TASK_COLUMN_FIELDS
+    task = await patch_task(
+        db,
+        task_id=task_id,
+        member_user_id=user_id,
+        values=task_patch.model_dump(exclude_unset=True),
+        fields=fields,
+    )
+    if task:
+        return serialize_task_fields(task, fields)
+
+    # 何も更新されなかった場合のみ、その理由（存在しない・権限がない・担当者が不正）を確認する
+    access = await get_task_access(db, user_id, task_id)
+    if access is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="タスクが見つかりません"
+        )
+    if access is False:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="このタスクにアクセスする権限がありません",
         )
-        result = await db.execute(stmt)
-        task_with_relations = result.unique().scalar_one_or_none()
-        
-        if task_with_relations is None:
-            print(f"Warning: Could not reload task with ID {updated_task.id}")
-            return updated_task
-            
-        return task_with_relations
-    except Exception as e:
-        print(f"Error in update_task_for_user: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        raise
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="担当者が家族のメンバーではありません",
+    )
+
+
+async def update_tasks_for_user(
+    db: AsyncSession, bulk_in: TaskBulkUpdate, user_id: uuid.UUID
+) -> TaskBulkResult:
+    """
+    ユーザーがアクセス可能な家族のタスクを、IDまたはフィルタ条件で一括更新
+    """
+    family_id = bulk_in.family_id
+    values = bulk_in.patch.model_dump(exclude_unset=True)
+
+    # 担当者を変更する場合は、家族のメンバーであることを確認する
+    assignee_id = values.get("assignee_id")
+    if assignee_id is not None:
+        memberships = await get_family_memberships(db, [family_id], [assignee_id])
+        if not memberships:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="担当者が家族のメンバーではありません",
+            )
+
+    # 権限の確認は UPDATE の条件として行う
+    filters = bulk_in.filters.model_dump() if bulk_in.filters else {}
+    task_ids = await update_tasks(
+        db,
+        family_id=family_id,
+        values=values,
+        task_ids=bulk_in.ids,
+        member_user_id=user_id,
+        **filters,
+    )
+    if not task_ids:
+        await check_family_membership(db, user_id, family_id)
+
+    return TaskBulkResult(ids=task_ids, count=len(task_ids))
 
 
 async def delete_task_for_user(
     db: AsyncSession, task_id: uuid.UUID, user_id: uuid.UUID
 ) -> Task:
     """
-    ユーザーがアクセス可能なタスクを削除
+    ユーザーがアクセス可能なタスクを配下のサブタスクごと削除
+    """
+    # タスクへのアクセス権を確認（レスポンス用にタスク自身の関連のみ読み込み、
+    # 配下のサブタスクは読み込まない）
+    task = await get_task_for_user(db, task_id, user_id, profile="list_lean")
+
+    # 配下のサブタスクを含めて1回の DELETE で削除する
+    await delete_task(db, task_id)
+    return task
+
+
+async def delete_tasks_for_user(
+    db: AsyncSession, bulk_in: TaskBulkDelete, user_id: uuid.UUID
+) -> TaskBulkResult:
+    """
+    ユーザーがアクセス可能な家族のタスクを、IDまたはフィルタ条件で配下のサブタスクごと一括削除
     """
-    # タスクへのアクセス権を確認
-    await get_task_for_user(db, task_id, user_id)
+    # 権限の確認は DELETE の条件として行う
+    filters = bulk_in.filters.model_dump() if bulk_in.filters else {}
+    task_ids = await delete_tasks(
+        db,
+        family_id=bulk_in.family_id,
+        task_ids=bulk_in.ids,
+        member_user_id=user_id,
+        **filters,
+    )
+    if not task_ids:
+        await check_family_membership(db, user_id, bulk_in.family_id)
 
-    # タスクを削除
-    return await delete_task(db, task_id)
+    return TaskBulkResult(ids=task_ids, count=len(task_ids))
 
 
 async def get_tasks_for_family(
@@ -222,19 +499,28 @@ async def get_tasks_for_family(
     user_id: uuid.UUID,
     family_id: uuid.UUID,
     filters: Dict[str, Any] = None,
-) -> Tuple[List[Task], int]:
+) -> Tuple[List[Task], Optional[int], Optional[str]]:
     """
     ユーザーがアクセス可能な家族のタスク一覧を取得
     """
-    # ユーザーが家族のメンバーであることを確認
-    await check_family_membership(db, user_id, family_id)
-
     # フィルタが指定されていない場合は空の辞書を使用
     if filters is None:
         filters = {}
+    _check_list_format(filters)
+
+    # ユーザーがメンバーである場合のみタスクが返るよう、一覧のクエリ内で権限を確認する
+    try:
+        tasks, total, next_cursor = await get_family_tasks(
+            db, family_id, member_user_id=user_id, **filters
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
 
-    # タスク一覧を取得
-    return await get_family_tasks(db, family_id, **filters)
+    if not tasks and not total:
+        await check_family_membership(db, user_id, family_id)
+    return tasks, total, next_cursor
 
 
 async def get_root_tasks_for_family(
@@ -242,25 +528,48 @@ async def get_root_tasks_for_family(
     user_id: uuid.UUID,
     family_id: uuid.UUID,
     filters: Dict[str, Any] = None,
-) -> Tuple[List[Task], int]:
+) -> Tuple[List[Task], Optional[int], Optional[str]]:
     """
     ユーザーがアクセス可能な家族のルートタスク一覧を取得（サブタスクも含む）
     """
-    # ユーザーが家族のメンバーであることを確認
-    await check_family_membership(db, user_id, family_id)
-
     # フィルタが指定されていない場合は空の辞書を使用
     if filters is None:
         filters = {}
+    _check_list_format(filters)
     
-    # カウント用のパラメータを分離
-    count_params = {k: v for k, v in filters.items() if k not in ['skip', 'limit']}
-    
-    # ルートタスク一覧を取得（サブタスクも含む）
-    tasks = await get_root_tasks_by_family(db, family_id=family_id, **filters)
-    count = await count_root_tasks_by_family(db, family_id=family_id, **count_params)
-    
-    return tasks, count
+    # ルートタスク一覧と合計件数を取得（サブタスクも含む）
+    # 権限の確認は一覧のクエリ内で行う
+    try:
+        tasks, total, next_cursor = await get_root_tasks_by_family(
+            db, family_id=family_id, member_user_id=user_id, **filters
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+
+    if not tasks and not total:
+        await check_family_membership(db, user_id, family_id)
+    return tasks, total, next_cursor
+
+
+async def get_tasks_for_user(
+    db: AsyncSession, user_id: uuid.UUID, filters: Dict[str, Any] = None
+) -> Tuple[List[Task], Optional[int], Optional[str]]:
+    """
+    ユーザーが担当または作成した、所属するすべての家族のタスク一覧を取得
+    """
+    # フィルタが指定されていない場合は空の辞書を使用
+    if filters is None:
+        filters = {}
+
+    # 所属の確認はタスク一覧のクエリ内で行う
+    try:
+        return await get_user_tasks(db, user_id=user_id, **filters)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
 
 
 async def create_tag_for_family(
@@ -282,8 +591,171 @@ async def get_tags_for_family(
     """
     ユーザーがアクセス可能な家族のタグ一覧を取得
     """
+    # ユーザーがメンバーである場合のみタグが返るよう、一覧のクエリ内で権限を確認する
+    tags = await get_family_tags(db, family_id, member_user_id=user_id)
+    if not tags:
+        await check_family_membership(db, user_id, family_id)
+    return tags
+
+
+async def get_tag_for_user(
+    db: AsyncSession, tag_id: uuid.UUID, user_id: uuid.UUID
+) -> Tag:
+    """
+    ユーザーがアクセス可能なタグを取得
+
+    タグの取得と権限の確認は1回のクエリで行い、その結果から404と403を区別する
+    """
+    db_tag, has_access = await tag_crud.get_with_access(
+        db, tag_id=tag_id, user_id=user_id
+    )
+    if not db_tag:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="タグが見つかりません"
+        )
+    if not has_access:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="この家族のタスクにアクセスする権限がありません",
+        )
+    return db_tag
+
+
+async def update_tag_for_user(
+    db: AsyncSession, tag_id: uuid.UUID, tag_in: TagUpdate, user_id: uuid.UUID
+) -> Tag:
+    """
+    ユーザーがアクセス可能なタグを更新
+    """
+    # タグの取得とアクセス権の確認（1回のクエリ）
+    db_tag = await get_tag_for_user(db, tag_id, user_id)
+    return await tag_crud.update(db, db_obj=db_tag, obj_in=tag_in)
+
+
+async def delete_tag_for_user(
+    db: AsyncSession, tag_id: uuid.UUID, user_id: uuid.UUID
+) -> Tag:
+    """
+    ユーザーがアクセス可能なタグを削除
+    """
+    # タグの取得とアクセス権の確認（1回のクエリ）
+    await get_tag_for_user(db, tag_id, user_id)
+    return await tag_crud.remove(db, id=tag_id)
+
+
+async def get_task_summary_for_family(
+    db: AsyncSession, user_id: uuid.UUID, family_id: uuid.UUID
+) -> TaskSummaryResponse:
+    """
+    ユーザーがアクセス可能な家族のタスク集計を取得
+
+    集計結果は家族ごとのバージョンと日付をキーにキャッシュし、
+    タスクが書き込まれるまでは再集計しない
+    """
     # ユーザーが家族のメンバーであることを確認
     await check_family_membership(db, user_id, family_id)
 
-    # タグ一覧を取得
-    return await get_family_tags(db, family_id)
+    # 期限切れ・今日が期限の件数は日付によって変わるため日付もキーに含める
+    today = date.today()
+    cache_key = (family_id, today)
+    version = task_summary_cache.version(family_id)
+    summary = task_summary_cache.get(cache_key, version)
+    if summary is not None:
+        return summary
+
+    # ステータス・優先度・担当者の組ごとの件数から各内訳を組み立てる
+    summary = TaskSummaryResponse()
+    for row in await get_task_summary_rows(db, family_id=family_id, today=today):
+        summary.total += row.count
+        summary.by_status[row.status] = summary.by_status.get(row.status, 0) + row.count
+        summary.by_priority[row.priority] = (
+            summary.by_priority.get(row.priority, 0) + row.count
+        )
+        if row.assignee_id is None:
+            summary.unassigned += row.count
+        else:
+            summary.by_assignee[row.assignee_id] = (
+                summary.by_assignee.get(row.assignee_id, 0) + row.count
+            )
+        summary.overdue += row.overdue or 0
+        summary.due_today += row.due_today or 0
+
+    # 集計開始時のバージョンで保存し、集計中の書き込みがあれば次回は再集計させる
+    task_summary_cache.set(cache_key, version, summary)
+    return summary
+
+
+async def get_task_calendar_for_family(
+    db: AsyncSession, user_id: uuid.UUID, family_id: uuid.UUID, month: str
+) -> TaskCalendarResponse:
+    """
+    ユーザーがアクセス可能な家族の、指定月（YYYY-MM）の日ごと・ステータスごとのタスク件数を取得
+    """
+    try:
+        year, month_number = (int(part) for part in month.split("-"))
+        start = date(year, month_number, 1)
+        # 翌月の1日（9999-12のように翌年が範囲外の月もここで不正として扱う）
+        if month_number == 12:
+            end = date(year + 1, 1, 1)
+        else:
+            end = date(year, month_number + 1, 1)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="monthはYYYY-MM形式で指定してください",
+        ) from e
+
+    # 権限の確認は集計のクエリ内で行い、何も返らなかった場合のみ別途確認する
+    rows = await get_task_calendar_rows(
+        db, family_id=family_id, start=start, end=end, member_user_id=user_id
+    )
+    if not rows:
+        await check_family_membership(db, user_id, family_id)
+
+    days: Dict[date, TaskCalendarDay] = {}
+    for row in rows:
+        day = days.setdefault(row.due_date, TaskCalendarDay(date=row.due_date))
+        day.total += row.count
+        day.by_status[row.status] = row.count
+
+    return TaskCalendarResponse(month=start.strftime("%Y-%m"), days=list(days.values()))
+
+
+async def get_task_board_for_family(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    family_id: uuid.UUID,
+    per_column: int,
+    sort: str = "created_at",
+    order: str = "asc",
+) -> TaskBoardResponse:
+    """
+    ユーザーがアクセス可能な家族のかんばんボード（ステータスごとの先頭per_column件と合計件数）を取得
+    """
+    # 権限の確認はボードのクエリ内で行い、何も返らなかった場合のみ別途確認する
+    try:
+        rows = await get_task_board_rows(
+            db,
+            family_id=family_id,
+            per_column=per_column,
+            sort=sort,
+            order=order,
+            member_user_id=user_id,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    if not rows:
+        await check_family_membership(db, user_id, family_id)
+
+    columns = {
+        task_status: TaskBoardColumn(status=task_status)
+        for task_status in TASK_BOARD_STATUSES
+    }
+    for task, column_total in rows:
+        column = columns.setdefault(task.status, TaskBoardColumn(status=task.status))
+        column.total = column_total
+        column.tasks.append(TaskListItemResponse.model_validate(task))
+
+    return TaskBoardResponse(columns=list(columns.values()))
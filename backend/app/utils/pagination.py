@@ -0,0 +1,58 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, Optional
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """
+    キーセットページネーション用のカーソルを不透明な文字列にエンコードする
+
+    Args:
+        values: カーソルに含める値（JSONシリアライズ可能なもの）
+
+    Returns:
+        URLセーフなBase64文字列
+    """
+    payload = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    encode_cursorで生成したカーソルをデコードする
+
+    Args:
+        cursor: クライアントから受け取ったカーソル文字列
+
+    Returns:
+        カーソルに含まれていた値
+
+    Raises:
+        ValueError: カーソルの形式が不正な場合
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError) as e:
+        raise ValueError("カーソルの形式が不正です") from e
+
+    if not isinstance(values, dict):
+        raise ValueError("カーソルの形式が不正です")
+    return values
+
+
+def count_pages(total: Optional[int], limit: int) -> Optional[int]:
+    """
+    合計件数からページ数を計算する
+
+    Args:
+        total: 合計件数（数えていない場合はNone）
+        limit: 1ページあたりの件数
+
+    Returns:
+        ページ数（合計件数を数えていない場合はNone）
+    """
+    if total is None:
+        return None
+    return (total + limit - 1) // limit if limit > 0 else 1
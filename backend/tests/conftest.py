@@ -1,20 +1,25 @@
-from typing import AsyncGenerator, Dict, Generator
+import uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import AsyncGenerator, Callable, Dict, Generator, List
 import os
 
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
+from sqlalchemy import event, insert
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 
 from app.core.deps import get_db
+from app.core.security import create_access_token
 from app.db.session import Base
 from app.main import app as main_app
 # すべてのモデルをインポートして登録
 from app.models.user import User
-from app.models.family import Family
-from app.models.task import Task
+from app.models.family import Family, FamilyMember
+from app.models.task import Tag, Task, task_closure
 
 # テスト環境であることを設定
 os.environ["TESTING"] = "True"
@@ -31,6 +36,23 @@ test_engine = create_async_engine(
     connect_args={"check_same_thread": False},  # SQLiteで必要な設定
 )
 
+
+# SQLiteを本番（PostgreSQL）と同じように振る舞わせる
+# - 既定で無視される外部キー制約を有効にし、ON DELETE CASCADE を効かせる
+# - ドライバーによる暗黙のトランザクション管理を止めてBEGINを明示し、
+#   SAVEPOINT（バッチAPIの1トランザクション実行）が正しく動くようにする
+@event.listens_for(test_engine.sync_engine, "connect")
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+@event.listens_for(test_engine.sync_engine, "begin")
+def _begin_sqlite_transaction(conn):
+    conn.exec_driver_sql("BEGIN")
+
 # 非同期セッションファクトリの作成
 TestingSessionLocal = sessionmaker(
     autocommit=False,
@@ -61,6 +83,32 @@ async def test_session() -> AsyncGenerator[AsyncSession, None]:
         await clean_session.close()
 
 
+# 発行されたSQL文を記録する
+@pytest.fixture(scope="function")
+def statement_recorder() -> Callable:
+    """
+    with文の中で発行されたSQL文のリストを記録するコンテキストマネージャを返す
+    """
+
+    @contextmanager
+    def record() -> Generator[List[str], None, None]:
+        statements: List[str] = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+            # SQLite用に明示しているBEGINはクエリとして数えない
+            if statement != "BEGIN":
+                statements.append(statement)
+
+        sync_engine = test_engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+
+    return record
+
+
 # FastAPIのテストクライアント
 @pytest.fixture(scope="function")
 def client() -> Generator[TestClient, None, None]:
@@ -114,3 +162,84 @@ def test_task() -> Dict[str, str]:
         "priority": "medium",
         "is_routine": False,
     }
+
+
+# タスクのクエリを検証するためのデータ
+@pytest_asyncio.fixture
+async def seeded_family(test_session: AsyncSession) -> Dict:
+    """
+    ユーザー・家族・タグ・タスク（1件のサブタスクを含む）を直接DBに作成し、IDをまとめて返す
+    """
+    user = User(
+        email=f"query-{uuid.uuid4().hex}@example.com",
+        hashed_password="not-used",
+        first_name="Query",
+        last_name="Tester",
+    )
+    family = Family(name="Query Family")
+    test_session.add_all([user, family])
+    await test_session.flush()
+
+    test_session.add(
+        FamilyMember(user_id=user.id, family_id=family.id, role="parent", is_admin=True)
+    )
+    tags = [Tag(name=f"tag-{i}", family_id=family.id) for i in range(2)]
+    test_session.add_all(tags)
+    await test_session.flush()
+
+    tasks = []
+    for i in range(7):
+        task = Task(
+            title=f"task-{i}",
+            family_id=family.id,
+            created_by_id=user.id,
+            due_date=date(2025, 1, 1) + timedelta(days=i),
+            status="completed" if i % 3 == 0 else "pending",
+            priority=["low", "medium", "high"][i % 3],
+        )
+        # 偶数番目は両方のタグ、奇数番目は1つ目のタグのみ
+        task.tags = tags if i % 2 == 0 else tags[:1]
+        tasks.append(task)
+    test_session.add_all(tasks)
+    await test_session.flush()
+
+    subtask = Task(
+        title="subtask",
+        family_id=family.id,
+        created_by_id=user.id,
+        parent_id=tasks[0].id,
+    )
+    test_session.add(subtask)
+    await test_session.flush()
+
+    # 直接作成しているため、CRUDが維持する閉包テーブルとサブタスク件数もここで設定する
+    await test_session.execute(
+        insert(task_closure).values(
+            [
+                {"ancestor_id": t.id, "descendant_id": t.id, "depth": 0}
+                for t in [*tasks, subtask]
+            ]
+            + [{"ancestor_id": tasks[0].id, "descendant_id": subtask.id, "depth": 1}]
+        )
+    )
+    tasks[0].subtask_total = 1
+    tasks[0].subtask_completed = 0
+    await test_session.commit()
+
+    return {
+        "user_id": user.id,
+        "family_id": family.id,
+        "tag_ids": [t.id for t in tags],
+        "task_ids": [t.id for t in tasks],
+        "subtask_id": subtask.id,
+    }
+
+
+# seeded_familyのユーザーの認証ヘッダー
+@pytest.fixture
+def seeded_headers(seeded_family: Dict) -> Dict[str, str]:
+    """
+    seeded_familyのユーザーとしてAPIを呼び出すための認証ヘッダーを返す
+    """
+    token = create_access_token(str(seeded_family["user_id"]))
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,116 @@
+"""
+バッチAPI（複数の操作の1トランザクションでの実行）のテスト
+"""
+import uuid
+from typing import Dict
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import task_summary_cache
+from app.crud.task import (
+    create_task,
+)
+from app.db.session import create_savepoint_session
+from app.models.task import Task
+from app.schemas.batch import BatchOperation
+from app.schemas.task import (
+    TaskCreate,
+)
+from app.services.batch import run_batch_for_user
+
+
+async def test_batch_runs_operations_in_one_transaction(
+    test_session: AsyncSession, seeded_family: Dict
+):
+    """
+    バッチの操作は1つのトランザクションで順に実行され、
+    失敗した操作があればそれまでの操作もすべて取り消されること
+    """
+    user_id = seeded_family["user_id"]
+    family_id = seeded_family["family_id"]
+    task_id = seeded_family["task_ids"][1]
+
+    async def count_titled(title):
+        result = await test_session.execute(
+            select(func.count())
+            .select_from(Task)
+            .where(Task.family_id == family_id, Task.title == title)
+        )
+        return result.scalar()
+
+    operations = [
+        BatchOperation(
+            method="POST",
+            path="/api/v1/tasks",
+            body={"title": "batch-created", "family_id": str(family_id)},
+        ),
+        BatchOperation(
+            method="PUT",
+            path=f"/tasks/{task_id}",
+            body={"status": "completed", "tag_ids": []},
+        ),
+        BatchOperation(
+            method="POST",
+            path="/tags",
+            body={"name": "batch-tag", "family_id": str(family_id)},
+        ),
+    ]
+    results = await run_batch_for_user(test_session, operations, user_id)
+
+    assert [r.status for r in results] == [201, 200, 201]
+    assert results[1].data.status == "completed" and results[1].data.tags == []
+    assert await count_titled("batch-created") == 1
+
+    # 2件目が失敗すると、1件目の作成も取り消され、3件目は実行されない
+    failing = [
+        BatchOperation(
+            method="POST",
+            path="/tasks",
+            body={"title": "batch-rolled-back", "family_id": str(family_id)},
+        ),
+        BatchOperation(method="DELETE", path=f"/tasks/{uuid.uuid4()}"),
+        BatchOperation(method="PUT", path=f"/tasks/{task_id}", body={"title": "x"}),
+    ]
+    results = await run_batch_for_user(test_session, failing, user_id)
+
+    assert [r.status for r in results] == [201, 404]
+    assert await count_titled("batch-rolled-back") == 0
+    assert await count_titled("x") == 0
+
+    # 未対応の操作が含まれる場合は何も実行しない
+    with pytest.raises(HTTPException) as excinfo:
+        await run_batch_for_user(
+            test_session,
+            [failing[0], BatchOperation(method="POST", path="/families", body={})],
+            user_id,
+        )
+    assert excinfo.value.status_code == 400
+    assert await count_titled("batch-rolled-back") == 0
+
+
+async def test_batch_bumps_summary_cache_after_outer_commit(
+    test_session: AsyncSession, seeded_family: Dict
+):
+    """
+    セーブポイントで参加したセッションでの書き込みは、外側のトランザクションが
+    コミットされるまでタスク集計のキャッシュを無効化しないこと
+    """
+    family_id, user_id = seeded_family["family_id"], seeded_family["user_id"]
+    version = task_summary_cache.version(family_id)
+
+    for commit in (False, True):
+        inner_db = await create_savepoint_session(test_session)
+        await create_task(
+            inner_db, TaskCreate(title="cache-bump", family_id=family_id), user_id
+        )
+        await inner_db.close()
+        assert task_summary_cache.version(family_id) == version
+
+        if commit:
+            await test_session.commit()
+        else:
+            await test_session.rollback()
+    assert task_summary_cache.version(family_id) == version + 1
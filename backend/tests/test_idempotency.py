@@ -0,0 +1,219 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.family import Family, FamilyMember
+from app.models.idempotency import IdempotencyKey
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.common import Response
+from app.schemas.task import TaskCreate, TaskResponse
+from app.services.idempotency import (
+    begin_idempotent_request,
+    hash_request,
+    purge_expired_idempotency_keys,
+)
+from app.services.task import create_task_for_family
+from tests.conftest import TestingSessionLocal
+
+
+@pytest_asyncio.fixture
+async def member_headers(test_session: AsyncSession) -> Dict:
+    """
+    家族の管理者ユーザーを作成し、認証ヘッダーと家族IDを返す
+    """
+    user = User(
+        email=f"idempotency-{uuid.uuid4().hex}@example.com",
+        hashed_password="not-used",
+        first_name="Idempotency",
+        last_name="Tester",
+    )
+    family = Family(name="Idempotency Family")
+    test_session.add_all([user, family])
+    await test_session.flush()
+    test_session.add(
+        FamilyMember(user_id=user.id, family_id=family.id, role="parent", is_admin=True)
+    )
+    await test_session.commit()
+    return {
+        "user_id": user.id,
+        "family_id": family.id,
+        "headers": {"Authorization": f"Bearer {create_access_token(str(user.id))}"},
+    }
+
+
+async def test_expired_key_is_reused_through_the_endpoint(
+    client: TestClient, test_session: AsyncSession, member_headers: Dict
+):
+    """
+    期限切れのキーで送られたリクエストはエンドポイントの処理を通常どおり実行すること
+    """
+    user_id, family_id = member_headers["user_id"], member_headers["family_id"]
+    test_session.add(
+        IdempotencyKey(
+            user_id=user_id,
+            key="expired",
+            request_hash="0" * 64,
+            status_code=201,
+            response_body={},
+            created_at=datetime.utcnow()
+            - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS + 1),
+        )
+    )
+    await test_session.commit()
+
+    headers = {**member_headers["headers"], "Idempotency-Key": "expired"}
+    body = {"title": "reused-key", "family_id": str(family_id)}
+    first = client.post("/api/v1/tasks", json=body, headers=headers)
+    assert first.status_code == 201, first.text
+    assert "idempotent-replayed" not in first.headers
+
+    retry = client.post("/api/v1/tasks", json=body, headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+
+    created = await test_session.execute(
+        select(func.count())
+        .select_from(Task)
+        .where(Task.family_id == family_id, Task.title == "reused-key")
+    )
+    assert created.scalar() == 1
+
+
+async def _count_titled(db: AsyncSession, family_id: uuid.UUID, title: str) -> int:
+    result = await db.execute(
+        select(func.count())
+        .select_from(Task)
+        .where(Task.family_id == family_id, Task.title == title)
+    )
+    return result.scalar()
+
+
+async def test_idempotency_key_replays_stored_response(
+    test_session: AsyncSession, member_headers: Dict
+):
+    """
+    同じキーでの再送には処理を実行せずに保存済みのレスポンスが返され、
+    処理中のキーと別のリクエストへの使い回しは拒否されること
+    """
+    user_id, family_id = member_headers["user_id"], member_headers["family_id"]
+    request_hash = hash_request("POST", "/api/v1/tasks", b'{"title": "idempotent"}')
+
+    first = await begin_idempotent_request(test_session, user_id, "retry", request_hash)
+    assert first.replay is None
+
+    # 処理中の再送は409、別のリクエストへの使い回しは422
+    async with TestingSessionLocal() as other_db:
+        for other_hash, code in ((request_hash, 409), ("0" * 64, 422)):
+            with pytest.raises(HTTPException) as excinfo:
+                await begin_idempotent_request(other_db, user_id, "retry", other_hash)
+            assert excinfo.value.status_code == code
+
+    task = await create_task_for_family(
+        first.db, TaskCreate(title="idempotent", family_id=family_id), user_id
+    )
+    task_id = str(task.id)
+    await first.respond(Response[TaskResponse](data=task, message="タスクを作成しました"), 201)
+    await first.finish()
+
+    retry = await begin_idempotent_request(test_session, user_id, "retry", request_hash)
+    assert retry.replay is not None and retry.replay.status_code == 201
+    assert retry.replay.headers["Idempotent-Replayed"] == "true"
+    assert json.loads(retry.replay.body)["data"]["id"] == task_id
+    assert await _count_titled(test_session, family_id, "idempotent") == 1
+
+
+async def test_idempotency_key_commits_result_with_response(
+    test_session: AsyncSession, member_headers: Dict
+):
+    """
+    処理の結果はレスポンスの保存と同時に確定し、保存せずに終わった処理は
+    キーとともに取り消され、リースが切れたキーは取り直せること
+    """
+    user_id, family_id = member_headers["user_id"], member_headers["family_id"]
+    request_hash = hash_request("POST", "/api/v1/tasks", b'{"title": "leased"}')
+
+    # レスポンスを保存せずに終わった処理は取り消され、キーも解放される
+    failed = await begin_idempotent_request(
+        test_session, user_id, "failed", request_hash
+    )
+    await create_task_for_family(
+        failed.db, TaskCreate(title="leased", family_id=family_id), user_id
+    )
+    await failed.finish()
+    assert await _count_titled(test_session, family_id, "leased") == 0
+    again = await begin_idempotent_request(
+        test_session, user_id, "failed", request_hash
+    )
+    assert again.replay is None
+    await again.finish()
+
+    # リースが切れた処理中のキーは別のリクエストに取り直され、
+    # 元の処理はレスポンスの保存時に取り消される
+    stalled = await begin_idempotent_request(
+        test_session, user_id, "stalled", request_hash
+    )
+    async with TestingSessionLocal() as other_db:
+        key = await other_db.get(IdempotencyKey, (user_id, "stalled"))
+        key.created_at -= timedelta(seconds=settings.IDEMPOTENCY_KEY_LEASE_SECONDS + 1)
+        await other_db.commit()
+
+        takeover = await begin_idempotent_request(
+            other_db, user_id, "stalled", request_hash
+        )
+        assert takeover.replay is None
+        await takeover.finish()
+
+    task = await create_task_for_family(
+        stalled.db, TaskCreate(title="leased", family_id=family_id), user_id
+    )
+    with pytest.raises(HTTPException) as excinfo:
+        await stalled.respond(Response[TaskResponse](data=task), 201)
+    assert excinfo.value.status_code == 409
+    await stalled.finish()
+    assert await _count_titled(test_session, family_id, "leased") == 0
+
+
+async def test_expired_idempotency_keys_are_purged_in_batches(
+    test_session: AsyncSession, member_headers: Dict, monkeypatch
+):
+    """
+    期限切れのキーは一定件数ずつまとめて削除されること
+    """
+    user_id = member_headers["user_id"]
+    expired_at = datetime.utcnow() - timedelta(
+        hours=settings.IDEMPOTENCY_KEY_TTL_HOURS + 1
+    )
+    test_session.add_all(
+        IdempotencyKey(
+            user_id=user_id,
+            key=f"expired-{i}",
+            request_hash="0" * 64,
+            status_code=201,
+            response_body={},
+            created_at=expired_at,
+        )
+        for i in range(5)
+    )
+    test_session.add(
+        IdempotencyKey(user_id=user_id, key="fresh", request_hash="0" * 64)
+    )
+    await test_session.commit()
+
+    monkeypatch.setattr(settings, "IDEMPOTENCY_KEY_CLEANUP_BATCH_SIZE", 2)
+    assert await purge_expired_idempotency_keys(test_session) >= 5
+    remaining = await test_session.execute(
+        select(IdempotencyKey.key).where(IdempotencyKey.user_id == user_id)
+    )
+    assert list(remaining.scalars()) == ["fresh"]
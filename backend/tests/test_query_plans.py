@@ -0,0 +1,305 @@
+"""
+CRUDレイヤーのクエリがtasksテーブルを全件スキャンしないことを確認する回帰テスト
+
+大量の合成データを投入した上で各CRUD関数を実行し、発行されたSQLを
+すべてEXPLAINにかけて実行計画を検査する
+"""
+import re
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import family as family_crud
+from app.crud import task as task_crud
+from app.models.family import Family, FamilyMember
+from app.models.task import Tag, Task, task_closure, task_tags
+from app.models.user import User
+from tests.conftest import test_engine
+
+FAMILY_COUNT = 20
+ROOT_TASKS_PER_FAMILY = 150
+SUBTASKS_PER_ROOT = 2
+PLAN_FAMILY_PREFIX = "Plan Family"
+
+# 全件スキャンを表す実行計画の行
+SEQ_SCAN_PATTERNS = {
+    "sqlite": re.compile(r"\bSCAN tasks\b(?! USING)"),
+    "postgresql": re.compile(r"Seq Scan on tasks\b"),
+}
+
+
+@pytest_asyncio.fixture
+async def large_dataset(test_session: AsyncSession) -> Dict:
+    """
+    実行計画の検査用に大量のタスクを投入する（投入済みの場合は再利用する）
+    """
+    existing = await test_session.execute(
+        select(Family.id).where(Family.name == f"{PLAN_FAMILY_PREFIX} 0")
+    )
+    family_id = existing.scalar()
+
+    if family_id is None:
+        family_id = await _seed_large_dataset(test_session)
+
+    user_id = (
+        await test_session.execute(
+            select(FamilyMember.user_id).where(FamilyMember.family_id == family_id)
+        )
+    ).scalar()
+    tag_ids = (
+        (await test_session.execute(select(Tag.id).where(Tag.family_id == family_id)))
+        .scalars()
+        .all()
+    )
+    task_id = (
+        await test_session.execute(
+            select(Task.id).where(Task.family_id == family_id, Task.parent_id.is_(None))
+        )
+    ).scalar()
+
+    return {
+        "family_id": family_id,
+        "user_id": user_id,
+        "tag_ids": list(tag_ids),
+        "task_id": task_id,
+    }
+
+
+async def _seed_large_dataset(db: AsyncSession) -> uuid.UUID:
+    """
+    複数の家族に親子関係・タグ付きのタスクを一括投入し、先頭の家族IDを返す
+    """
+    now = datetime.utcnow()
+    users, families, members, tags, tasks, links = [], [], [], [], [], []
+    closure = []
+
+    for f in range(FAMILY_COUNT):
+        user_id, family_id = uuid.uuid4(), uuid.uuid4()
+        users.append(
+            {
+                "id": user_id,
+                "email": f"plan-{user_id.hex}@example.com",
+                "hashed_password": "not-used",
+                "first_name": "Plan",
+                "last_name": str(f),
+            }
+        )
+        families.append({"id": family_id, "name": f"{PLAN_FAMILY_PREFIX} {f}"})
+        members.append(
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "family_id": family_id,
+                "role": "parent",
+                "is_admin": True,
+            }
+        )
+        family_tags = [uuid.uuid4() for _ in range(5)]
+        tags.extend(
+            {"id": tag_id, "name": f"plan-tag-{i}", "family_id": family_id}
+            for i, tag_id in enumerate(family_tags)
+        )
+
+        for i in range(ROOT_TASKS_PER_FAMILY):
+            root_id = uuid.uuid4()
+            for j in range(SUBTASKS_PER_ROOT + 1):
+                task_id = root_id if j == 0 else uuid.uuid4()
+                tasks.append(
+                    {
+                        "id": task_id,
+                        "title": f"plan-task-{i}-{j}",
+                        "family_id": family_id,
+                        "assignee_id": user_id if i % 2 == 0 else None,
+                        "created_by_id": user_id,
+                        "due_date": date(2025, 1, 1) + timedelta(days=i % 60),
+                        "status": ["pending", "in_progress", "completed"][i % 3],
+                        "priority": ["low", "medium", "high"][j % 3],
+                        "is_routine": i % 5 == 0,
+                        "parent_id": None if j == 0 else root_id,
+                        "created_at": now + timedelta(seconds=i),
+                        "updated_at": now + timedelta(seconds=i),
+                    }
+                )
+                links.append({"task_id": task_id, "tag_id": family_tags[i % 5]})
+                closure.append(
+                    {"ancestor_id": task_id, "descendant_id": task_id, "depth": 0}
+                )
+                if j > 0:
+                    closure.append(
+                        {"ancestor_id": root_id, "descendant_id": task_id, "depth": 1}
+                    )
+
+    await db.execute(insert(User), users)
+    await db.execute(insert(Family), families)
+    await db.execute(insert(FamilyMember), members)
+    await db.execute(insert(Tag), tags)
+    await db.execute(insert(Task), tasks)
+    await db.execute(insert(task_tags), links)
+    await db.execute(insert(task_closure), closure)
+    await db.commit()
+
+    # 統計情報を更新してプランナーに実際のデータ分布を使わせる
+    async with test_engine.begin() as conn:
+        await conn.execute(text("ANALYZE"))
+
+    return families[0]["id"]
+
+
+# 検査対象のCRUD呼び出し（名前, 呼び出し関数）
+QueryCall = Callable[[AsyncSession, Dict], Awaitable[object]]
+CRUD_CALLS: List[Tuple[str, QueryCall]] = [
+    (
+        "family_tasks_default",
+        lambda db, d: task_crud.get_family_tasks(db, d["family_id"], limit=20),
+    ),
+    *[
+        (
+            f"family_tasks_sort_{sort}_{order}",
+            lambda db, d, sort=sort, order=order: task_crud.get_family_tasks(
+                db, d["family_id"], sort=sort, order=order, limit=20
+            ),
+        )
+        for sort in ("created_at", "updated_at", "due_date", "priority")
+        for order in ("asc", "desc")
+    ],
+    (
+        "family_tasks_filtered",
+        lambda db, d: task_crud.get_family_tasks(
+            db,
+            d["family_id"],
+            assignee_id=d["user_id"],
+            status="pending",
+            is_routine=False,
+            due_before=date(2025, 2, 1),
+            due_after=date(2025, 1, 10),
+            limit=20,
+        ),
+    ),
+    (
+        "family_tasks_tags_any",
+        lambda db, d: task_crud.get_family_tasks(
+            db, d["family_id"], tag_ids=d["tag_ids"][:2], limit=20
+        ),
+    ),
+    (
+        "family_tasks_tags_all",
+        lambda db, d: task_crud.get_family_tasks(
+            db, d["family_id"], tag_ids=d["tag_ids"][:2], tag_match="all", limit=20
+        ),
+    ),
+    (
+        "family_tasks_member_scoped",
+        lambda db, d: task_crud.get_family_tasks(
+            db, d["family_id"], member_user_id=d["user_id"], limit=20
+        ),
+    ),
+    (
+        "root_tasks",
+        lambda db, d: task_crud.get_root_tasks_by_family(
+            db, family_id=d["family_id"], limit=20
+        ),
+    ),
+    (
+        "task_with_relations",
+        lambda db, d: task_crud.get_task_with_relations(db, d["task_id"]),
+    ),
+    (
+        "task_with_access",
+        lambda db, d: task_crud.check_user_task_access(db, d["user_id"], d["task_id"]),
+    ),
+    (
+        "task_subtree",
+        lambda db, d: task_crud.get_task_subtree(db, task_id=d["task_id"]),
+    ),
+    (
+        "task_summary",
+        lambda db, d: task_crud.get_task_summary_rows(
+            db, family_id=d["family_id"], today=date(2025, 1, 15)
+        ),
+    ),
+    (
+        "task_calendar",
+        lambda db, d: task_crud.get_task_calendar_rows(
+            db,
+            family_id=d["family_id"],
+            start=date(2025, 1, 1),
+            end=date(2025, 2, 1),
+        ),
+    ),
+    (
+        "task_board",
+        lambda db, d: task_crud.get_task_board_rows(
+            db, family_id=d["family_id"], per_column=10
+        ),
+    ),
+    (
+        "user_tasks",
+        lambda db, d: task_crud.get_user_tasks(db, user_id=d["user_id"], limit=20),
+    ),
+    ("family_tags", lambda db, d: task_crud.get_family_tags(db, d["family_id"])),
+    (
+        "families_by_user",
+        lambda db, d: family_crud.get_families_by_user(db, d["user_id"]),
+    ),
+    (
+        "is_family_member",
+        lambda db, d: family_crud.is_user_family_member(
+            db, d["user_id"], d["family_id"]
+        ),
+    ),
+    (
+        "is_family_admin",
+        lambda db, d: family_crud.is_user_family_admin(
+            db, d["user_id"], d["family_id"]
+        ),
+    ),
+]
+
+
+async def _capture_statements(
+    db: AsyncSession, call: QueryCall, data: Dict
+) -> List[Tuple[str, object]]:
+    """
+    CRUD関数の実行中に発行されたSQLとパラメータを記録する
+    """
+    captured: List[Tuple[str, object]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    sync_engine = test_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        await call(db, data)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+@pytest.mark.parametrize("name,call", CRUD_CALLS, ids=[c[0] for c in CRUD_CALLS])
+async def test_crud_queries_do_not_seq_scan_tasks(
+    test_session: AsyncSession, large_dataset: Dict, name: str, call: QueryCall
+):
+    """
+    各CRUDクエリの実行計画にtasksの全件スキャンが含まれないこと
+    """
+    statements = await _capture_statements(test_session, call, large_dataset)
+    assert statements, f"{name}: SQLが発行されていません"
+
+    dialect = test_engine.dialect.name
+    explain_prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    seq_scan = SEQ_SCAN_PATTERNS[dialect]
+
+    async with test_engine.connect() as conn:
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(explain_prefix + statement, parameters)
+            plan = "\n".join(str(row[-1]) for row in result.fetchall())
+            assert not seq_scan.search(
+                plan
+            ), f"{name}: tasksの全件スキャンが発生しています\n{statement}\n{plan}"
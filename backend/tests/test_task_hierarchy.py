@@ -0,0 +1,198 @@
+"""
+サブタスクの階層（閉包テーブル・サブタスク件数・親の自動完了）のテスト
+"""
+import uuid
+from typing import Dict
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.task import (
+    create_task,
+    delete_task,
+    get_task_subtree,
+    get_task_with_relations,
+    is_task_ancestor,
+    update_task,
+)
+from app.models.task import Task, task_closure
+from app.schemas.task import (
+    TaskBulkUpdate,
+    TaskCreate,
+    TaskUpdate,
+)
+from app.services.task import (
+    update_tasks_for_user,
+)
+
+
+async def test_subtree_is_fetched_to_any_depth(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder
+):
+    """
+    階層情報の1回の索引検索で任意の深さのサブタスクが取得でき、max_depthで打ち切れること
+    """
+    parent_id = seeded_family["subtask_id"]
+    for depth in range(3):
+        child = await create_task(
+            test_session,
+            TaskCreate(
+                title=f"nested-{depth}",
+                family_id=seeded_family["family_id"],
+                parent_id=parent_id,
+            ),
+            seeded_family["user_id"],
+        )
+        parent_id = child.id
+
+    root_id = seeded_family["task_ids"][0]
+    with statement_recorder() as statements:
+        root = await get_task_subtree(test_session, task_id=root_id)
+
+    # 深さによらず、ツリー本体と関連（タグ・作成者）の読み込みのみ
+    assert len(statements) <= 4
+    assert "task_closure" in statements[0] and "RECURSIVE" not in statements[0]
+    depth, node = 0, root
+    while node.subtasks:
+        assert len(node.subtasks) == 1
+        node = node.subtasks[0]
+        depth += 1
+    assert depth == 4
+    assert node.created_by is not None
+
+    limited = await get_task_subtree(test_session, task_id=root_id, max_depth=2)
+    assert limited.subtasks[0].subtasks[0].subtasks == []
+    assert await get_task_subtree(test_session, task_id=uuid.uuid4()) is None
+
+
+async def test_closure_table_follows_create_reparent_and_delete(
+    test_session: AsyncSession, seeded_family: Dict
+):
+    """
+    作成・付け替え・削除に合わせて階層情報（クロージャテーブル）が維持されること
+    """
+    family_id, user_id = seeded_family["family_id"], seeded_family["user_id"]
+
+    async def paths(*task_ids):
+        # 子孫側がtask_idsのいずれかである (祖先, 子孫, 深さ)（自身への行を除く）
+        result = await test_session.execute(
+            select(task_closure).where(
+                task_closure.c.descendant_id.in_(task_ids), task_closure.c.depth > 0
+            )
+        )
+        return set(result.tuples())
+
+    # フィクスチャで用意した階層もクロージャテーブルに登録されている
+    root_id, subtask_id = seeded_family["task_ids"][0], seeded_family["subtask_id"]
+    assert await paths(subtask_id) == {(root_id, subtask_id, 1)}
+
+    async def create(title, parent_id=None):
+        created = await create_task(
+            test_session,
+            TaskCreate(title=title, family_id=family_id, parent_id=parent_id),
+            user_id,
+        )
+        return created.id
+
+    # a -> b -> c と、別のルート d
+    a = await create("a")
+    b = await create("b", a)
+    c = await create("c", b)
+    d = await create("d")
+
+    assert await paths(b, c, d) == {(a, b, 1), (b, c, 1), (a, c, 2)}
+    assert await is_task_ancestor(test_session, ancestor_id=a, descendant_id=c)
+    assert not await is_task_ancestor(test_session, ancestor_id=d, descendant_id=c)
+
+    # b の部分木を d の下へ付け替え
+    b_task = await get_task_with_relations(test_session, b)
+    await update_task(test_session, b_task, TaskUpdate(parent_id=d))
+    assert await paths(b, c) == {(d, b, 1), (b, c, 1), (d, c, 2)}
+
+    # 自身の配下への付け替えは拒否される
+    d_task = await get_task_with_relations(test_session, d)
+    with pytest.raises(ValueError):
+        await update_task(test_session, d_task, TaskUpdate(parent_id=c))
+
+    # d を削除すると部分木ごと削除され、階層情報も残らない
+    await delete_task(test_session, d)
+    remaining = await test_session.execute(
+        select(func.count()).select_from(Task).where(Task.id.in_([b, c, d]))
+    )
+    assert remaining.scalar() == 0
+    closure_rows = await test_session.execute(
+        select(func.count())
+        .select_from(task_closure)
+        .where(task_closure.c.descendant_id.in_([b, c, d]))
+    )
+    assert closure_rows.scalar() == 0
+    assert await get_task_with_relations(test_session, a) is not None
+
+
+async def test_subtask_counters_follow_subtask_writes(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder, monkeypatch
+):
+    """
+    サブタスクの作成・完了・付け替え・削除で親の件数が更新され、
+    設定が有効なら最後のサブタスクの完了で親も完了になること
+    """
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "AUTO_COMPLETE_PARENT_TASKS", True)
+    family_id, user_id = seeded_family["family_id"], seeded_family["user_id"]
+
+    async def create(title, parent_id=None, status="pending"):
+        created = await create_task(
+            test_session,
+            TaskCreate(
+                title=title, family_id=family_id, parent_id=parent_id, status=status
+            ),
+            user_id,
+        )
+        return created.id
+
+    async def counters(task_id):
+        db_task = await get_task_with_relations(test_session, task_id)
+        return db_task.subtask_total, db_task.subtask_completed, db_task.status
+
+    grandparent = await create("grandparent")
+    parent = await create("parent", grandparent)
+    first = await create("first", parent)
+    second = await create("second", parent, status="completed")
+    other = await create("other")
+    assert await counters(parent) == (2, 1, "pending")
+
+    # 完了していないサブタスクを別の親へ移す
+    first_task = await get_task_with_relations(test_session, first)
+    await update_task(test_session, first_task, TaskUpdate(parent_id=other))
+    assert (await counters(other))[:2] == (1, 0)
+
+    # 戻してから完了にすると、親・祖父母へ順に自動完了が伝わる
+    first_task = await get_task_with_relations(test_session, first)
+    await update_task(test_session, first_task, TaskUpdate(parent_id=parent))
+    assert await counters(parent) == (2, 1, "pending")
+    first_task = await get_task_with_relations(test_session, first)
+    await update_task(test_session, first_task, TaskUpdate(status="completed"))
+    assert await counters(parent) == (2, 2, "completed")
+    assert await counters(grandparent) == (1, 1, "completed")
+
+    await delete_task(test_session, second)
+    assert (await counters(parent))[:2] == (1, 1)
+
+    # 一括更新での自動完了は親の数によらず木の1階層ごとにまとめて行う
+    root = await create("root")
+    parents = [await create(f"parent-{i}", root) for i in range(3)]
+    leaves = [
+        await create(f"leaf-{i}", parent_id) for i, parent_id in enumerate(parents)
+    ]
+    bulk_in = TaskBulkUpdate(
+        family_id=family_id, ids=leaves, patch={"status": "completed"}
+    )
+    with statement_recorder() as statements:
+        await update_tasks_for_user(test_session, bulk_in, user_id)
+    # 一括更新、親の再集計、階層ごとの完了と祖先の再集計（2階層）、最上位の完了
+    assert len([s for s in statements if s.startswith("UPDATE")]) == 5
+    for parent_id in parents:
+        assert await counters(parent_id) == (1, 1, "completed")
+    assert await counters(root) == (3, 3, "completed")
@@ -0,0 +1,490 @@
+"""
+タスク一覧の取得（ページネーション・フィルタ・並び替え・読み込む項目）のテスト
+"""
+import uuid
+from datetime import date
+from typing import Dict
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.task import (
+    get_family_tags,
+    get_family_tasks,
+    get_root_tasks_by_family,
+    get_task_with_relations,
+    get_user_tasks,
+)
+from app.models.family import Family, FamilyMember
+from app.models.task import Task
+from app.models.user import User
+from app.services.task import (
+    get_task_for_user,
+    get_tasks_for_family,
+    normalize_task_list,
+    parse_task_fields,
+    serialize_task_fields,
+)
+
+
+async def test_cursor_pagination_walks_every_task_once(
+    test_session: AsyncSession, seeded_family: Dict
+):
+    """
+    カーソルを辿るとすべてのタスクが重複なく取得できること
+    """
+    seen = []
+    cursor = None
+    while True:
+        tasks, total, cursor = await get_family_tasks(
+            test_session, seeded_family["family_id"], limit=3, cursor=cursor
+        )
+        seen.extend(t.id for t in tasks)
+        if cursor is None:
+            break
+
+    assert total == 8
+    assert len(seen) == 8
+    assert len(set(seen)) == 8
+
+
+async def test_cursor_pagination_for_root_tasks(
+    test_session: AsyncSession, seeded_family: Dict
+):
+    """
+    ルートタスクもカーソルで続きのページを取得できること
+    """
+    first, _, cursor = await get_root_tasks_by_family(
+        test_session, family_id=seeded_family["family_id"], limit=4
+    )
+    second, _, last_cursor = await get_root_tasks_by_family(
+        test_session, family_id=seeded_family["family_id"], limit=4, cursor=cursor
+    )
+
+    assert len(first) == 4
+    assert len(second) == 3
+    assert last_cursor is None
+    assert {t.id for t in first + second} == set(seeded_family["task_ids"])
+
+
+async def test_total_is_returned_with_page_or_skipped(
+    test_session: AsyncSession, seeded_family: Dict
+):
+    """
+    合計件数がページと同時に返り、include_total=Falseでは省略されること
+    """
+    tasks, total, _ = await get_family_tasks(
+        test_session, seeded_family["family_id"], status="pending", limit=2
+    )
+    assert len(tasks) == 2
+    assert total == 5
+
+    # ページ範囲外でも合計件数は正しく返る
+    tasks, total, _ = await get_family_tasks(
+        test_session, seeded_family["family_id"], skip=50, limit=2
+    )
+    assert tasks == []
+    assert total == 8
+
+    tasks, total, _ = await get_root_tasks_by_family(
+        test_session,
+        family_id=seeded_family["family_id"],
+        limit=2,
+        include_total=False,
+    )
+    assert len(tasks) == 2
+    assert total is None
+
+
+async def test_tag_filter_does_not_duplicate_rows(
+    test_session: AsyncSession, seeded_family: Dict
+):
+    """
+    複数タグが一致してもタスクが重複せず、any/allで絞り込めること
+    """
+    tag_ids = seeded_family["tag_ids"]
+
+    tasks, total, _ = await get_family_tasks(
+        test_session, seeded_family["family_id"], tag_ids=tag_ids, limit=100
+    )
+    assert len(tasks) == 7
+    assert len({t.id for t in tasks}) == 7
+    assert total == 7
+
+    # 両方のタグを持つのは偶数番目のタスク（0, 2, 4, 6）のみ
+    tasks, total, _ = await get_family_tasks(
+        test_session,
+        seeded_family["family_id"],
+        tag_ids=tag_ids,
+        tag_match="all",
+        limit=3,
+    )
+    assert len(tasks) == 3
+    assert total == 4
+
+
+@pytest.mark.parametrize("sort", ["due_date", "priority", "created_at", "updated_at"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_sorted_cursor_pages_match_full_ordering(
+    test_session: AsyncSession, seeded_family: Dict, sort: str, order: str
+):
+    """
+    ソート指定時もカーソルで辿った結果が一括取得の順序と一致すること
+    """
+    family_id = seeded_family["family_id"]
+    expected, _, _ = await get_family_tasks(
+        test_session, family_id, sort=sort, order=order, limit=100
+    )
+
+    walked = []
+    cursor = None
+    while True:
+        tasks, _, cursor = await get_family_tasks(
+            test_session, family_id, sort=sort, order=order, limit=3, cursor=cursor
+        )
+        walked.extend(tasks)
+        if cursor is None:
+            break
+
+    assert [t.id for t in walked] == [t.id for t in expected]
+    if sort == "due_date":
+        # 期限なしのサブタスクは昇順で最後、降順で先頭
+        assert expected[-1 if order == "asc" else 0].due_date is None
+
+
+async def test_cursor_must_match_sort(test_session: AsyncSession, seeded_family: Dict):
+    """
+    別の並び順で発行されたカーソルは受け付けないこと
+    """
+    _, _, cursor = await get_family_tasks(
+        test_session, seeded_family["family_id"], sort="priority", limit=2
+    )
+    with pytest.raises(ValueError):
+        await get_family_tasks(
+            test_session, seeded_family["family_id"], sort="due_date", cursor=cursor
+        )
+
+
+async def test_tag_list_is_a_single_query(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder
+):
+    """
+    タグ一覧はタグに紐づくタスクの数によらず1回のクエリで取得できること
+    """
+    with statement_recorder() as statements:
+        tags = await get_family_tags(test_session, seeded_family["family_id"])
+
+    assert len(tags) == 2
+    assert len(statements) == 1
+
+
+async def test_loader_profiles_load_only_what_the_path_needs(
+    test_session: AsyncSession, seeded_family: Dict
+):
+    """
+    一覧（list_lean）はサブタスクを読み込まず、詳細（detail）は読み込むこと
+    """
+    root_id = seeded_family["task_ids"][0]
+
+    tasks, _, _ = await get_family_tasks(test_session, seeded_family["family_id"])
+    listed = next(t for t in tasks if t.id == root_id)
+    # 読み込んでいないサブタスクへのアクセスは空のリストではなくエラーになる
+    assert "subtasks" in inspect(listed).unloaded
+    with pytest.raises(InvalidRequestError):
+        len(listed.subtasks)
+    assert listed.created_by is not None
+    assert len(listed.tags) == 2
+
+    detail = await get_task_with_relations(test_session, root_id)
+    assert [s.id for s in detail.subtasks] == [seeded_family["subtask_id"]]
+    assert detail.subtasks[0].created_by is not None
+
+
+async def test_invalid_cursor_is_rejected(
+    test_session: AsyncSession, seeded_family: Dict
+):
+    """
+    不正なカーソルはValueErrorになること
+    """
+    with pytest.raises(ValueError):
+        await get_family_tasks(
+            test_session, seeded_family["family_id"], cursor="not-a-cursor"
+        )
+
+
+async def test_sparse_fields_select_only_requested_columns(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder
+):
+    """
+    fieldsを指定すると指定列のみを読み込み、不要なリレーションを読み込まないこと
+    """
+    with statement_recorder() as statements:
+        tasks, _, cursor = await get_family_tasks(
+            test_session,
+            seeded_family["family_id"],
+            sort="due_date",
+            limit=3,
+            fields=["id", "title", "status"],
+        )
+
+    assert len(tasks) == 3
+    assert cursor is not None
+    assert len(statements) == 1
+    assert "description" not in statements[0]
+    assert "created_by_id" not in statements[0]
+
+    with statement_recorder() as statements:
+        detail = await get_task_with_relations(
+            test_session, seeded_family["task_ids"][0], ["id", "title", "tags"]
+        )
+
+    # タスク本体とタグの2回のみ（担当者・作成者・サブタスクは読み込まない）
+    assert len(statements) == 2
+    assert len(detail.tags) == 2
+
+
+async def test_sparse_fields_fill_subtask_summary_on_the_detail_path(
+    test_session: AsyncSession, seeded_family: Dict
+):
+    """
+    詳細取得でもfields=subtask_count,has_subtasksを維持している件数から返すこと
+    """
+    fields = parse_task_fields("subtask_count,has_subtasks")
+    for task_id, expected in (
+        (seeded_family["task_ids"][0], (1, True)),
+        (seeded_family["subtask_id"], (0, False)),
+    ):
+        task = await get_task_for_user(
+            test_session, task_id, seeded_family["user_id"], fields
+        )
+        data = serialize_task_fields(task, fields)
+        assert (data["subtask_count"], data["has_subtasks"]) == expected
+
+
+async def test_normalized_list_loads_each_user_once(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder
+):
+    """
+    正規化形式ではタスク数によらず一定回数のクエリで済み、ユーザーをまとめて取得すること
+    """
+    with statement_recorder() as statements:
+        tasks, _, _ = await get_root_tasks_by_family(
+            test_session, family_id=seeded_family["family_id"], normalized=True
+        )
+        data, users, tags = await normalize_task_list(test_session, tasks)
+
+    # ルートタスク・タグ・サブタスク・サブタスクのタグ・ユーザー
+    assert len(statements) == 5
+    assert set(users) == {seeded_family["user_id"]}
+    assert set(tags) == set(seeded_family["tag_ids"])
+    root = next(item for item in data if item["id"] == seeded_family["task_ids"][0])
+    assert root["tag_ids"] and "created_by" not in root
+    assert [s["id"] for s in root["subtasks"]] == [seeded_family["subtask_id"]]
+
+
+@pytest.mark.parametrize("subtasks", ["none", "count", "full"])
+async def test_root_subtask_modes(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder, subtasks
+):
+    """
+    subtasks=none/countではサブタスクを読み込まず、countでは件数の要約を返すこと
+    """
+    with statement_recorder() as statements:
+        tasks, _, _ = await get_root_tasks_by_family(
+            test_session, family_id=seeded_family["family_id"], subtasks=subtasks
+        )
+    root = next(t for t in tasks if t.id == seeded_family["task_ids"][0])
+    leaf = next(t for t in tasks if t.id == seeded_family["task_ids"][1])
+
+    if subtasks == "full":
+        assert [s.id for s in root.subtasks] == [seeded_family["subtask_id"]]
+        return
+
+    assert "subtasks" in inspect(root).unloaded
+    # サブタスクのクエリが発行されていないこと
+    assert not any("tasks.parent_id IN" in statement for statement in statements)
+    if subtasks == "count":
+        assert (root.subtask_count, root.has_subtasks) == (1, True)
+        assert (leaf.subtask_count, leaf.has_subtasks) == (0, False)
+
+
+async def test_user_tasks_span_families_in_one_query(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder
+):
+    """
+    自分のタスクは所属するすべての家族から1回のクエリで期限日順に取得され、
+    所属していない家族のタスクは含まれないこと
+    """
+    user_id = seeded_family["user_id"]
+    other = User(
+        email=f"other-{uuid.uuid4().hex}@example.com",
+        hashed_password="not-used",
+        first_name="Other",
+        last_name="Member",
+    )
+    second, left = Family(name="Second Family"), Family(name="Left Family")
+    test_session.add_all([other, second, left])
+    await test_session.flush()
+    test_session.add(FamilyMember(user_id=user_id, family_id=second.id, role="child"))
+    test_session.add_all(
+        [
+            # 別の家族で他のメンバーが作成し、自分が担当するタスク
+            Task(
+                title="assigned-elsewhere",
+                family_id=second.id,
+                created_by_id=other.id,
+                assignee_id=user_id,
+                due_date=date(2025, 1, 3),
+            ),
+            # 自分にも他のメンバーにも関係するが、担当でも作成者でもないタスク
+            Task(
+                title="not-mine",
+                family_id=second.id,
+                created_by_id=other.id,
+                due_date=date(2025, 1, 3),
+            ),
+            # 所属していない（脱退した）家族で作成したタスク
+            Task(
+                title="left-family",
+                family_id=left.id,
+                created_by_id=user_id,
+                due_date=date(2025, 1, 3),
+            ),
+        ]
+    )
+    await test_session.commit()
+
+    with statement_recorder() as statements:
+        tasks, total, cursor = await get_user_tasks(
+            test_session, user_id=user_id, limit=4
+        )
+
+    # 取得と件数は1回のSQL（以降はリレーションの読み込み）
+    assert len([s for s in statements if "family_members" in s]) == 1
+    assert total == 9
+    assert [t.title for t in tasks][:2] == ["task-0", "task-1"]
+    assert "assigned-elsewhere" in [t.title for t in tasks]
+
+    titles = [t.title for t in tasks]
+    while cursor:
+        page, _, cursor = await get_user_tasks(
+            test_session, user_id=user_id, limit=4, cursor=cursor
+        )
+        titles.extend(t.title for t in page)
+    assert len(titles) == 9
+    assert "not-mine" not in titles
+    assert "left-family" not in titles
+
+
+async def test_authorization_is_folded_into_data_queries(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder
+):
+    """
+    権限の確認はデータ取得のクエリ内で行われ、404と403が区別されること
+    """
+    user_id = seeded_family["user_id"]
+    family_id = seeded_family["family_id"]
+    task_id = seeded_family["task_ids"][0]
+
+    # 権限がある場合はfamily_membersを参照する独立したSELECTが発行されない
+    with statement_recorder() as statements:
+        task = await get_task_for_user(test_session, task_id, user_id)
+        tasks, _, _ = await get_tasks_for_family(test_session, user_id, family_id)
+    assert task.id == task_id
+    assert len(tasks) == 8
+    assert not [s for s in statements if s.lstrip().startswith("SELECT family_members")]
+
+    outsider = uuid.uuid4()
+    for call in (
+        lambda: get_task_for_user(test_session, task_id, outsider),
+        lambda: get_tasks_for_family(test_session, outsider, family_id),
+    ):
+        with pytest.raises(HTTPException) as excinfo:
+            await call()
+        assert excinfo.value.status_code == 403
+
+    for call in (
+        lambda: get_task_for_user(test_session, uuid.uuid4(), user_id),
+        lambda: get_tasks_for_family(test_session, user_id, uuid.uuid4()),
+    ):
+        with pytest.raises(HTTPException) as excinfo:
+            await call()
+        assert excinfo.value.status_code == 404
+
+
+@pytest.mark.parametrize("path", ["/api/v1/tasks", "/api/v1/tasks/roots"])
+async def test_empty_default_list_has_no_normalized_keys(
+    client: TestClient, seeded_family: Dict, seeded_headers: Dict, path: str
+):
+    """
+    結果が空でも、通常形式の一覧に正規化形式の項目（users・tags）が含まれないこと
+    """
+    params = {"family_id": str(seeded_family["family_id"]), "status": "archived"}
+    response = client.get(path, params=params, headers=seeded_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["data"] == []
+    assert "users" not in body and "tags" not in body
+
+    params["format"] = "normalized"
+    response = client.get(path, params=params, headers=seeded_headers)
+    assert response.status_code == 200
+    assert response.json()["users"] == {} and response.json()["tags"] == {}
+
+
+async def test_my_tasks_limit_is_validated(
+    client: TestClient, seeded_family: Dict, seeded_headers: Dict
+):
+    """
+    自分のタスク一覧はlimitを1〜100に制限し、ページ数を合計件数から計算すること
+    """
+    for limit in (0, -5, 101):
+        response = client.get(
+            "/api/v1/users/me/tasks", params={"limit": limit}, headers=seeded_headers
+        )
+        assert response.status_code == 422
+
+    response = client.get(
+        "/api/v1/users/me/tasks", params={"limit": 3}, headers=seeded_headers
+    )
+    assert response.status_code == 200
+    body = response.json()
+    # 担当者のいないタスクも作成者として含まれる（8件）
+    assert (body["total"], body["size"], body["pages"]) == (8, 3, 3)
+
+
+@pytest.mark.parametrize("path", ["/api/v1/tasks", "/api/v1/tasks/roots"])
+async def test_list_limit_and_skip_are_validated(
+    client: TestClient, seeded_family: Dict, seeded_headers: Dict, path: str
+):
+    """
+    一覧のlimitは1〜500、skipは0以上に制限されること（キーセット方式でも同じ）
+    """
+    family_id = str(seeded_family["family_id"])
+    invalid_params = [{"limit": 0}, {"limit": -5}, {"limit": 501}, {"skip": -1}]
+    for params in invalid_params:
+        for extra in ({}, {"include_total": "false"}):
+            response = client.get(
+                path,
+                params={"family_id": family_id, **params, **extra},
+                headers=seeded_headers,
+            )
+            assert response.status_code == 422
+
+    response = client.get(
+        path, params={"family_id": family_id, "limit": 2}, headers=seeded_headers
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["size"] == 2 and body["next_cursor"] is not None
+
+    response = client.get(
+        path,
+        params={"family_id": family_id, "limit": 0, "cursor": body["next_cursor"]},
+        headers=seeded_headers,
+    )
+    assert response.status_code == 422
@@ -0,0 +1,155 @@
+"""
+ダッシュボード向けの集計（サマリー・カレンダー・ボード）のテスト
+"""
+from datetime import date, timedelta
+from typing import Dict
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import task_summary_cache
+from app.crud.task import (
+    create_task,
+)
+from app.models.task import Task
+from app.schemas.task import (
+    TaskCreate,
+)
+from app.services.routine_task import reset_completed_routine_tasks
+from app.services.task import (
+    get_task_board_for_family,
+    get_task_calendar_for_family,
+    get_task_summary_for_family,
+)
+
+
+async def test_task_summary_is_one_query_and_cached_until_a_write(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder
+):
+    """
+    集計は1回のGROUP BYで求め、タスクの書き込みがあるまでキャッシュから返すこと
+    """
+    family_id, user_id = seeded_family["family_id"], seeded_family["user_id"]
+
+    with statement_recorder() as statements:
+        summary = await get_task_summary_for_family(test_session, user_id, family_id)
+    # メンバー確認と集計のみ
+    assert len(statements) == 2
+    assert summary.total == 8
+    assert summary.by_status == {"completed": 3, "pending": 5}
+    assert summary.by_priority == {"low": 3, "medium": 3, "high": 2}
+    assert summary.unassigned == 8
+    # 期限が過去（2025年1月）の未完了タスク
+    assert summary.overdue == 4
+
+    with statement_recorder() as statements:
+        cached = await get_task_summary_for_family(test_session, user_id, family_id)
+    assert cached is summary
+    assert not any("GROUP BY" in statement for statement in statements)
+
+    await create_task(
+        test_session,
+        TaskCreate(title="new", family_id=family_id, assignee_id=user_id),
+        user_id,
+    )
+    refreshed = await get_task_summary_for_family(test_session, user_id, family_id)
+    assert refreshed.total == 9
+    assert refreshed.by_assignee == {user_id: 1}
+
+
+async def test_routine_reset_recounts_parents_and_bumps_summary_cache(
+    test_session: AsyncSession, seeded_family: Dict
+):
+    """
+    ルーティンタスクのリセットでも親の完了件数を数え直し、集計キャッシュを無効化すること
+    """
+    family_id = seeded_family["family_id"]
+    subtask = await test_session.get(Task, seeded_family["subtask_id"])
+    parent = await test_session.get(Task, seeded_family["task_ids"][0])
+    subtask.is_routine = True
+    subtask.status = "completed"
+    parent.subtask_completed = 1
+    await test_session.commit()
+    version = task_summary_cache.version(family_id)
+
+    assert await reset_completed_routine_tasks(test_session) >= 1
+
+    assert task_summary_cache.version(family_id) == version + 1
+    subtask = await test_session.get(Task, subtask.id, populate_existing=True)
+    parent = await test_session.get(Task, parent.id, populate_existing=True)
+    assert subtask.status == "pending"
+    assert (parent.subtask_total, parent.subtask_completed) == (1, 0)
+
+
+async def test_task_calendar_counts_per_day(
+    test_session: AsyncSession, seeded_family: Dict
+):
+    """
+    指定月の期限日ごとの件数がステータス別に1回の集計で返ること
+    """
+    calendar = await get_task_calendar_for_family(
+        test_session,
+        seeded_family["user_id"],
+        seeded_family["family_id"],
+        "2025-01",
+    )
+
+    assert calendar.month == "2025-01"
+    assert [day.date for day in calendar.days] == [
+        date(2025, 1, 1) + timedelta(days=i) for i in range(7)
+    ]
+    assert calendar.days[0].by_status == {"completed": 1}
+    assert calendar.days[1].by_status == {"pending": 1}
+
+    empty = await get_task_calendar_for_family(
+        test_session,
+        seeded_family["user_id"],
+        seeded_family["family_id"],
+        "2024-12",
+    )
+    assert empty.days == []
+
+    # 12月は翌年の1月1日までを対象にし、翌年が範囲外の月は400にする
+    for month in ("9999-12", "2025-13", "2025-00", "2025"):
+        with pytest.raises(HTTPException) as excinfo:
+            await get_task_calendar_for_family(
+                test_session,
+                seeded_family["user_id"],
+                seeded_family["family_id"],
+                month,
+            )
+        assert excinfo.value.status_code == 400
+
+
+async def test_task_board_limits_each_column_with_true_totals(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder
+):
+    """
+    ボードは1回のウィンドウ関数クエリで列ごとの先頭N件と実際の合計件数を返すこと
+    """
+    with statement_recorder() as statements:
+        board = await get_task_board_for_family(
+            test_session,
+            seeded_family["user_id"],
+            seeded_family["family_id"],
+            2,
+            sort="due_date",
+        )
+
+    # タスク本体の取得はウィンドウ関数による1回のみ（以降はリレーションの読み込み）
+    assert len([s for s in statements if "row_number()" in s]) == 1
+
+    columns = {column.status: column for column in board.columns}
+    assert [column.status for column in board.columns] == [
+        "pending",
+        "in_progress",
+        "completed",
+    ]
+    # pendingはルートタスク4件とサブタスク1件
+    assert columns["pending"].total == 5
+    assert [t.title for t in columns["pending"].tasks] == ["task-1", "task-2"]
+    assert columns["completed"].total == 3
+    assert [t.title for t in columns["completed"].tasks] == ["task-0", "task-3"]
+    assert columns["in_progress"].total == 0
+    assert columns["in_progress"].tasks == []
@@ -0,0 +1,366 @@
+"""
+タスクの更新・一括作成・一括更新・削除のテスト
+"""
+import uuid
+from datetime import date
+from typing import Dict
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.task import (
+    create_task,
+)
+from app.models.task import Task, task_closure, task_tags
+from app.schemas.task import (
+    SubtaskCreate,
+    TaskBulkDelete,
+    TaskBulkUpdate,
+    TaskCreate,
+    TaskPatch,
+    TaskResponse,
+    TaskUpdate,
+)
+from app.services.task import (
+    create_bulk_subtasks_for_user,
+    create_subtask_for_user,
+    create_tasks_for_user,
+    delete_task_for_user,
+    delete_tasks_for_user,
+    get_task_with_subtasks_for_user,
+    patch_task_for_user,
+    update_task_for_user,
+    update_tasks_for_user,
+)
+
+
+async def test_detail_and_update_paths_use_fixed_statement_counts(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder
+):
+    """
+    詳細取得は1回の読み込み、更新は UPDATE … RETURNING と1回の読み込みで完了すること
+    """
+    user_id = seeded_family["user_id"]
+    task_id = seeded_family["task_ids"][0]
+    tag_id = seeded_family["tag_ids"][1]
+
+    with statement_recorder() as statements:
+        detail = await get_task_with_subtasks_for_user(test_session, task_id, user_id)
+    assert [s.id for s in detail.subtasks] == [seeded_family["subtask_id"]]
+    # タスク本体（権限確認を含む）、タグ・作成者、サブタスクとそのタグ・作成者
+    # （担当者はいないため読み込まれない）
+    assert len(statements) == 6
+    assert sum("family_members" in s for s in statements) == 1
+
+    with statement_recorder() as statements:
+        updated = await update_task_for_user(
+            test_session,
+            task_id,
+            TaskUpdate(title="renamed", tag_ids=[tag_id]),
+            user_id,
+        )
+    assert updated.title == "renamed"
+    assert [t.id for t in updated.tags] == [tag_id]
+    assert [s.id for s in updated.subtasks] == [seeded_family["subtask_id"]]
+    # レスポンスの検証で未読み込みの属性にアクセスしないこと
+    TaskResponse.model_validate(updated)
+
+    writes = [s for s in statements if not s.lstrip().startswith("SELECT")]
+    assert len(writes) == 3
+    assert writes[0].startswith("UPDATE tasks") and "RETURNING" in writes[0]
+    assert writes[1].startswith("DELETE FROM task_tags")
+    assert writes[2].startswith("INSERT INTO task_tags")
+    # 権限確認（タスク自身の列のみ）と、更新後の詳細の読み込み
+    assert len(statements) == 1 + len(writes) + 6
+
+    # サブタスクの作成でも、親タスクは権限確認と家族IDのためにタスク自身の列のみ読み込む
+    with statement_recorder() as statements:
+        created = await create_subtask_for_user(
+            test_session, task_id, SubtaskCreate(title="child"), user_id
+        )
+    assert created.parent_id == task_id
+    first_write = next(i for i, s in enumerate(statements) if s.startswith("INSERT"))
+    assert first_write == 1
+
+
+async def test_patch_is_a_single_update_returning(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder
+):
+    """
+    ステータスの切り替えは権限の確認を含めて1回の UPDATE … RETURNING で行われ、
+    関連はfieldsで指定された場合のみ読み込まれること
+    """
+    user_id = seeded_family["user_id"]
+    task_id = seeded_family["task_ids"][1]
+
+    with statement_recorder() as statements:
+        data = await patch_task_for_user(
+            test_session, task_id, TaskPatch(status="completed"), user_id
+        )
+
+    assert data["id"] == task_id and data["status"] == "completed"
+    assert "tags" not in data and "created_by" not in data
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE") and "family_members" in statements[0]
+
+    with statement_recorder() as statements:
+        data = await patch_task_for_user(
+            test_session, task_id, TaskPatch(priority="high"), user_id, ["id", "tags"]
+        )
+    assert data == {"id": task_id, "tags": data["tags"]} and len(data["tags"]) == 1
+    # UPDATE … RETURNING と、指定された関連（タグ）の読み込み
+    assert len(statements) == 2
+
+    # サブタスクのステータスを変更すると親の完了件数が数え直される
+    await patch_task_for_user(
+        test_session,
+        seeded_family["subtask_id"],
+        TaskPatch(status="completed"),
+        user_id,
+    )
+    root = await test_session.get(
+        Task, seeded_family["task_ids"][0], populate_existing=True
+    )
+    assert root.subtask_completed == 1
+
+    for patch_user_id, patch, code in (
+        (uuid.uuid4(), TaskPatch(status="pending"), 403),
+        (user_id, TaskPatch(assignee_id=uuid.uuid4()), 400),
+    ):
+        with pytest.raises(HTTPException) as excinfo:
+            await patch_task_for_user(test_session, task_id, patch, patch_user_id)
+        assert excinfo.value.status_code == code
+
+
+async def test_bulk_subtasks_are_inserted_set_based_in_one_transaction(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder, monkeypatch
+):
+    """
+    サブタスクの一括作成は件数によらず一定の文数で行われ、失敗時は何も残らないこと
+    """
+    user_id = seeded_family["user_id"]
+    tag_id = seeded_family["tag_ids"][0]
+    parent = await create_task(
+        test_session,
+        TaskCreate(title="bulk-parent", family_id=seeded_family["family_id"]),
+        user_id,
+    )
+    parent_id = parent.id
+    subtasks_in = [
+        SubtaskCreate(title=f"bulk-{i}", tag_ids=[tag_id, uuid.uuid4(), tag_id])
+        for i in range(20)
+    ]
+    subtasks_in[0].status = "completed"
+
+    with statement_recorder() as statements:
+        created = await create_bulk_subtasks_for_user(
+            test_session, parent_id, subtasks_in, user_id
+        )
+
+    assert [t.title for t in created] == [f"bulk-{i}" for i in range(20)]
+    # 他の家族や存在しないタグは無視し、重複も1件にまとめる
+    assert all([tag.id for tag in t.tags] == [tag_id] for t in created)
+    assert all(t.created_by.id == user_id for t in created)
+
+    inserts = [s for s in statements if s.startswith("INSERT")]
+    assert len(inserts) == 3
+    # 親の権限確認、タグの確認、INSERT×3、件数の更新、読み直し（タスク・タグ・作成者）
+    assert len(statements) == 9
+
+    parent = await test_session.get(Task, parent_id, populate_existing=True)
+    assert (parent.subtask_total, parent.subtask_completed) == (20, 1)
+    descendants = await test_session.execute(
+        select(func.count())
+        .select_from(task_closure)
+        .where(task_closure.c.ancestor_id == parent_id, task_closure.c.depth > 0)
+    )
+    assert descendants.scalar() == 20
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr("app.crud.task._adjust_subtask_counters", fail)
+    with pytest.raises(RuntimeError):
+        await create_bulk_subtasks_for_user(
+            test_session, parent_id, [SubtaskCreate(title="partial")], user_id
+        )
+    remaining = await test_session.execute(
+        select(func.count()).select_from(Task).where(Task.title == "partial")
+    )
+    assert remaining.scalar() == 0
+
+
+async def test_bulk_task_creation_resolves_references_in_batches(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder
+):
+    """
+    タスクの一括作成は参照先をまとめて確認し、問題のある項目のみをエラーにすること
+    """
+    user_id = seeded_family["user_id"]
+    family_id = seeded_family["family_id"]
+    tag_id = seeded_family["tag_ids"][0]
+    parent_id = seeded_family["task_ids"][1]
+
+    def new_task(title: str, **kwargs) -> TaskCreate:
+        return TaskCreate(title=title, family_id=family_id, **kwargs)
+
+    tasks_in = [
+        new_task("import-0", tag_ids=[tag_id], assignee_id=user_id),
+        TaskCreate(title="other-family", family_id=uuid.uuid4()),
+        new_task("unknown-tag", tag_ids=[tag_id, uuid.uuid4()]),
+        new_task("outsider", assignee_id=uuid.uuid4()),
+        new_task("import-1", parent_id=parent_id, status="completed"),
+        new_task("unknown-parent", parent_id=uuid.uuid4()),
+        *[new_task(f"import-{i}") for i in range(2, 50)],
+    ]
+
+    with statement_recorder() as statements:
+        created, errors = await create_tasks_for_user(test_session, tasks_in, user_id)
+
+    assert [t.title for t in created] == [f"import-{i}" for i in range(50)]
+    assert [error.index for error in errors] == [1, 2, 3, 5]
+    assert [t.id for t in created[0].tags] == [tag_id]
+    assert created[0].assignee.id == user_id
+    assert created[1].parent_id == parent_id
+
+    # 参照先の確認3回、INSERT3回、親の件数更新、読み直し（タスク・タグ・担当者・作成者）
+    assert len([s for s in statements if s.startswith("INSERT")]) == 3
+    assert len(statements) == 11
+
+    parent = await test_session.get(Task, parent_id, populate_existing=True)
+    assert (parent.subtask_total, parent.subtask_completed) == (1, 1)
+
+
+async def test_bulk_update_is_a_single_scoped_update(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder
+):
+    """
+    一括更新は権限の確認を含めて1回の UPDATE … WHERE で行われ、
+    親タスクのサブタスク完了件数も数え直されること
+    """
+    user_id = seeded_family["user_id"]
+    family_id = seeded_family["family_id"]
+    root_id = seeded_family["task_ids"][0]
+
+    bulk_in = TaskBulkUpdate(
+        family_id=family_id,
+        filters={"status": "pending", "due_before": date(2025, 1, 3)},
+        patch={"status": "completed"},
+    )
+    with statement_recorder() as statements:
+        result = await update_tasks_for_user(test_session, bulk_in, user_id)
+
+    assert result.count == 2
+    assert set(result.ids) == set(seeded_family["task_ids"][1:3])
+    updates = [s for s in statements if s.startswith("UPDATE")]
+    assert len(statements) == 1
+    assert "family_members" in updates[0] and "RETURNING" in updates[0]
+
+    # サブタスクのステータスを変更すると親の完了件数が数え直される
+    by_ids = TaskBulkUpdate(
+        family_id=family_id,
+        ids=[seeded_family["subtask_id"]],
+        patch={"status": "completed", "due_date": None},
+    )
+    result = await update_tasks_for_user(test_session, by_ids, user_id)
+    assert result.ids == [seeded_family["subtask_id"]]
+    root = await test_session.get(Task, root_id, populate_existing=True)
+    assert root.subtask_completed == 1
+
+    with pytest.raises(HTTPException) as excinfo:
+        await update_tasks_for_user(test_session, by_ids, uuid.uuid4())
+    assert excinfo.value.status_code == 403
+
+
+@pytest.mark.parametrize(
+    "target",
+    [
+        {},
+        {"ids": []},
+        {"filters": {}},
+        {"filters": {"tag_ids": [], "tag_match": "all"}},
+        {"filters": {"status": None}},
+        {"ids": [uuid.uuid4()], "filters": {"status": "pending"}},
+    ],
+)
+@pytest.mark.parametrize("schema", [TaskBulkDelete, TaskBulkUpdate])
+def test_bulk_target_requires_ids_or_a_filter_condition(schema, target):
+    """
+    対象のIDも絞り込み条件もない一括更新・一括削除（家族のすべてのタスクが対象になる）は拒否すること
+    """
+    with pytest.raises(ValidationError):
+        schema(family_id=uuid.uuid4(), patch={"status": "completed"}, **target)
+
+
+async def test_deletion_is_one_delete_relying_on_cascades(
+    test_session: AsyncSession, seeded_family: Dict, statement_recorder
+):
+    """
+    タスクの削除は部分木の大きさによらず1回の DELETE で行われ、配下のサブタスク・
+    タグの紐付け・階層情報は外部キーのCASCADEで削除されること
+    """
+    user_id = seeded_family["user_id"]
+    family_id = seeded_family["family_id"]
+    tag_id = seeded_family["tag_ids"][0]
+
+    parent = await create_task(
+        test_session, TaskCreate(title="delete-parent", family_id=family_id), user_id
+    )
+    parent_id = parent.id
+    children = await create_bulk_subtasks_for_user(
+        test_session,
+        parent_id,
+        [SubtaskCreate(title="keep", status="completed")]
+        + [SubtaskCreate(title="doomed", tag_ids=[tag_id])],
+        user_id,
+    )
+    doomed_id = children[1].id
+    grandchildren = await create_bulk_subtasks_for_user(
+        test_session,
+        doomed_id,
+        [SubtaskCreate(title=f"grand-{i}", tag_ids=[tag_id]) for i in range(10)],
+        user_id,
+    )
+    subtree_ids = [doomed_id, *(t.id for t in grandchildren)]
+
+    with statement_recorder() as statements:
+        deleted = await delete_task_for_user(test_session, doomed_id, user_id)
+
+    assert deleted.id == doomed_id
+    deletes = [s for s in statements if s.startswith("DELETE")]
+    assert len(deletes) == 1 and "RETURNING" in deletes[0]
+    # 権限の確認（タスク・タグ・作成者）、DELETE、親の件数の数え直し
+    assert len(statements) == 5
+
+    for table, column in (
+        (Task.__table__, Task.id),
+        (task_tags, task_tags.c.task_id),
+        (task_closure, task_closure.c.descendant_id),
+    ):
+        remaining = await test_session.execute(
+            select(func.count()).select_from(table).where(column.in_(subtree_ids))
+        )
+        assert remaining.scalar() == 0
+    parent = await test_session.get(Task, parent_id, populate_existing=True)
+    assert (parent.subtask_total, parent.subtask_completed) == (1, 1)
+
+    # 一括削除はフィルタ条件と権限の確認を含めて1回の DELETE で行われる
+    bulk_in = TaskBulkDelete(family_id=family_id, filters={"status": "completed"})
+    with pytest.raises(HTTPException) as excinfo:
+        await delete_tasks_for_user(test_session, bulk_in, uuid.uuid4())
+    assert excinfo.value.status_code == 403
+
+    with statement_recorder() as statements:
+        result = await delete_tasks_for_user(test_session, bulk_in, user_id)
+    completed_roots = [t for i, t in enumerate(seeded_family["task_ids"]) if i % 3 == 0]
+    assert set(result.ids) == {*completed_roots, children[0].id}
+    deletes = [s for s in statements if s.startswith("DELETE")]
+    assert len(deletes) == 1 and "family_members" in deletes[0]
+    # 配下のサブタスクもCASCADEで削除される
+    subtask = await test_session.get(
+        Task, seeded_family["subtask_id"], populate_existing=True
+    )
+    assert subtask is None